@@ -695,10 +695,12 @@ class RayTraceLFM(OpticalElement):
 
         if ray_valid_indices is None:
             self.compute_rays_geometry()
-            # Reshape self.ray_valid_indices to pair row and column indices
-            reshaped_indices = self.ray_valid_indices.T
-        else:
-            reshaped_indices = ray_valid_indices.T
+            ray_valid_indices = self.ray_valid_indices
+        if not isinstance(ray_valid_indices, np.ndarray):
+            ray_valid_indices = ray_valid_indices.cpu().numpy()
+        rows, cols = ray_valid_indices[0], ray_valid_indices[1]
+        if not isinstance(mla_image, np.ndarray):
+            mla_image = mla_image.detach().cpu().numpy()
 
         # Loop through sections of mla_image, and store a mask.
         for i in range(num_mla):
@@ -709,11 +711,9 @@ class RayTraceLFM(OpticalElement):
                 ]
                 # Initialize a mask of the same shape as lenslet_image
                 mask = np.full(lenslet_image.shape, False, dtype=bool)
-                # Set True in the mask only for indices in reshaped_indices
+                # Set True in the mask only for the valid ray indices
                 # and where lenslet_image is not zero.
-                for idx in reshaped_indices:
-                    if lenslet_image[idx[0], idx[1]] > 3e-8:
-                        mask[idx[0], idx[1]] = True
+                mask[rows, cols] = lenslet_image[rows, cols] > 3e-8
                 nonzero_pixels_dict[(i, j)] = mask
 
         return nonzero_pixels_dict
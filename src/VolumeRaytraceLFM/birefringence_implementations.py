@@ -21,13 +21,25 @@ from VolumeRaytraceLFM.jones.eigenanalysis import (
     azimuth_from_jones_numpy,
 )
 from VolumeRaytraceLFM.jones import jones_matrix
-from VolumeRaytraceLFM.utils.dict_utils import filter_keys_by_count, convert_to_tensors
+from VolumeRaytraceLFM.utils.dict_utils import (
+    filter_keys_by_count,
+    convert_to_tensors,
+    pad_lists_to_tensor,
+    count_voxels_of_segs,
+)
 from VolumeRaytraceLFM.utils.error_handling import check_for_negative_values_dict
 from VolumeRaytraceLFM.combine_lenslets import (
     gather_voxels_of_rays_pytorch_batch,
     calculate_offsets_vectorized,
 )
 from VolumeRaytraceLFM.utils.mask_utils import get_bool_mask_for_ray_indices
+from VolumeRaytraceLFM.utils.volume_numba import (
+    NUMBA_AVAILABLE,
+    fill_ellipsoid_shell,
+    fill_ellipsoid_shells,
+    normalize_optic_axis_inplace,
+    pack_line_segments,
+)
 
 
 DEBUG = False
@@ -37,10 +49,20 @@ if DEBUG:
     from utils import errors
 
 
+def _rng_from_global_state():
+    """Generator seeded from numpy's global random state, so that
+    np.random.seed still makes the randomized volumes reproducible."""
+    return np.random.default_rng(np.random.randint(2**31))
+
+
 ######################################################################
 class BirefringentVolume(BirefringentElement):
     """Stores a 3D array of voxels with birefringence properties,
-    either with a numpy or pytorch back-end."""
+    either with a numpy or pytorch back-end.
+    The properties are stored as separate arrays rather than per voxel:
+    Delta_n with one value per voxel, and optic_axis component-major with
+    shape [3, ...], so that each property and each optic axis component is
+    contiguous across the voxels."""
 
     def __init__(
         self,
@@ -50,6 +72,7 @@ class BirefringentVolume(BirefringentElement):
         Delta_n=0.0,
         optic_axis=None,
         volume_creation_args=None,
+        numpy_dtype=np.float64,
     ):
         """BirefringentVolume
         Args:
@@ -82,6 +105,10 @@ class BirefringentVolume(BirefringentElement):
                     init_type (str): zeros, nplanes, where n is a number, ellipsoid...
                     init_args (dic): see self.init_volume function for specific arguments
                     per init_type.
+            numpy_dtype (np.dtype):
+                Floating point type of the arrays of the numpy backend. Using
+                np.float32 halves the memory of the volume. The pytorch backend
+                uses torch.get_default_dtype() instead.
         """
         if torch_args is None:
             torch_args = {}
@@ -93,9 +120,12 @@ class BirefringentVolume(BirefringentElement):
         super().__init__(
             backend=backend, torch_args=torch_args, optical_info=optical_info
         )
+        self.numpy_dtype = numpy_dtype
         self._initialize_volume_attributes(optical_info, Delta_n, optic_axis)
         self.indices_active = None
         self.optic_axis_planar = None
+        # Views returned by get_delta_n and get_optic_axis, see _cached_view
+        self._view_cache = {}
 
         if volume_creation_args is not None:
             self.init_volume(
@@ -116,7 +146,7 @@ class BirefringentVolume(BirefringentElement):
         # In the case when an optic axis per voxel of a 3D volume is provided, e.g. [3,nz,ny,nx]
         if isinstance(optic_axis, np.ndarray) and len(optic_axis.shape) == 4:
             self._handle_3d_optic_axis_numpy(optic_axis)
-            self.Delta_n = Delta_n
+            self.Delta_n = np.asarray(Delta_n, dtype=self.numpy_dtype)
             assert (
                 len(self.Delta_n.shape) == 3
             ), "3D Delta_n expected, as the optic_axis was provided as a 3D array"
@@ -124,10 +154,10 @@ class BirefringentVolume(BirefringentElement):
         elif isinstance(optic_axis, list) or isinstance(optic_axis, np.ndarray):
             self._handle_single_optic_axis_numpy(optic_axis)
             # Create Delta_n 3D volume
-            self.Delta_n = Delta_n * np.ones(self.volume_shape)
+            self.Delta_n = np.full(self.volume_shape, Delta_n, dtype=self.numpy_dtype)
 
-        self.Delta_n[np.isnan(self.Delta_n)] = 0
-        self.optic_axis[np.isnan(self.optic_axis)] = 0
+        np.nan_to_num(self.Delta_n, copy=False, nan=0.0)
+        np.nan_to_num(self.optic_axis, copy=False, nan=0.0)
 
     def _initialize_pytorch_backend(self, Delta_n, optic_axis):
         # Normalization of optical axis, depending on input
@@ -144,12 +174,17 @@ class BirefringentVolume(BirefringentElement):
             self.Delta_n = Delta_n * torch.ones(self.volume_shape)
 
         # Check for not a number, for when the voxel optic_axis is all zeros
-        self.Delta_n[torch.isnan(self.Delta_n)] = 0
-        self.optic_axis[torch.isnan(self.optic_axis)] = 0
-        # Store the data as pytorch parameters
+        self.Delta_n.nan_to_num_(nan=0.0)
+        self.optic_axis.nan_to_num_(nan=0.0)
+        # Store the data as pytorch parameters. The optic axis is kept as
+        #   [3, n_voxels]: the ray tracing gathers many voxels per component
+        #   and the Jones computation works on whole component arrays, so
+        #   this layout reads each component with unit stride
         self.optic_axis = nn.Parameter(self.optic_axis.reshape(3, -1)).type(
             torch.get_default_dtype()
         )
+        # Delta_n stays flat, as the raytracer, the voxel masks and the
+        #   active-voxel parameters index it with flat voxel indices
         self.Delta_n = nn.Parameter(self.Delta_n.flatten()).type(
             torch.get_default_dtype()
         )
@@ -157,29 +192,20 @@ class BirefringentVolume(BirefringentElement):
     def _handle_3d_optic_axis_numpy(self, optic_axis):
         """Normalize and reshape a 3D optic axis array for Numpy backend."""
         self.volume_shape = optic_axis.shape[1:]
-        # Flatten all the voxels in order to normalize them
-        optic_axis = optic_axis.reshape(
-            3, self.volume_shape[0] * self.volume_shape[1] * self.volume_shape[2]
-        ).astype(np.float64)
-        for n_voxel in range(len(optic_axis[0, ...])):
-            oa_norm = np.linalg.norm(optic_axis[:, n_voxel])
-            if oa_norm > 0:
-                optic_axis[:, n_voxel] /= oa_norm
-        # Set 4D shape again
-        self.optic_axis = optic_axis.reshape(3, *self.volume_shape)
+        # The copy is contiguous, so it can be normalized in place
+        optic_axis = optic_axis.astype(self.numpy_dtype)
+        self.optic_axis = normalize_optic_axis_inplace(optic_axis)
 
     def _handle_single_optic_axis_numpy(self, optic_axis):
         """Set a single optic axis for all voxels for Numpy backend."""
-        optic_axis = np.array(optic_axis)
+        optic_axis = np.array(optic_axis, dtype=self.numpy_dtype)
         oa_norm = np.linalg.norm(optic_axis)
         if oa_norm != 0:
             optic_axis /= oa_norm
-        self.optic_axis = (
-            np.expand_dims(optic_axis, [1, 2, 3])
-            .repeat(self.volume_shape[0], 1)
-            .repeat(self.volume_shape[1], 2)
-            .repeat(self.volume_shape[2], 3)
-        )
+        # Broadcast, then copy once into the full volume
+        self.optic_axis = np.broadcast_to(
+            optic_axis.reshape(3, 1, 1, 1), (3, *self.volume_shape)
+        ).copy()
 
     def _handle_3d_optic_axis_torch(self, optic_axis):
         """Normalize and reshape a 3D optic axis array for PyTorch backend."""
@@ -194,55 +220,138 @@ class BirefringentVolume(BirefringentElement):
         oa_norm = np.linalg.norm(optic_axis)
         if oa_norm != 0:
             optic_axis /= oa_norm
-        optic_axis_tensor = (
-            torch.from_numpy(optic_axis).unsqueeze(1).unsqueeze(1).unsqueeze(1)
-        )
-        self.optic_axis = optic_axis_tensor.repeat(1, *self.volume_shape)
+        optic_axis_tensor = torch.from_numpy(optic_axis).reshape(3, 1, 1, 1)
+        self.optic_axis = optic_axis_tensor.expand(3, *self.volume_shape).contiguous()
+
+    def _cached_view(self, name, tensor, shape):
+        """Returns tensor.view(shape). While gradients are disabled, e.g.
+        when plotting, the view is reused as long as the tensor, its storage
+        and the shape are unchanged. Views are not reused under autograd,
+        so that each graph gets its own view node."""
+        if torch.is_grad_enabled() or torch.is_inference_mode_enabled():
+            return tensor.view(shape)
+        cache = self.__dict__.setdefault("_view_cache", {})
+        key = (tensor.data_ptr(), tuple(shape))
+        cached = cache.get(name)
+        if cached is None or cached[0] is not tensor or cached[1] != key:
+            cached = (tensor, key, tensor.view(shape))
+            cache[name] = cached
+        return cached[2]
 
     def get_delta_n(self):
         """Retrieves the birefringence as a 3D array"""
         if self.backend == BackEnds.PYTORCH:
-            return self.Delta_n.view(self.optical_info["volume_shape"])
+            return self._cached_view(
+                "Delta_n", self.Delta_n, self.optical_info["volume_shape"]
+            )
         else:
             return self.Delta_n
 
     def get_optic_axis(self):
-        """Retrieves the optic axis as a 4D array"""
+        """Retrieves the optic axis as a 4D array. The optic axis is stored
+        component-major, [3, *volume_shape], so each component is a
+        contiguous 3D array."""
         if self.backend == BackEnds.PYTORCH:
-            return self.optic_axis.view(
-                3,
-                self.optical_info["volume_shape"][0],
-                self.optical_info["volume_shape"][1],
-                self.optical_info["volume_shape"][2],
+            return self._cached_view(
+                "optic_axis",
+                self.optic_axis,
+                (3, *self.optical_info["volume_shape"]),
             )
         else:
             return self.optic_axis
 
+    def get_optic_axis_components(self):
+        """Retrieves the three components of the optic axis as separate 3D
+        arrays. These are views into the contiguous component-major storage,
+        so that each component can be processed with unit stride."""
+        optic_axis = self.get_optic_axis()
+        return optic_axis[0], optic_axis[1], optic_axis[2]
+
+    def get_delta_n_with_active(self):
+        """Retrieves the birefringence as a 3D array, with the active voxels
+        taken from birefringence_active so that gradients reach them.
+        Only the active voxels are optimized, so the full volume is
+        assembled with a single index_copy when it is needed."""
+        if self.backend != BackEnds.PYTORCH or self.indices_active is None:
+            return self.get_delta_n()
+        vol_shape = self.optical_info["volume_shape"]
+        active = self.birefringence_active
+        if hasattr(self, "Delta_n"):
+            delta_n = self.Delta_n.detach()
+        else:
+            delta_n = torch.zeros(
+                int(np.prod(vol_shape)), dtype=active.dtype, device=active.device
+            )
+        delta_n = delta_n.index_copy(0, self.indices_active, active)
+        return delta_n.view(vol_shape)
+
+    def get_optic_axis_with_active(self):
+        """Retrieves the optic axis as a 4D array, with the active voxels
+        taken from optic_axis_active so that gradients reach them."""
+        active = getattr(self, "optic_axis_active", None)
+        if (
+            self.backend != BackEnds.PYTORCH
+            or self.indices_active is None
+            or active is None
+        ):
+            return self.get_optic_axis()
+        vol_shape = self.optical_info["volume_shape"]
+        optic_axis = self.optic_axis.detach().index_copy(1, self.indices_active, active)
+        return optic_axis.view(3, *vol_shape)
+
     def normalize_optic_axis(self):
         """Normalize the optic axis per voxel."""
         if self.backend == BackEnds.PYTORCH:
             with torch.no_grad():
                 self.optic_axis.requires_grad = False
                 mags = torch.linalg.norm(self.optic_axis, axis=0)
-                valid_mask = mags > 0
-                self.optic_axis[:, valid_mask].data /= mags[valid_mask]
+                # Zero vectors stay zero, as they are divided by the clamped norm
+                self.optic_axis.div_(mags.clamp_min(1e-30))
                 self.optic_axis.requires_grad = True
         elif self.backend == BackEnds.NUMPY:
-            mags = np.linalg.norm(self.optic_axis, axis=0)
-            valid_mask = mags > 0
-            self.optic_axis[:, valid_mask] /= mags[valid_mask]
+            normalize_optic_axis_inplace(self.optic_axis)
+
+    def clone(self):
+        """Copy of the volume with its own birefringence and optic axis,
+        and for PyTorch, its own copy of every registered parameter and
+        buffer, such as the active-voxel parameters. The remaining
+        attributes are shallow copies, which is much cheaper than
+        copy.deepcopy."""
+        new_volume = copy.copy(self)
+        new_volume.optical_info = dict(self.optical_info)
+        new_volume._view_cache = {}
+        if self.backend == BackEnds.PYTORCH:
+            # The module registries must not be shared with the original
+            new_volume._parameters = {
+                name: (
+                    None
+                    if param is None
+                    else nn.Parameter(
+                        param.detach().clone(), requires_grad=param.requires_grad
+                    )
+                )
+                for name, param in self._parameters.items()
+            }
+            new_volume._buffers = {
+                name: None if buffer is None else buffer.clone()
+                for name, buffer in self._buffers.items()
+            }
+            new_volume._modules = self._modules.copy()
+            # Without a matching default dtype, these are plain tensors
+            for name in ["Delta_n", "optic_axis"]:
+                if name not in self._parameters:
+                    setattr(new_volume, name, getattr(self, name).detach().clone())
+        else:
+            new_volume.Delta_n = self.Delta_n.copy()
+            new_volume.optic_axis = self.optic_axis.copy()
+        return new_volume
 
     def __iadd__(self, other):
         """Overload the += operator to sum volumes."""
-        # Ensure shapes are compatible
-        delta_n_shape = self.get_delta_n().shape
-        optic_axis_shape = self.get_optic_axis().shape
-        assert (
-            delta_n_shape == other.get_delta_n().shape
-        ), f"Shape mismatch for Delta_n: {delta_n_shape} vs {other.get_delta_n().shape}"
-        assert (
-            optic_axis_shape == other.get_optic_axis().shape
-        ), f"Shape mismatch for optic_axis: {optic_axis_shape} vs {other.get_optic_axis().shape}"
+        # Ensure shapes are compatible, without building views of the volumes
+        assert tuple(self.volume_shape) == tuple(
+            other.volume_shape
+        ), f"Shape mismatch for volumes: {self.volume_shape} vs {other.volume_shape}"
 
         # Disable gradients if using PyTorch
         requires_grad = getattr(self.Delta_n, "requires_grad", False)
@@ -256,19 +365,19 @@ class BirefringentVolume(BirefringentElement):
         self.optic_axis += other.optic_axis
         # Maybe normalize axis again?
 
-        # Normalize the optic axis
-        norm = (
-            torch.linalg.norm(self.optic_axis, axis=0)
-            if requires_grad
-            else np.linalg.norm(self.optic_axis)
-        )
-        self.optic_axis /= norm
+        # Normalize the optic axis per voxel, zero vectors stay zero
+        if self.backend == BackEnds.PYTORCH:
+            norm = torch.linalg.vector_norm(self.optic_axis, dim=0)
+            self.optic_axis.div_(norm.clamp_min(1e-30))
+        else:
+            normalize_optic_axis_inplace(self.optic_axis)
 
         # Re-enable gradients if they were disabled
         if requires_grad:
             self.Delta_n.requires_grad = True
             self.optic_axis.requires_grad = True
             torch.set_grad_enabled(True)
+        self._view_cache = {}
         return self
 
     def plot_lines_plotly(
@@ -287,8 +396,8 @@ class BirefringentVolume(BirefringentElement):
                                     after the birefringence has been normalized
         """
         # Fetch local data
-        delta_n = self.get_delta_n() * 1
-        optic_axis = self.get_optic_axis() * 1
+        delta_n = self.get_delta_n()
+        optic_axis = self.get_optic_axis()
         optical_info = self.optical_info
         # Check if this is a torch tensor
         if not isinstance(delta_n, np.ndarray):
@@ -297,8 +406,12 @@ class BirefringentVolume(BirefringentElement):
                 optic_axis = optic_axis.cpu().detach().numpy()
             except:
                 pass
-        delta_n /= np.max(np.abs(delta_n))
-        delta_n[np.abs(delta_n) < delta_n_ths] = 0
+        # Only delta_n is modified, so only delta_n is copied
+        delta_n = np.array(delta_n, dtype=np.float32)
+        abs_delta_n = np.abs(delta_n)
+        max_delta_n = abs_delta_n.max()
+        np.putmask(delta_n, abs_delta_n < delta_n_ths * max_delta_n, 0)
+        delta_n /= max_delta_n
 
         import plotly.graph_objects as go
 
@@ -339,68 +452,38 @@ class BirefringentVolume(BirefringentElement):
                 aspectmode="manual",
             )
 
-        # Define grid
-        coords = np.indices(np.array(delta_n.shape)).astype(float)
+        # Define a sparse grid of voxel centers, which broadcasts to the volume
+        voxel_size_um = np.asarray(optical_info["voxel_size_um"], dtype=float)
+        grid = np.meshgrid(*map(np.arange, delta_n.shape), indexing="ij", sparse=True)
+        centers = [(g + 0.5) * size for g, size in zip(grid, voxel_size_um)]
+        coords_base = np.stack(np.broadcast_arrays(*centers))
+        line_scale = 0.75 * voxel_size_um.reshape(3, 1, 1, 1)
+        coords_tip = coords_base + optic_axis * delta_n * line_scale
 
-        coords_base = [
-            (coords[i] + 0.5) * optical_info["voxel_size_um"][i] for i in range(3)
-        ]
-        coords_tip = [
-            (coords[i] + 0.5 + optic_axis[i, ...] * delta_n * 0.75)
-            * optical_info["voxel_size_um"][i]
-            for i in range(3)
-        ]
+        # Don't plot zero values
+        mask = delta_n == 0
+        coords_base[:, mask] = np.nan
+        coords_tip[:, mask] = np.nan
 
         # Plot single line per voxel, where it's length is delta_n
         z_base, y_base, x_base = coords_base
-        z_tip, y_tip, x_tip = coords_tip
-
-        # Don't plot zero values
-        mask = delta_n == 0
-        x_base[mask] = np.nan
-        y_base[mask] = np.nan
-        z_base[mask] = np.nan
-        x_tip[mask] = np.nan
-        y_tip[mask] = np.nan
-        z_tip[mask] = np.nan
 
         # Gather all rays in single arrays, to plot them all at once, placing NAN in between them
-        array_size = 3 * len(x_base.flatten())
-        # Prepare colormap
-        all_x = np.empty((array_size))
-        all_x[::3] = x_base.flatten()
-        all_x[1::3] = x_tip.flatten()
-        all_x[2::3] = np.nan
-        all_y = np.empty((array_size))
-        all_y[::3] = y_base.flatten()
-        all_y[1::3] = y_tip.flatten()
-        all_y[2::3] = np.nan
-        all_z = np.empty((array_size))
-        all_z[::3] = z_base.flatten()
-        all_z[1::3] = z_tip.flatten()
-        all_z[2::3] = np.nan
-        # Compute colors
-        all_color = np.empty((array_size))
-        all_color[::3] = (
-            (x_base - x_tip).flatten() ** 2
-            + (y_base - y_tip).flatten() ** 2
-            + (z_base - z_tip).flatten() ** 2
-        )
-        # all_color[::3] =  delta_n.flatten() * 1.0
-        all_color[1::3] = all_color[::3]
-        all_color[2::3] = 0
-        all_color[np.isnan(all_color)] = 0
+        # The colors are the squared length of each line
+        (all_z, all_y, all_x), all_color = pack_line_segments(coords_base, coords_tip)
 
         err = (
             "The BirefringentVolume is expected to have non-zeros values. If the "
             + "BirefringentVolume was cropped to fit into a region, the non-zero values "
             + "may no longer be included."
         )
-        assert any(all_color != 0), err
+        nonzero = all_color != 0
+        if not nonzero.any():
+            raise ValueError(err)
 
-        all_color[all_color != 0] -= all_color[all_color != 0].min()
+        np.subtract(all_color, all_color[nonzero].min(), out=all_color, where=nonzero)
         all_color += 0.5
-        all_color /= all_color.max()
+        all_color *= 1.0 / all_color.max()
 
         if fig is None:
             fig = go.Figure()
@@ -474,11 +557,12 @@ class BirefringentVolume(BirefringentElement):
             optical_info["voxel_size_um"][i] * optical_info["volume_shape"][i]
             for i in range(3)
         ]
-        # Define grid
-        coords = np.indices(np.array(voxels.shape)).astype(float)
-        # Shift by half a voxel and multiply by voxel size
+        # Define a sparse grid, shifted by half a voxel and multiplied by voxel size
+        voxel_size_um = np.asarray(optical_info["voxel_size_um"], dtype=float)
+        grid = np.meshgrid(*map(np.arange, voxels.shape), indexing="ij", sparse=True)
         coords = [
-            (coords[i] + 0.5) * optical_info["voxel_size_um"][i] for i in range(3)
+            np.broadcast_to((g + 0.5) * size, voxels.shape)
+            for g, size in zip(grid, voxel_size_um)
         ]
         if fig is None:
             fig = go.Figure()
@@ -570,31 +654,14 @@ class BirefringentVolume(BirefringentElement):
         assert (
             volume_shape <= region_shape
         ).all(), "Error: volume_shape must be less than region_shape"
-        z_, y_, x_ = region_shape
-        z, y, x = volume_shape
-        z_pad = abs(z_ - z)
-        y_pad = abs(y_ - y)
-        x_pad = abs(x_ - x)
-        padded_delta_n = np.pad(
-            delta_n,
-            (
-                (z_pad // 2, z_pad // 2 + z_pad % 2),
-                (y_pad // 2, y_pad // 2 + y_pad % 2),
-                (x_pad // 2, x_pad // 2 + x_pad % 2),
-            ),
-            mode="constant",
-        ).astype(np.float64)
-        padded_optic_axis = np.pad(
-            optic_axis,
-            (
-                (0, 0),
-                (z_pad // 2, z_pad // 2 + z_pad % 2),
-                (y_pad // 2, y_pad // 2 + y_pad % 2),
-                (x_pad // 2, x_pad // 2 + x_pad % 2),
-            ),
-            mode="constant",
-            constant_values=np.sqrt(3),
-        ).astype(np.float64)
+        region_shape = tuple(int(n) for n in region_shape)
+        # The padding before each dimension, any odd remainder goes after
+        start = [(n_region - n) // 2 for n_region, n in zip(region_shape, volume_shape)]
+        region = tuple(slice(i, i + int(n)) for i, n in zip(start, volume_shape))
+        padded_delta_n = np.zeros(region_shape, dtype=np.float64)
+        padded_delta_n[region] = delta_n
+        padded_optic_axis = np.full((3, *region_shape), np.sqrt(3), dtype=np.float64)
+        padded_optic_axis[(slice(None), *region)] = optic_axis
         return padded_delta_n, padded_optic_axis
 
     @staticmethod
@@ -672,6 +739,15 @@ class BirefringentVolume(BirefringentElement):
         tqdm.write(f"Saving volume to h5 file: {h5_file_path}")
         self._save_volume(h5_file_path, description, optical_all, "h5")
 
+    def save_quantized(
+        self, h5_file_path, description="Temporary description", optical_all=False
+    ):
+        """Store this volume into an h5 file with the data quantized to int8.
+        The delta_n and optic_axis datasets carry a `scale` attribute and are
+        dequantized automatically by init_from_file and load_from_file."""
+        tqdm.write(f"Saving quantized volume to h5 file: {h5_file_path}")
+        self._save_volume(h5_file_path, description, optical_all, "h5", quantize=True)
+
     def save_as_numpy_arrays(self, filename):
         """Store this volume into a npy file"""
         self._save_volume(filename, optical_all=False, file_format="npz")
@@ -686,6 +762,7 @@ class BirefringentVolume(BirefringentElement):
         description="Temporary description",
         optical_all=False,
         file_format="h5",
+        quantize=False,
     ):
         """Helper method to save volume data in different formats"""
         delta_n, optic_axis = self._get_data_as_numpy_arrays()
@@ -699,6 +776,7 @@ class BirefringentVolume(BirefringentElement):
                 self.optical_info,
                 description,
                 optical_all,
+                quantize=quantize,
             )
         elif file_format == "npz":
             file_manager.save_as_npz(file_path, delta_n, optic_axis)
@@ -708,12 +786,23 @@ class BirefringentVolume(BirefringentElement):
             raise ValueError(f"Unsupported file format: {file_format}")
 
     def _get_data_as_numpy_arrays(self):
-        """Converts delta_n and optic_axis based on backend"""
+        """Converts delta_n and optic_axis based on backend. The numpy
+        arrays are returned without copying. For a volume on a GPU, both
+        are copied into one pinned host buffer, and only the second copy
+        waits for the transfers to finish."""
         delta_n = self.get_delta_n()
         optic_axis = self.get_optic_axis()
         if self.backend == BackEnds.PYTORCH:
-            delta_n = delta_n.detach().cpu().numpy()
-            optic_axis = optic_axis.detach().cpu().numpy()
+            delta_n, optic_axis = delta_n.detach(), optic_axis.detach()
+            if not delta_n.is_cuda:
+                return delta_n.cpu().numpy(), optic_axis.cpu().numpy()
+            staged = delta_n.new_empty(
+                (4, *delta_n.shape), device="cpu", pin_memory=True
+            )
+            staged[0].copy_(delta_n, non_blocking=True)
+            staged[1:].copy_(optic_axis)
+            staged = staged.numpy()
+            delta_n, optic_axis = staged[0], staged[1:]
         return delta_n, optic_axis
 
     def _get_backend_str(self):
@@ -729,48 +818,63 @@ class BirefringentVolume(BirefringentElement):
         """This function creates predefined volumes and shapes."""
         volume_shape = self.optical_info["volume_shape"]
         if init_mode == "zeros":
-            self._init_zeros(volume_shape)
-        elif init_mode == "single_voxel":
-            self._init_single_voxel(volume_shape, init_args)
-        elif init_mode == "random":
-            self._init_random(volume_shape, init_args)
-        elif "planes" in init_mode:
-            self._init_planes(volume_shape, init_mode, init_args)
-        elif init_mode in ["ellipsoid", "shell"]:
-            self._init_ellipsoid_or_shell(volume_shape, init_mode, init_args)
-        else:
+            # The volume is already allocated, so there is no volume_ref to set
+            self._init_zeros()
+            return
+        init_method = self._INIT_METHODS.get(init_mode)
+        if init_method is None and "planes" in init_mode:
+            init_method = BirefringentVolume._init_planes
+        if init_method is None:
             raise ValueError(f"The init mode {init_mode} has not been created yet.")
+        init_method(self, volume_shape, init_mode, init_args)
         self._set_volume_ref()
 
-    def _init_zeros(self, volume_shape):
-        shape = [4] + volume_shape
+    def _init_zeros(self):
+        """Zeros the birefringence and the optic axis in place."""
         if self.backend == BackEnds.NUMPY:
-            self.voxel_parameters = np.zeros(shape)
+            self.Delta_n.fill(0)
+            self.optic_axis.fill(0)
         elif self.backend == BackEnds.PYTORCH:
-            self.voxel_parameters = torch.zeros(shape)
+            with torch.no_grad():
+                self.Delta_n.zero_()
+                self.optic_axis.zero_()
 
-    def _init_single_voxel(self, volume_shape, init_args):
+    def _init_single_voxel(self, volume_shape, init_mode, init_args):
         delta_n = init_args.get("delta_n", 0.01)
         optic_axis = init_args.get("optic_axis", [1, 0, 0])
         offset = init_args.get("offset", [0, 0, 0])
         self.voxel_parameters = self.generate_single_voxel_volume(
-            volume_shape, delta_n, optic_axis, offset
+            volume_shape, delta_n, optic_axis, offset, dtype=self._storage_dtype()
         )
 
-    def _init_random(self, volume_shape, init_args):
+    def _init_random(self, volume_shape, init_mode, init_args):
         my_init_args = (
             init_args if init_args else {"Delta_n_range": [0, 1], "axes_range": [-1, 1]}
         )
-        self.voxel_parameters = self.generate_random_volume(
-            volume_shape, init_args=my_init_args
-        )
+        if self.backend == BackEnds.PYTORCH:
+            self.voxel_parameters = self.generate_random_volume_torch(
+                volume_shape,
+                init_args=my_init_args,
+                seed=my_init_args.get("seed"),
+                generator=my_init_args.get("generator"),
+            )
+        else:
+            seed = my_init_args.get("seed")
+            rng = None if seed is None else np.random.default_rng(seed)
+            self.voxel_parameters = self.generate_random_volume(
+                volume_shape, init_args=my_init_args, dtype=self.numpy_dtype, rng=rng
+            )
 
     def _init_planes(self, volume_shape, init_mode, init_args):
         n_planes = int(init_mode[0])
         z_offset = init_args.get("z_offset", 0)
         delta_n = init_args.get("delta_n", 0.01)
         self.voxel_parameters = self.generate_planes_volume(
-            volume_shape, n_planes, z_offset=z_offset, delta_n=delta_n
+            volume_shape,
+            n_planes,
+            z_offset=z_offset,
+            delta_n=delta_n,
+            dtype=self._storage_dtype(),
         )
 
     def _init_ellipsoid_or_shell(self, volume_shape, init_mode, init_args):
@@ -779,19 +883,38 @@ class BirefringentVolume(BirefringentElement):
         delta_n = init_args.get("delta_n", 0.01)
         alpha = init_args.get("border_thickness", 1)
         self.voxel_parameters = self.generate_ellipsoid_volume(
-            volume_shape, center=center, radius=radius, alpha=alpha, delta_n=delta_n
+            volume_shape,
+            center=center,
+            radius=radius,
+            alpha=alpha,
+            delta_n=delta_n,
+            dtype=self._storage_dtype(),
         )
         if init_mode == "shell":
             self._apply_shell_modification()
 
+    # Methods of init_volume that set the voxel_parameters, by init_mode.
+    #   The "Nplanes" modes, e.g. "3planes", are matched separately.
+    _INIT_METHODS = {
+        "single_voxel": _init_single_voxel,
+        "random": _init_random,
+        "ellipsoid": _init_ellipsoid_or_shell,
+        "shell": _init_ellipsoid_or_shell,
+    }
+
     def _apply_shell_modification(self):
+        """Zeros the birefringence of the front half of the ellipsoid. The
+        generated voxel parameters are modified with one in-place slice
+        fill, before they are stored as Delta_n by _set_volume_ref."""
+        cutoff = self.optical_info["volume_shape"][0] // 2 + 2
+        self.voxel_parameters[0, :cutoff, ...] = 0
+
+    def _storage_dtype(self):
+        """Numpy dtype in which the volume is stored by the backend, so that
+        the voxel parameters are not generated in a higher precision."""
         if self.backend == BackEnds.PYTORCH:
-            with torch.no_grad():
-                self.get_delta_n()[
-                    : self.optical_info["volume_shape"][0] // 2 + 2, ...
-                ] = 0
-        else:
-            self.get_delta_n()[: self.optical_info["volume_shape"][0] // 2 + 2, ...] = 0
+            return torch.empty(0).numpy().dtype
+        return self.numpy_dtype
 
     def _set_volume_ref(self):
         volume_ref = BirefringentVolume(
@@ -799,22 +922,65 @@ class BirefringentVolume(BirefringentElement):
             optical_info=self.optical_info,
             Delta_n=self.voxel_parameters[0, ...],
             optic_axis=self.voxel_parameters[1:, ...],
+            numpy_dtype=self.numpy_dtype,
         )
         self.Delta_n = volume_ref.Delta_n
         self.optic_axis = volume_ref.optic_axis
 
+    @staticmethod
+    def generate_ellipsoids_volume(volume_shape, ellipsoids_args, dtype=np.float64):
+        """Sums many ellipsoids into one volume, as adding their
+        BirefringentVolumes one by one with += would, without building a
+        volume per ellipsoid.
+        Args:
+            ellipsoids_args (list): init_args of each ellipsoid, with the
+                keys center, radius, delta_n and border_thickness.
+            dtype (np.dtype): Floating point type of the returned volume.
+        Returns:
+            vol (np.array): 4D array where the first dimension represents the
+                birefringence and optic axis properties, and the last three
+                dims represents the 3D spatial locations.
+        """
+        vol = np.zeros((4,) + tuple(volume_shape), dtype=dtype)
+        if NUMBA_AVAILABLE:
+            # Numba sums all the ellipsoids in one pass over the volume
+            centers = [
+                [floor(c * s) for c, s in zip(args["center"], volume_shape)]
+                for args in ellipsoids_args
+            ]
+            radii = [args["radius"] for args in ellipsoids_args]
+            inner_radii = [
+                [r - args["border_thickness"] for r in args["radius"]]
+                for args in ellipsoids_args
+            ]
+            delta_ns = [args["delta_n"] for args in ellipsoids_args]
+            return fill_ellipsoid_shells(vol, centers, radii, inner_radii, delta_ns)
+        for args in ellipsoids_args:
+            ellipsoid = BirefringentVolume.generate_ellipsoid_volume(
+                volume_shape,
+                center=args["center"],
+                radius=args["radius"],
+                alpha=args["border_thickness"],
+                delta_n=args["delta_n"],
+                dtype=dtype,
+            )
+            vol += ellipsoid
+            normalize_optic_axis_inplace(vol[1:])
+        return vol
+
     @staticmethod
     def generate_single_voxel_volume(
         volume_shape: list[int, int, int],
         delta_n: float = 0.01,
         optic_axis: list = [1, 0, 0],
         offset: list[int, int, int] = [0, 0, 0],
+        dtype=np.float64,
     ):
         """Generates a single voxel volume."""
         # Identity the center of the volume after the shifts
         vox_idx = [s // 2 + o for s, o in zip(volume_shape, offset)]
         # Create a volume of all zeros.
-        vol = np.zeros((4,) + tuple(volume_shape))
+        vol = np.zeros((4,) + tuple(volume_shape), dtype=dtype)
         # Set the birefringence and optic axis
         vol[0, vox_idx[0], vox_idx[1], vox_idx[2]] = delta_n
         vol[1:, vox_idx[0], vox_idx[1], vox_idx[2]] = np.array(optic_axis)
@@ -824,19 +990,52 @@ class BirefringentVolume(BirefringentElement):
     def generate_random_volume(
         volume_shape: list[int, int, int],
         init_args: dict = {"Delta_n_range": [0, 1], "axes_range": [-1, 1]},
+        dtype=np.float64,
+        rng: np.random.Generator = None,
     ):
-        """Generates a random volume."""
-        np.random.seed(42)
-        Delta_n = np.random.uniform(*init_args["Delta_n_range"], volume_shape)
-        axes = [
-            np.random.uniform(*init_args["axes_range"], volume_shape) for _ in range(3)
-        ]
-        norm_A = np.linalg.norm(axes, axis=0)
-        return np.concatenate(
-            [np.expand_dims(Delta_n, axis=0)]
-            + [np.expand_dims(a / norm_A, axis=0) for a in axes],
-            axis=0,
-        )
+        """Generates a random volume. Without an rng, a generator seeded
+        with 42 is used, so the volume is reproducible."""
+        if rng is None:
+            rng = np.random.default_rng(42)
+        volume_shape = tuple(volume_shape)
+        vol = np.empty((4,) + volume_shape, dtype=dtype)
+        vol[0] = rng.uniform(*init_args["Delta_n_range"], volume_shape)
+        vol[1:] = rng.uniform(*init_args["axes_range"], (3,) + volume_shape)
+        # Normalize the optic axis in place, reusing the buffer of the norms
+        norm = np.einsum("i...,i...->...", vol[1:], vol[1:])
+        vol[1:] /= np.sqrt(norm, out=norm)
+        return vol
+
+    @staticmethod
+    def generate_random_volume_torch(
+        volume_shape: list[int, int, int],
+        init_args: dict = {"Delta_n_range": [0, 1], "axes_range": [-1, 1]},
+        seed: int = None,
+        generator: torch.Generator = None,
+    ):
+        """Generates a random volume as a tensor on the device given by
+        init_args["device"] (default: cpu). The volume is created on that
+        device, so no host copy is needed.
+        Args:
+            seed (int): Seed of the generator. Defaults to init_args["seed"],
+                or 42 if that is not given either.
+            generator (torch.Generator): Generator to draw from instead,
+                on the same device. The seed is ignored if given.
+        """
+        device = init_args.get("device", "cpu")
+        if generator is None:
+            if seed is None:
+                seed = init_args.get("seed", 42)
+            generator = torch.Generator(device=device)
+            generator.manual_seed(seed)
+        vol = torch.empty(
+            (4, *volume_shape), dtype=torch.get_default_dtype(), device=device
+        )
+        vol[0].uniform_(*init_args["Delta_n_range"], generator=generator)
+        vol[1:].uniform_(*init_args["axes_range"], generator=generator)
+        # Normalize the optic axis in place
+        vol[1:] /= torch.linalg.vector_norm(vol[1:], dim=0)
+        return vol
 
     @staticmethod
     def generate_planes_volume(
@@ -844,13 +1043,21 @@ class BirefringentVolume(BirefringentElement):
         n_planes: int = 1,
         z_offset: int = 0,
         delta_n: float = 0.01,
+        dtype=np.float64,
+        rng: np.random.Generator = None,
     ):
-        """Generates a volume with planes."""
-        vol = np.zeros((4,) + tuple(volume_shape))
+        """Generates a volume with planes. The optic axis outside of the
+        planes is drawn from rng, which defaults to a generator seeded from
+        numpy's global random state."""
+        if rng is None:
+            rng = _rng_from_global_state()
+        vol = np.zeros((4,) + tuple(volume_shape), dtype=dtype)
         z_size = volume_shape[0]
         z_ranges = np.linspace(0, z_size - 1, n_planes * 2).astype(int)
-        optic_axis = np.random.uniform(-1, 1, (3, *volume_shape))
-        vol[1:, ...] = optic_axis / np.linalg.norm(optic_axis, axis=0)
+        optic_axis = rng.uniform(-1, 1, (3, *volume_shape))
+        # Normalize straight into vol, reusing the buffer of the norms
+        norm = np.einsum("i...,i...->...", optic_axis, optic_axis)
+        np.divide(optic_axis, np.sqrt(norm, out=norm), out=vol[1:, ...])
 
         if n_planes == 1:
             # Birefringence
@@ -864,15 +1071,18 @@ class BirefringentVolume(BirefringentElement):
         random_data = BirefringentVolume.generate_random_volume([n_planes])
         for z_ix in range(n_planes):
             slice_range = z_ranges[z_ix * 2 : z_ix * 2 + 1]
-            expanded_data = np.expand_dims(random_data[:, z_ix], axis=(1, 2, 3))
-            vol[:, slice_range] = expanded_data.repeat(volume_shape[1], axis=2).repeat(
-                volume_shape[2], axis=3
-            )
+            # Broadcast the voxel parameters across the plane while storing
+            vol[:, slice_range] = random_data[:, z_ix, None, None, None]
         return vol
 
     @staticmethod
     def generate_ellipsoid_volume(
-        volume_shape, center=[0.5, 0.5, 0.5], radius=[10, 10, 10], alpha=1, delta_n=0.01
+        volume_shape,
+        center=[0.5, 0.5, 0.5],
+        radius=[10, 10, 10],
+        alpha=1,
+        delta_n=0.01,
+        dtype=np.float64,
     ):
         """Creates an ellipsoid with optical axis normal to the ellipsoid surface.
         Args:
@@ -880,6 +1090,8 @@ class BirefringentVolume(BirefringentElement):
             radius [3]: in voxels, the radius in z,y,x for this ellipsoid.
             alpha (float): Border thickness.
             delta_n (float): Delta_n value of birefringence in the volume
+            dtype (np.dtype): Floating point type of the returned volume. The
+                masks are computed in float64 regardless.
         Returns:
             vol (np.array): 4D array where the first dimension represents the
                 birefringence and optic axis properties, and the last three
@@ -887,13 +1099,15 @@ class BirefringentVolume(BirefringentElement):
         """
         # Originally grabbed from https://math.stackexchange.com/questions/2931909/normal-of-a-point-on-the-surface-of-an-ellipsoid,
         #   then modified to do the subtraction of two ellipsoids instead.
-        vol = np.zeros((4,) + tuple(volume_shape))
-        kk, jj, ii = np.meshgrid(
-            np.arange(volume_shape[0]),
-            np.arange(volume_shape[1]),
-            np.arange(volume_shape[2]),
-            indexing="ij",
-        )
+        vol = np.zeros((4,) + tuple(volume_shape), dtype=dtype)
+        if NUMBA_AVAILABLE:
+            # Numba computes the hollow shell in one pass without temporary volumes
+            center_idx = [floor(c * s) for c, s in zip(center, volume_shape)]
+            inner_radius = [r - alpha for r in radius]
+            return fill_ellipsoid_shell(vol, center_idx, radius, inner_radius, delta_n)
+        # Axis coordinates shaped to broadcast against each other, instead of
+        #   materializing three full 3D index grids
+        kk, jj, ii = np.ogrid[: volume_shape[0], : volume_shape[1], : volume_shape[2]]
         # shift to center
         kk = floor(center[0] * volume_shape[0]) - kk.astype(float)
         jj = floor(center[1] * volume_shape[1]) - jj.astype(float)
@@ -922,7 +1136,7 @@ class BirefringentVolume(BirefringentElement):
         else:
             ellipsoid_border_mask = np.abs(ellipsoid_border - alpha) <= 1
 
-        vol[0, ...] = ellipsoid_border_mask.astype(float)
+        vol[0, ...] = ellipsoid_border_mask
         # Compute normals
         kk_normal = 2 * kk / radius[0]
         jj_normal = 2 * jj / radius[1]
@@ -930,23 +1144,39 @@ class BirefringentVolume(BirefringentElement):
         norm_factor = np.sqrt(kk_normal**2 + jj_normal**2 + ii_normal**2)
         # Avoid division by zero
         norm_factor[norm_factor == 0] = 1
-        vol[1, ...] = (kk_normal / norm_factor) * vol[0, ...]
-        vol[2, ...] = (jj_normal / norm_factor) * vol[0, ...]
-        vol[3, ...] = (ii_normal / norm_factor) * vol[0, ...]
+        # Write the normals straight into vol to avoid volume sized temporaries
+        for axis, normal in enumerate([kk_normal, jj_normal, ii_normal], start=1):
+            np.divide(normal, norm_factor, out=vol[axis, ...])
+            vol[axis, ...] *= vol[0, ...]
         vol[0, ...] *= delta_n
         # vol = vol.permute(0,2,1,3)
         if hollow_inner:
             # Hollowing out the ellipsoid
             combined_mask = np.logical_and(ellipsoid_border_mask, ~inner_mask)
-            vol[0, ...] = vol[0, ...] * combined_mask.astype(float)
+            vol[0, ...] *= combined_mask
         return vol
 
+    @staticmethod
+    def _create_ellipsoids_volume(backend, optical_info, ellipsoids_args):
+        """Creates a BirefringentVolume with the sum of many ellipsoids, see
+        generate_ellipsoids_volume."""
+        vol = BirefringentVolume.generate_ellipsoids_volume(
+            optical_info["volume_shape"], ellipsoids_args
+        )
+        return BirefringentVolume(
+            backend=backend,
+            optical_info=optical_info,
+            Delta_n=vol[0, ...],
+            optic_axis=vol[1:, ...],
+        )
+
     @staticmethod
     def create_dummy_volume(
         backend=BackEnds.NUMPY,
         optical_info=None,
         vol_type="shell",
         volume_axial_offset=0,
+        rng: np.random.Generator = None,
     ):
         """Create different volumes, some of them randomized. Feel free to add
         your volumes here.
@@ -956,10 +1186,17 @@ class BirefringentVolume(BirefringentElement):
             vol_type (str): Type of volume to generate. Options include "single_voxel", "zeros",
                             "ellipsoid", and "shell".
             volume_axial_offset (int): A potential offset for the volume on the axial direction.
+            rng (np.random.Generator): Random generator shared by the
+                randomized volumes. If None, a generator is seeded from
+                numpy's global random state, so np.random.seed still makes
+                the volumes reproducible, though with different values
+                than the legacy np.random draws.
         Returns:
             volume (BirefringentVolume)
         """
         volume_shape = optical_info["volume_shape"]
+        if rng is None:
+            rng = _rng_from_global_state()
 
         if vol_type in ["single_voxel", "zeros"]:
             if backend == BackEnds.NUMPY:
@@ -1025,63 +1262,45 @@ class BirefringentVolume(BirefringentElement):
             )
         elif vol_type[-10:] == "ellipsoids":
             n_ellipsoids = int(vol_type[:-10])
-            volume = BirefringentVolume(
-                backend=backend,
-                optical_info=optical_info,
-                volume_creation_args={"init_mode": "zeros"},
-            )
+            ellipsoids_args = []
             for _ in range(n_ellipsoids):
                 ellipsoid_args = {
-                    "radius": np.random.uniform(0.5, 3.5, [3]),
+                    "radius": rng.uniform(0.5, 3.5, [3]),
                     "center": [
-                        np.random.uniform(0.35, 0.65),
+                        rng.uniform(0.35, 0.65),
                     ]
-                    + list(np.random.uniform(0.3, 0.70, [2])),
-                    "delta_n": np.random.uniform(-0.01, -0.001),
+                    + list(rng.uniform(0.3, 0.70, [2])),
+                    "delta_n": rng.uniform(-0.01, -0.001),
                     "border_thickness": 1,
                 }
-                new_vol = BirefringentVolume(
-                    backend=backend,
-                    optical_info=optical_info,
-                    volume_creation_args={
-                        "init_mode": "ellipsoid",
-                        "init_args": ellipsoid_args,
-                    },
-                )
-                volume += new_vol
-        elif vol_type == "ellipsoids_random":
-            n_ellipsoids = np.random.randint(1, 5)
-            volume = BirefringentVolume(
-                backend=backend,
-                optical_info=optical_info,
-                volume_creation_args={"init_mode": "zeros"},
+                ellipsoids_args.append(ellipsoid_args)
+            volume = BirefringentVolume._create_ellipsoids_volume(
+                backend, optical_info, ellipsoids_args
             )
+        elif vol_type == "ellipsoids_random":
+            n_ellipsoids = rng.integers(1, 5)
+            ellipsoids_args = []
             for _ in range(n_ellipsoids):
                 ellipsoid_args = {
-                    "radius": np.random.uniform(0.5, 3.5, [3]) * 10,
+                    "radius": rng.uniform(0.5, 3.5, [3]) * 10,
                     "center": [
-                        np.random.uniform(0.35, 0.65),
+                        rng.uniform(0.35, 0.65),
                     ]
-                    + list(np.random.uniform(0.3, 0.70, [2])),
-                    "delta_n": np.random.uniform(-0.01, -0.001),
+                    + list(rng.uniform(0.3, 0.70, [2])),
+                    "delta_n": rng.uniform(-0.01, -0.001),
                     "border_thickness": 1 * 3,
                 }
-                new_vol = BirefringentVolume(
-                    backend=backend,
-                    optical_info=optical_info,
-                    volume_creation_args={
-                        "init_mode": "ellipsoid",
-                        "init_args": ellipsoid_args,
-                    },
-                )
-                volume += new_vol
+                ellipsoids_args.append(ellipsoid_args)
+            volume = BirefringentVolume._create_ellipsoids_volume(
+                backend, optical_info, ellipsoids_args
+            )
         elif vol_type == "sphere":
             sphere_args = {
-                "radius": [np.random.uniform(3, 6)] * 3,
+                "radius": [rng.uniform(3, 6)] * 3,
                 "center": [
-                    np.random.uniform(0.35, 0.65),
+                    rng.uniform(0.35, 0.65),
                 ]
-                + list(np.random.uniform(0.3, 0.70, [2])),
+                + list(rng.uniform(0.3, 0.70, [2])),
                 "delta_n": -0.01,
                 "border_thickness": 1,
             }
@@ -1112,11 +1331,11 @@ class BirefringentVolume(BirefringentElement):
             min_x = 0.5 - 0.125
             max_x = 0.5 + 0.124
             sphere_args = {
-                "radius": [np.random.uniform(1, 2)] * 3,
+                "radius": [rng.uniform(1, 2)] * 3,
                 "center": [
-                    np.random.uniform(min_x, max_x),
+                    rng.uniform(min_x, max_x),
                 ]
-                + list(np.random.uniform(0.42, 0.55, [2])),
+                + list(rng.uniform(0.42, 0.55, [2])),
                 "delta_n": 0.01,
                 "border_thickness": 1,
             }
@@ -1132,12 +1351,12 @@ class BirefringentVolume(BirefringentElement):
             min_x = 0.5 - 0.125
             max_x = 0.5 + 0.124
             sphere_args = {
-                "radius": [np.random.uniform(1, 2)] * 3,
+                "radius": [rng.uniform(1, 2)] * 3,
                 "center": [
-                    np.random.uniform(min_x, max_x),
+                    rng.uniform(min_x, max_x),
                 ]
-                + list(np.random.uniform(0.42, 0.55, [2])),
-                "delta_n": np.random.uniform(0.005, 0.015),
+                + list(rng.uniform(0.42, 0.55, [2])),
+                "delta_n": rng.uniform(0.005, 0.015),
                 "border_thickness": 1,
             }
             volume = BirefringentVolume(
@@ -1179,6 +1398,24 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
         self.MLA_volume_geometry_ready = False
         self.verbose = True
         self.only_nonzero_for_jones = False
+        # Fuse the Jones matrix accumulation with torch.compile
+        self.compile_jones_step = False
+        # Replay the Jones matrix accumulation as a CUDA graph
+        self.graph_jones_product = False
+        # Number of rays per block when processing all rays at once,
+        #   None processes all the rays in a single block
+        self.mla_ray_block_size = None
+        # Collision lengths scaled by pi / wavelength, see _get_scaled_colli_lengths
+        self._scaled_colli_lengths = None
+        # Component-major ray direction basis, see _get_ray_dir_components
+        self._ray_dir_components = None
+        # Pixels reached by a ray, see _get_valid_pixel_indices
+        self._valid_pixel_indices = None
+        # Reduced precision dtype (e.g. torch.float16) for storing the cached
+        #   ray geometry. The arithmetic is promoted to the dtype of the
+        #   volume, and the Jones matrix product is accumulated in at least
+        #   float32.
+        self.ray_geometry_dtype = None
         self.mla_execution_times = {}
 
         # Initialize timing dictionary
@@ -1222,7 +1459,8 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
         """Save the BirefringentRaytraceLFM instance to a file"""
         time0 = time.time()
         with open(filepath, "wb") as file:
-            pickle.dump(self, file)
+            # Use the highest pickle protocol
+            pickle.dump(self, file, pickle.HIGHEST_PROTOCOL)
         print(f"Rays saved in {time.time() - time0:.0f} seconds to {filepath}")
 
     def print_timing_info(self, precision=2, unit="ms"):
@@ -1402,29 +1640,31 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
         n_voxels_per_ml = self.optical_info["n_voxels_per_ml"]
         n_ml_half = floor(n_micro_lenses / 2.0)
         collision_indices = self.ray_vol_colli_indices
+        mla_indices = []
+        offsets = []
+        for ml_ii_idx in range(n_micro_lenses):
+            ml_ii = ml_ii_idx - n_ml_half
+            for ml_jj_idx in range(n_micro_lenses):
+                ml_jj = ml_jj_idx - n_ml_half
+                mla_indices.append((ml_jj_idx, ml_ii_idx))
+                offsets.append(
+                    self._calculate_current_offset(
+                        ml_ii, ml_jj, n_voxels_per_ml, n_micro_lenses
+                    )
+                )
+        vox_lists = self._gather_voxels_of_rays_all_offsets(offsets, collision_indices)
         if self.verbose:
             print(f"Storing shifted voxel indices for each microlens:")
-            row_iterable = tqdm(
-                range(n_micro_lenses),
-                desc=f"Computing rows of microlenses for storing voxel indices",
+            vox_lists = tqdm(
+                vox_lists,
+                total=len(offsets),
+                desc=f"Computing microlenses for storing voxel indices",
                 position=1,
                 leave=True,
             )
-        else:
-            row_iterable = range(n_micro_lenses)
-        for ml_ii_idx in row_iterable:
-            ml_ii = ml_ii_idx - n_ml_half
-            for ml_jj_idx in range(n_micro_lenses):
-                ml_jj = ml_jj_idx - n_ml_half
-                current_offset = self._calculate_current_offset(
-                    ml_ii, ml_jj, n_voxels_per_ml, n_micro_lenses
-                )
-                mla_index = (ml_jj_idx, ml_ii_idx)
-                vox_list = self._gather_voxels_of_rays_pytorch(
-                    current_offset, collision_indices
-                )
-                if mla_index not in self.vox_indices_by_mla_idx.keys():
-                    self.vox_indices_by_mla_idx[mla_index] = vox_list
+        for mla_index, vox_list in zip(mla_indices, vox_lists):
+            if mla_index not in self.vox_indices_by_mla_idx.keys():
+                self.vox_indices_by_mla_idx[mla_index] = vox_list
         check_for_negative_values_dict(self.vox_indices_by_mla_idx)
         return self.vox_indices_by_mla_idx
 
@@ -1448,12 +1688,12 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
 
     def create_colli_indices_all(self):
         """Gather the collision indices for all microlenses at once."""
-        vox_indices_by_mla_idx = self.vox_indices_by_mla_idx_tensors
-        tensors_to_combine = []
-        for key in vox_indices_by_mla_idx:
-            tensors_to_combine.extend(vox_indices_by_mla_idx[key])
-        if tensors_to_combine:
-            giant_tensor = torch.stack(tensors_to_combine, dim=0)
+        # The tensors of all microlenses are padded to the same length, so
+        #   their rows can be copied into a single allocation
+        tensors_to_combine = list(self.vox_indices_by_mla_idx_tensors.values())
+        n_rows = sum(tensor.shape[0] for tensor in tensors_to_combine)
+        if n_rows > 0:
+            giant_tensor = torch.cat(tensors_to_combine, dim=0)
         else:
             giant_tensor = torch.tensor([])
         self.vox_indices_ml_shifted_all = giant_tensor
@@ -1462,21 +1702,19 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
         """Gather the valid ray indices for all microlenses at once."""
         n_micro_lenses = self.optical_info["n_micro_lenses"]
         n_pixels_per_ml = self.optical_info["pixels_per_ml"]
-        self.ray_valid_indices_all = None
-        device = self.ray_valid_indices.device
-        for ml_ii_idx in range(n_micro_lenses):
-            for ml_jj_idx in range(n_micro_lenses):
-                if self.ray_valid_indices_all is None:
-                    self.ray_valid_indices_all = self.ray_valid_indices.clone()
-                else:
-                    offset = torch.tensor(
-                        [ml_jj_idx * n_pixels_per_ml, ml_ii_idx * n_pixels_per_ml],
-                        device=device,
-                    ).unsqueeze(1)
-                    updated_ray_valid_indices = self.ray_valid_indices + offset
-                    self.ray_valid_indices_all = torch.cat(
-                        (self.ray_valid_indices_all, updated_ray_valid_indices), dim=1
-                    )
+        ray_valid_indices = self.ray_valid_indices
+        ml_indices = torch.arange(
+            n_micro_lenses,
+            dtype=ray_valid_indices.dtype,
+            device=ray_valid_indices.device,
+        )
+        ml_ii, ml_jj = torch.meshgrid(ml_indices, ml_indices, indexing="ij")
+        # Pixel offset [2, n_micro_lenses**2] of each microlens, row by row
+        offsets = torch.stack([ml_jj.flatten(), ml_ii.flatten()]) * n_pixels_per_ml
+        # Broadcast the rays against the offsets into a single allocation
+        self.ray_valid_indices_all = (
+            ray_valid_indices.unsqueeze(1) + offsets.unsqueeze(2)
+        ).reshape(2, -1)
 
     def replicate_ray_info_each_microlens(self):
         """Replicate ray info for all the microlenses"""
@@ -1559,13 +1797,13 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
                 )
             full_img_list = self.ret_and_azim_images_mla_torch(volume_in)
         else:
-            full_img_list = [None] * 5
             odd_mla_shift = n_micro_lenses % 2  # shift for odd number of microlenses
             row_iterable = self._get_row_iterable(n_ml_half, odd_mla_shift)
+            # Images of each microlens, indexed by [row][column]
+            mla_img_lists = []
             # Iterate over each row of microlenses (y direction)
             for ml_ii_idx, ml_ii in enumerate(row_iterable):
-                # Initialize a list for storing concatenated images of the current row
-                full_img_row_list = [None] * 5
+                row_img_lists = []
                 # Iterate over each column of microlenses in the current row (x direction)
                 for ml_jj_idx, ml_jj in enumerate(
                     range(-n_ml_half, n_ml_half + odd_mla_shift)
@@ -1579,14 +1817,10 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
                         intensity,
                         mla_index=(ml_jj_idx, ml_ii_idx),
                     )
-                    # Concatenate the generated images with the images of the current row
-                    full_img_row_list = self._concatenate_images(
-                        full_img_row_list, img_list, axis=0
-                    )
-                # Concatenate the row images with the full image list
-                full_img_list = self._concatenate_images(
-                    full_img_list, full_img_row_list, axis=1
-                )
+                    row_img_lists.append(img_list)
+                mla_img_lists.append(row_img_lists)
+            # Tile the microlens images into the full images in a single pass
+            full_img_list = self._assemble_mla_images(mla_img_lists)
         end_time_raytrace = time.perf_counter()
         self.times["ray_trace_through_volume"] += (
             end_time_raytrace - start_time_raytrace
@@ -1681,19 +1915,31 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
             self.mla_execution_times[mla_index] = 0
         self.mla_execution_times[mla_index] += execution_time
 
-    def _concatenate_images(self, img_list1, img_list2, axis):
-        if img_list1[0] is None:
-            return img_list2
-        if self.backend == BackEnds.NUMPY:
-            return [
-                np.concatenate((img1, img2), axis)
-                for img1, img2 in zip(img_list1, img_list2)
-            ]
-        elif self.backend == BackEnds.PYTORCH:
-            return [
-                torch.concatenate((img1, img2), axis)
-                for img1, img2 in zip(img_list1, img_list2)
-            ]
+    def _assemble_mla_images(self, mla_img_lists):
+        """Tiles the images of each microlens into images of the full
+        microlens array. The columns of microlenses are placed along the
+        first image axis and the rows along the second axis, matching the
+        concatenation order used for the ray tracing.
+
+        Args:
+            mla_img_lists (list): Nested list indexed by [row][column] of
+                the lists of images generated for each microlens.
+        Returns:
+            list: Images of the full microlens array.
+        """
+        n_images = len(mla_img_lists[0][0])
+        full_img_list = []
+        for img_idx in range(n_images):
+            imgs = [[imgs[img_idx] for imgs in row] for row in mla_img_lists]
+            if self.backend == BackEnds.NUMPY:
+                stacked = np.stack([np.stack(row) for row in imgs])
+                tiled = stacked.transpose(1, 2, 0, 3)
+            elif self.backend == BackEnds.PYTORCH:
+                stacked = torch.stack([torch.stack(row) for row in imgs])
+                tiled = stacked.permute(1, 2, 0, 3)
+            n_cols, px_rows, n_rows, px_cols = tiled.shape
+            full_img_list.append(tiled.reshape(n_cols * px_rows, n_rows * px_cols))
+        return full_img_list
 
     def _measure_time(self, func, *args, **kwargs):
         """Helper function to measure execution time of a function."""
@@ -1754,36 +2000,38 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
         n_ray = j + i * self.optical_info["pixels_per_ml"]
         rayDir = self.ray_direction_basis[n_ray][:]
 
-        jones_list = []
+        vox = np.array(voxels_of_segs[n_ray], dtype=int).reshape(-1, 3)
+        ell = np.asarray(ell_in_voxels[n_ray][: len(vox)])
         try:
-            for m, vox in enumerate(voxels_of_segs[n_ray]):
-                ell = ell_in_voxels[n_ray][m]
-                # Check if indices are within bounds
-                y_index = vox[1] + microlens_offset[0]
-                z_index = vox[2] + microlens_offset[1]
-                if not (
-                    0 <= y_index < volume_in.Delta_n.shape[1]
-                    and 0 <= z_index < volume_in.Delta_n.shape[2]
-                ):
-                    raise IndexError(
-                        f"Cumulative Jones Matrix computation failed. "
-                        f"Index out of bounds: Attempted to access Delta_n at index "
-                        f"[{vox[0]}, {y_index}, {z_index}], but this is outside "
-                        f"the valid range of Delta_n's shape {volume_in.Delta_n.shape}."
-                    )
-
-                Delta_n = volume_in.Delta_n[vox[0], y_index, z_index]
-                opticAxis = volume_in.optic_axis[:, vox[0], y_index, z_index]
-                jones = self.voxRayJM(
-                    Delta_n, opticAxis, rayDir, ell, self.optical_info["wavelength"]
+            # Check if indices are within bounds
+            y_index = vox[:, 1] + microlens_offset[0]
+            z_index = vox[:, 2] + microlens_offset[1]
+            out_of_bounds = ~(
+                (0 <= y_index)
+                & (y_index < volume_in.Delta_n.shape[1])
+                & (0 <= z_index)
+                & (z_index < volume_in.Delta_n.shape[2])
+            )
+            if out_of_bounds.any():
+                m = np.argmax(out_of_bounds)
+                raise IndexError(
+                    f"Cumulative Jones Matrix computation failed. "
+                    f"Index out of bounds: Attempted to access Delta_n at index "
+                    f"[{vox[m, 0]}, {y_index[m]}, {z_index[m]}], but this is outside "
+                    f"the valid range of Delta_n's shape {volume_in.Delta_n.shape}."
                 )
-                jones_list.append(jones)
+            Delta_n = volume_in.Delta_n[vox[:, 0], y_index, z_index]
+            opticAxis = volume_in.optic_axis[:, vox[:, 0], y_index, z_index].T
+            ret, azim = self.vox_ray_ret_azim(
+                Delta_n, opticAxis, rayDir, ell, self.optical_info["wavelength"]
+            )
         except Exception as e:
             raise Exception(
                 "Cumulative Jones Matrix computation failed. "
                 + "Error accessing the volume, try increasing the volume size in Y-Z"
             ) from e
-        material_jones = BirefringentRaytraceLFM.rayJM_numpy(jones_list)
+        # Multiply the Jones matrices of all the voxels along the ray
+        material_jones = jones_matrix.jones_product_numpy(ret, azim)
         return material_jones
 
     def calc_cummulative_JM_of_ray_torch(
@@ -1858,18 +2106,8 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
                 + "length as the list of filtered ray volume collision indices."
             )
             assert len(voxels_of_segs) == len(collision_indices), err_message
-            if not voxels_of_segs:
-                # print("The list 'voxels_of_segs' is empty.")
-                max_length = 0
-                padded_voxels_of_segs = []
-            else:
-                max_length = max(len(inner_list) for inner_list in voxels_of_segs)
-                # Pad each list to the maximum length and create a tensor
-                padded_voxels_of_segs = [
-                    inner_list + [-1] * (max_length - len(inner_list))
-                    for inner_list in voxels_of_segs
-                ]
-            voxels_of_segs = torch.tensor(padded_voxels_of_segs, dtype=torch.int)
+            # Pad each list to the maximum length and create a tensor
+            voxels_of_segs = pad_lists_to_tensor(voxels_of_segs)
         else:
             ell_in_voxels = self.ray_vol_colli_lengths
             ray_dir_basis = self.ray_direction_basis
@@ -1885,13 +2123,10 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
                         )
                         self.vox_indices_by_mla_idx[mla_index] = vox_list
                     voxels_of_segs = self.vox_indices_by_mla_idx[mla_index]
-                    max_length = max(len(inner_list) for inner_list in voxels_of_segs)
                     # Pad shorter lists with a specific value (e.g., -1 if -1 is not a valid data point)
-                    padded_voxels_of_segs = [
-                        inner_list + [-1] * (max_length - len(inner_list))
-                        for inner_list in voxels_of_segs
-                    ]
-                    voxels_of_segs_tensor = torch.tensor(padded_voxels_of_segs)
+                    voxels_of_segs_tensor = pad_lists_to_tensor(
+                        voxels_of_segs, dtype=torch.long
+                    )
                     self.vox_indices_by_mla_idx_tensors[mla_index] = (
                         voxels_of_segs_tensor
                     )
@@ -1902,15 +2137,60 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
         voxels_of_segs_tensor = voxels_of_segs
         if voxels_of_segs_tensor.numel() == 0:
             print("The tensor is empty.")
-            valid_voxels_count = torch.tensor([], dtype=torch.int)
-        else:
-            valid_voxels_mask = voxels_of_segs_tensor != -1
-            valid_voxels_count = valid_voxels_mask.sum(dim=1)
 
         if "mask_voxels_of_segs" not in self.times:
             self.times["mask_voxels_of_segs"] = 0
         self.times["mask_voxels_of_segs"] += time.perf_counter() - end_time_prep
 
+        block_size = self.mla_ray_block_size
+        n_rays = voxels_of_segs_tensor.shape[0]
+        if all_rays_at_once and block_size is not None and block_size < n_rays:
+            # Process the rays in blocks to bound the size of the gathered
+            #   voxel properties and the intermediate Jones matrices
+            material_jones = torch.cat(
+                [
+                    self._jones_of_ray_segments(
+                        volume_in,
+                        voxels_of_segs_tensor[i : i + block_size],
+                        ray_dir_basis[:, i : i + block_size],
+                        ell_in_voxels[i : i + block_size],
+                    )
+                    for i in range(0, n_rays, block_size)
+                ]
+            )
+        else:
+            material_jones = self._jones_of_ray_segments(
+                volume_in, voxels_of_segs_tensor, ray_dir_basis, ell_in_voxels
+            )
+        end_time_cummulative_jones = time.perf_counter()
+        self.times["cummulative_jones"] += (
+            end_time_cummulative_jones - start_time_cummulative_jones
+        )
+        return material_jones
+
+    def _jones_of_ray_segments(
+        self, volume_in, voxels_of_segs_tensor, ray_dir_basis, ell_in_voxels
+    ):
+        """Computes the cumulative Jones matrix of each ray from the voxels
+        its segments traverse.
+
+        Args:
+            volume_in (BirefringentVolume): The volume through which rays pass.
+            voxels_of_segs_tensor (torch.Tensor): Voxel indices of the ray
+                segments, with shape [n_rays, n_steps].
+            ray_dir_basis (torch.Tensor): Ray direction basis, with the rays
+                along the second dimension.
+            ell_in_voxels (torch.Tensor): Collision lengths of the ray
+                segments, with shape [n_rays, n_steps].
+
+        Returns:
+            torch.Tensor: The cumulative Jones Matrices for the rays.
+        """
+        material_jones = None
+        if DEBUG:
+            # Number of voxels each ray traverses, only needed for the checks
+            valid_voxels_count = count_voxels_of_segs(voxels_of_segs_tensor)
+
         # Process interactions of all rays with each voxel
         # Iterate the interactions of all rays with the m-th voxel
         # Some rays interact with less voxels,
@@ -1930,28 +2210,50 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
                 end_time_gather_params - start_time_gather_params
             )
 
-            # Compute the interaction from the rays with their corresponding voxels
-            jones = self.voxRayJM(
-                Delta_n=Delta_n,
-                opticAxis=opticAxis,
-                rayDir=ray_dir_basis,
-                ell=ell_in_voxels,
-                wavelength=self.optical_info["wavelength"],
-            )
+            if not self.only_nonzero_for_jones:
+                # Compute the retardance and azimuth of each segment and
+                #   multiply the Jones matrices elementwise along each ray
+                start_time_voxRayJM = time.perf_counter()
+                ret, azim = self.vox_ray_ret_azim(
+                    Delta_n,
+                    opticAxis,
+                    ray_dir_basis,
+                    ell_in_voxels,
+                    self.optical_info["wavelength"],
+                )
+                start_time_mloop = time.perf_counter()
+                self.times["voxRayJM"] += start_time_mloop - start_time_voxRayJM
+                if self.graph_jones_product:
+                    jones_product_fn = jones_matrix.get_graphed_jones_product_fn()
+                    material_jones = jones_product_fn(ret, azim)
+                else:
+                    material_jones = jones_matrix.jones_product_from_ret_azim(
+                        ret, azim, compile_step=self.compile_jones_step
+                    )
+                self.times["jones_matrix_multiplication"] += (
+                    time.perf_counter() - start_time_mloop
+                )
+            else:
+                # Compute the interaction from the rays with their corresponding voxels
+                jones = self.voxRayJM(
+                    Delta_n=Delta_n,
+                    opticAxis=opticAxis,
+                    rayDir=ray_dir_basis,
+                    ell=ell_in_voxels,
+                    wavelength=self.optical_info["wavelength"],
+                )
 
-            start_time_mloop = time.perf_counter()
-            material_jones = jones[:, 0]
-            for m in range(1, ell_in_voxels.shape[1]):
+                start_time_mloop = time.perf_counter()
                 if DEBUG:
-                    # Determine which rays have remaining voxels to traverse
-                    rays_with_voxels = valid_voxels_count > m
+                    # Determine which rays have voxels to traverse at every step
+                    rays_with_voxels = valid_voxels_count >= ell_in_voxels.shape[1]
                     assert rays_with_voxels.all(), "Rays with voxels not found."
-                # Combine the current Jones Matrix with the cumulative one
-                start_time_jones_mult = time.perf_counter()
-                material_jones = material_jones @ jones[:, m]
-                end_time_jones_mult = time.perf_counter()
+                # Combine the Jones Matrices of all the steps of each ray
+                material_jones = jones_matrix.jones_product_pairwise(
+                    jones.transpose(0, 1)
+                )
                 self.times["jones_matrix_multiplication"] += (
-                    end_time_jones_mult - start_time_jones_mult
+                    time.perf_counter() - start_time_mloop
                 )
         except IndexError:
             raise IndexError(
@@ -1966,10 +2268,6 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
             raise Exception(f"Cumulative Jones Matrix computation failed: {e}")
         end_time_mloop = time.perf_counter()
         self.times["loop_through_vox_collisions"] += end_time_mloop - start_time_mloop
-        end_time_cummulative_jones = time.perf_counter()
-        self.times["cummulative_jones"] += (
-            end_time_cummulative_jones - start_time_cummulative_jones
-        )
         return material_jones
 
     def retrieve_properties_from_vox_idx(
@@ -1977,7 +2275,8 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
     ):
         """Retrieves the birefringence and optic axis from the volume based on the
         provided voxel indices. This function is used to retrieve the properties
-        of the voxels that each ray segment interacts with."""
+        of the voxels that each ray segment interacts with. The optic axis is
+        returned component-major with shape [3, n_rays, n_steps]."""
         if active_props_only:
             device = volume.birefringence_active.device
             idx_tensor = volume.active_idx2spatial_idx_tensor  # .to(device)
@@ -2014,7 +2313,7 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
             Delta_n = volume.Delta_n[vox]
             opticAxis = volume.optic_axis[:, vox]
 
-        return Delta_n, opticAxis.permute(1, 0, 2)
+        return Delta_n, opticAxis
 
     def _get_default_jones(self):
         """Returns the default Jones Matrix for a ray that does not
@@ -2164,22 +2463,42 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
                     for vox in collision_indices
                 ]
             else:
-                list_of_voxel_lists = [
-                    [
-                        RayTraceLFM.ravel_index(
-                            (
-                                vox[ix][0],
-                                vox[ix][1] + microlens_offset[0],
-                                vox[ix][2] + microlens_offset[1],
-                            ),
-                            vol_shape,
-                        )
-                        for ix in range(len(vox))
-                    ]
-                    for vox in collision_indices
-                ]
+                list_of_voxel_lists = next(
+                    self._gather_voxels_of_rays_all_offsets(
+                        [microlens_offset], collision_indices
+                    )
+                )
         return list_of_voxel_lists
 
+    def _gather_voxels_of_rays_all_offsets(self, microlens_offsets, collision_indices):
+        """Gathers the shifted voxel indices for many microlens offsets.
+        Raveling is linear, so the collision indices are raveled once and
+        each microlens offset only adds a constant to them.
+
+        Args:
+            microlens_offsets (list): Offsets [y, z] in volume space, one
+                                      per microlens.
+            collision_indices (list): The indices of the voxels that each ray
+                                      segment traverses.
+
+        Returns:
+            generator: For each offset, the list of the shifted voxel
+                       indices in 1D of every ray.
+        """
+        vol_shape = self.optical_info["volume_shape"]
+        strides = np.array([vol_shape[1] * vol_shape[2], vol_shape[2], 1])
+        lengths = [len(vox) for vox in collision_indices]
+        max_length = max(lengths, default=0)
+        # Pack the raveled indices of the rays into a padded array
+        raveled = np.zeros((len(lengths), max_length), dtype=np.int64)
+        valid = np.arange(max_length) < np.array(lengths)[:, None]
+        all_vox = [vox for voxels in collision_indices for vox in voxels]
+        raveled[valid] = np.array(all_vox, dtype=np.int64).reshape(-1, 3) @ strides
+        offsets_raveled = np.asarray(microlens_offsets, dtype=np.int64) @ strides[1:]
+        for offset in offsets_raveled:
+            shifted = (raveled + offset).tolist()
+            yield [row[:length] for row, length in zip(shifted, lengths)]
+
     def _count_vox_raytrace_occurrences(
         self,
         zero_ret_voxels=False,
@@ -2359,20 +2678,22 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
         pixels_per_ml = self.optical_info["pixels_per_ml"]
         ret_image = np.zeros((pixels_per_ml, pixels_per_ml))
         azim_image = np.zeros((pixels_per_ml, pixels_per_ml))
-        for i in range(pixels_per_ml):
-            for j in range(pixels_per_ml):
-                if np.isnan(self.ray_entry[0, i, j]):
-                    ret_image[i, j] = 0
-                    azim_image[i, j] = 0
-                else:
-                    effective_jones = self.calc_cummulative_JM_of_ray_numpy(
-                        i, j, volume_in, microlens_offset
-                    )
-                    ret_image[i, j] = self.retardance(effective_jones)
-                    if np.isclose(ret_image[i, j], 0.0):
-                        azim_image[i, j] = 0
-                    else:
-                        azim_image[i, j] = self.azimuth(effective_jones)
+        # Pixels that no light reaches due to the optics remain zero
+        valid_i, valid_j = self._get_valid_pixel_indices()
+        if len(valid_i) == 0:
+            return [ret_image, azim_image]
+        effective_jones = np.stack(
+            [
+                self.calc_cummulative_JM_of_ray_numpy(i, j, volume_in, microlens_offset)
+                for i, j in zip(valid_i, valid_j)
+            ]
+        )
+        # Retardance and azimuth for all the pixels at once
+        retardance = self.retardance(effective_jones)
+        azimuth = self.azimuth(effective_jones)
+        azimuth = np.where(np.isclose(retardance, 0.0), 0, azimuth)
+        ret_image[valid_i, valid_j] = retardance
+        azim_image[valid_i, valid_j] = azimuth
         return [ret_image, azim_image]
 
     def ret_and_azim_images_mla_torch(self, volume_in: BirefringentVolume):
@@ -2515,11 +2836,11 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
         """
         err_message = f"mla_index {mla_index} is not in nonzero_pixels_dict"
         assert mla_index in self.nonzero_pixels_dict, err_message
-        reshaped_indices = self.ray_valid_indices.T
+        ray_indices = self.ray_valid_indices
+        if torch.is_tensor(ray_indices):
+            ray_indices = ray_indices.cpu().numpy()
         nonzero_pixels_grid = self.nonzero_pixels_dict[mla_index]
-        mask = np.array(
-            [nonzero_pixels_grid[idx[0], idx[1]] for idx in reshaped_indices]
-        )
+        mask = np.asarray(nonzero_pixels_grid)[ray_indices[0], ray_indices[1]]
         return mask
 
     def intensity_images(
@@ -2550,10 +2871,11 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
                     dtype=torch.float32,
                     device=lenslet_jones.device,
                 )
-                pol_torch = torch.from_numpy(pol_hor).type(torch.complex64)
-                ana_torch = torch.from_numpy(analyzer).type(torch.complex64)
+                pol_torch = torch.from_numpy(pol_hor).type(lenslet_jones.dtype)
+                ana_torch = torch.from_numpy(analyzer).type(lenslet_jones.dtype)
                 E_out = ana_torch @ lenslet_jones @ pol_torch
                 intensity = torch.linalg.norm(E_out, axis=1) ** 2
+                intensity = intensity.to(torch.float32)
                 intensity_image_list[setting][
                     self.ray_valid_indices[0, :], self.ray_valid_indices[1, :]
                 ] = intensity
@@ -2573,17 +2895,24 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
                 volume_in, microlens_offset, mla_index=mla_index
             )
         else:
-            is_nan = np.isnan
-            for i in range(pixels_per_ml):
-                for j in range(pixels_per_ml):
-                    if not is_nan(self.ray_entry[0, i, j]):
-                        # Due to the optics, no light reaches the pixel
-                        # TODO: verify that the Jones matrix should be zeros instead of identity
-                        lenslet[i, j, :, :] = self.calc_cummulative_JM_of_ray_numpy(
-                            i, j, volume_in, microlens_offset
-                        )
+            # Pixels that no light reaches due to the optics are skipped
+            # TODO: verify that the Jones matrix should be zeros instead of identity
+            for i, j in zip(*self._get_valid_pixel_indices()):
+                lenslet[i, j, :, :] = self.calc_cummulative_JM_of_ray_numpy(
+                    i, j, volume_in, microlens_offset
+                )
         return lenslet
 
+    def _get_valid_pixel_indices(self):
+        """Returns the (i, j) indices of the pixels behind a lenslet that
+        are reached by a ray, i.e. where self.ray_entry is not NaN. The
+        indices are cached for the current self.ray_entry."""
+        cached = getattr(self, "_valid_pixel_indices", None)
+        if cached is None or cached[0] is not self.ray_entry:
+            valid_mask = ~np.isnan(np.asarray(self.ray_entry[0]))
+            self._valid_pixel_indices = (self.ray_entry, np.nonzero(valid_mask))
+        return self._valid_pixel_indices[1]
+
     def voxRayJM(self, Delta_n, opticAxis, rayDir, ell, wavelength):
         """Compute Jones matrix associated with a particular ray and voxel combination"""
         start_time_voxRayJM = time.perf_counter()
@@ -2617,12 +2946,46 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
                 ell,
                 wavelength,
                 nonzeros_only=self.only_nonzero_for_jones,
+                ell_scaled=self._get_scaled_colli_lengths(ell, wavelength),
+                ray_dir_comps=self._get_ray_dir_components(rayDir),
             )
 
         end_time = time.perf_counter()
         self.times["calc_ret_azim_for_jones"] += end_time - start_time
         return ret, azim
 
+    def _get_scaled_colli_lengths(self, ell, wavelength):
+        """Returns the collision lengths multiplied by pi / wavelength. The
+        result is cached for the precomputed self.ray_vol_colli_lengths, so
+        the scaling is done once instead of at every forward pass."""
+        dtype = getattr(self, "ray_geometry_dtype", None) or ell.dtype
+        if ell is not self.ray_vol_colli_lengths:
+            return jones_matrix.scale_colli_lengths(ell, wavelength).to(dtype)
+        cached = getattr(self, "_scaled_colli_lengths", None)
+        if (
+            cached is None
+            or cached[0] is not ell
+            or cached[1] != wavelength
+            or cached[2].dtype != dtype
+        ):
+            ell_scaled = jones_matrix.scale_colli_lengths(ell, wavelength).to(dtype)
+            self._scaled_colli_lengths = (ell, wavelength, ell_scaled)
+        return self._scaled_colli_lengths[2]
+
+    def _get_ray_dir_components(self, rayDir):
+        """Returns the ray direction basis [3, n_rays, 3] rearranged as
+        [3 (xyz component), 3 (basis vector), n_rays], so that each component
+        is contiguous across the rays. The result is cached for the
+        precomputed self.ray_direction_basis."""
+        dtype = getattr(self, "ray_geometry_dtype", None) or rayDir.dtype
+        if rayDir is not self.ray_direction_basis:
+            return jones_matrix.ray_dir_to_components(rayDir).to(dtype)
+        cached = getattr(self, "_ray_dir_components", None)
+        if cached is None or cached[0] is not rayDir or cached[1].dtype != dtype:
+            ray_dir_comps = jones_matrix.ray_dir_to_components(rayDir).to(dtype)
+            self._ray_dir_components = (rayDir, ray_dir_comps)
+        return self._ray_dir_components[1]
+
     def vox_ray_matrix(self, ret, azim):
         """Calculate the Jones matrix from a given retardance and
         azimuth angle."""
@@ -2675,17 +3038,15 @@ class BirefringentRaytraceLFM(RayTraceLFM, BirefringentElement):
         Equivalent method: torch.linalg.multi_dot([JM1, JM2])
         """
         n_rays = len(JMlist[0])
-        product = (
-            torch.tensor(
-                [[1.0, 0], [0, 1.0]], dtype=torch.complex64, device=JMlist[0].device
-            )
-            .unsqueeze(0)
-            .repeat(n_rays, 1, 1)
-        )
+        n_voxels_of_rays = count_voxels_of_segs(voxels_of_segs).to(JMlist[0].device)
+        # Pad the sequence with identity matrices for rays that have
+        #   fewer voxels, then multiply the steps pairwise
+        identity = torch.eye(2, dtype=torch.complex64, device=JMlist[0].device)
+        padded = identity.expand(len(JMlist), n_rays, 2, 2).clone()
         for ix, JM in enumerate(JMlist):
-            rays_with_voxels = [len(vx) > ix for vx in voxels_of_segs]
-            product[rays_with_voxels, ...] = product[rays_with_voxels, ...] @ JM
-        return product
+            rays_with_voxels = n_voxels_of_rays > ix
+            padded[ix, rays_with_voxels, ...] = JM.to(padded.dtype)
+        return jones_matrix.jones_product_pairwise(padded)
 
     def apply_polarizers(self, material_jones):
         """Apply the polarizer and analyzer to a product of Jones matrices representing the
@@ -19,8 +19,8 @@ class VolumeFileManager:
         - tuple: A tuple containing numpy arrays for delta_n and optic_axis.
         """
         volume_file = h5py.File(file_path, "r")
-        delta_n = np.array(volume_file["data/delta_n"])
-        optic_axis = np.array(volume_file["data/optic_axis"])
+        delta_n = self._read_dataset(volume_file, "data/delta_n")
+        optic_axis = self._read_dataset(volume_file, "data/optic_axis")
 
         return delta_n, optic_axis
 
@@ -38,8 +38,8 @@ class VolumeFileManager:
         volume_file = h5py.File(file_path, "r")
 
         # Fetch birefringence and optic axis
-        delta_n = np.array(volume_file["data/delta_n"])
-        optic_axis = np.array(volume_file["data/optic_axis"])
+        delta_n = self._read_dataset(volume_file, "data/delta_n")
+        optic_axis = self._read_dataset(volume_file, "data/optic_axis")
 
         # Fetch optical info
         volume_shape = np.array(volume_file["optical_info/volume_shape"])
@@ -47,6 +47,44 @@ class VolumeFileManager:
 
         return delta_n, optic_axis, volume_shape, voxel_size_um
 
+    @staticmethod
+    def _read_dataset(volume_file, key):
+        """
+        Reads a dataset from an open H5 file, dequantizing it if it was
+        stored as int8 with a `scale` attribute.
+
+        Args:
+        - volume_file (File): An open H5 file handle.
+        - key (str): Path of the dataset within the file.
+
+        Returns:
+        - np.ndarray: The dataset as a numpy array.
+        """
+        dataset = volume_file[key]
+        data = np.array(dataset)
+        scale = getattr(dataset, "attrs", {}).get("scale")
+        if scale is not None:
+            data = data.astype(np.float32) * np.float32(scale)
+        return data
+
+    @staticmethod
+    def quantize_int8(array, scale=None):
+        """
+        Quantizes an array to int8 with a single scale factor.
+
+        Args:
+        - array (np.ndarray): Array to quantize.
+        - scale (float, optional): Scale factor. Defaults to max(abs(array)) / 127.
+
+        Returns:
+        - tuple: The int8 array and the scale such that array ~= q * scale.
+        """
+        if scale is None:
+            max_abs = float(np.max(np.abs(array))) if array.size else 0.0
+            scale = max_abs / 127 if max_abs > 0 else 1.0
+        q = np.clip(np.round(array / scale), -127, 127).astype(np.int8)
+        return q, scale
+
     def save_as_channel_stack_tiff(self, filename, delta_n, optic_axis):
         """
         Saves the provided volume data as a multi-channel TIFF file.
@@ -70,7 +108,14 @@ class VolumeFileManager:
             print(f"Error saving file: {e}")
 
     def save_as_h5(
-        self, h5_file_path, delta_n, optic_axis, optical_info, description, optical_all
+        self,
+        h5_file_path,
+        delta_n,
+        optic_axis,
+        optical_info,
+        description,
+        optical_all,
+        quantize=False,
     ):
         """
         Saves the volume data, including birefringence information (delta_n) and optic axis data,
@@ -90,13 +135,15 @@ class VolumeFileManager:
         - optical_all (bool): A flag indicating whether to save all optical metadata present in
           `optical_info` to the H5 file. If False, only specific predefined metadata (like volume
           shape and voxel size) will be saved.
+        - quantize (bool): If True, delta_n and optic_axis are stored as int8 with a
+          `scale` attribute. The optic axis uses a fixed scale of 1/127 since it is unit norm.
 
         Returns:
         None. The result of this method is the creation of an H5 file with the specified data.
         """
         with h5py.File(h5_file_path, "w") as f:
             self._save_optical_info(f, optical_info, description, optical_all)
-            self._save_data(f, delta_n, optic_axis)
+            self._save_data(f, delta_n, optic_axis, quantize)
 
     def _save_optical_info(self, file_handle, optical_info, description, optical_all):
         """
@@ -123,7 +170,7 @@ class VolumeFileManager:
             for k, v in optical_info.items():
                 optics_grp.create_dataset(k, data=np.array(v))
 
-    def _save_data(self, file_handle, delta_n, optic_axis):
+    def _save_data(self, file_handle, delta_n, optic_axis, quantize=False):
         """
         Private method to save delta_n and optic_axis data to an H5 file.
 
@@ -131,12 +178,23 @@ class VolumeFileManager:
         - file_handle (File): An open H5 file handle.
         - delta_n (np.ndarray): Numpy array of delta_n data.
         - optic_axis (np.ndarray): Numpy array of optic_axis data.
+        - quantize (bool): Whether to store the data as int8 with a scale.
 
         This method creates a group for volume data and adds datasets for delta_n and optic_axis.
         """
         data_grp = file_handle.create_group("data")
-        data_grp.create_dataset("delta_n", delta_n.shape, data=delta_n)
-        data_grp.create_dataset("optic_axis", optic_axis.shape, data=optic_axis)
+        if not quantize:
+            data_grp.create_dataset("delta_n", delta_n.shape, data=delta_n)
+            data_grp.create_dataset("optic_axis", optic_axis.shape, data=optic_axis)
+            return
+        q_delta_n, dn_scale = self.quantize_int8(delta_n)
+        q_optic_axis, oa_scale = self.quantize_int8(optic_axis, scale=1 / 127)
+        dset = data_grp.create_dataset("delta_n", delta_n.shape, data=q_delta_n)
+        dset.attrs["scale"] = dn_scale
+        dset = data_grp.create_dataset(
+            "optic_axis", optic_axis.shape, data=q_optic_axis
+        )
+        dset.attrs["scale"] = oa_scale
 
     def save_as_npz(self, filename, delta_n, optic_axis):
         """
@@ -37,7 +37,32 @@ def calc_theta_single(jones):
 
 
 def eigenvalues(jones):
-    x = torch.linalg.eigvals(jones)
+    x = eigenvalues_closed_form(jones)
+    return x
+
+
+def eigenvalues_closed_form(jones):
+    """Eigenvalues of a batch of 2x2 matrices using the quadratic formula.
+    Avoids the overhead of a generic batched eigensolver for tiny matrices.
+    Args:
+        jones (torch.Tensor): batch of 2x2 matrices [..., 2, 2]
+    Returns:
+        torch.Tensor: eigenvalues [..., 2]
+    """
+    a = jones[..., 0, 0]
+    b = jones[..., 0, 1]
+    c = jones[..., 1, 0]
+    d = jones[..., 1, 1]
+    trace = a + d
+    det = a * d - b * c
+    disc_sq = trace * trace - 4 * det
+    # The derivative of sqrt is infinite at zero, which is where matrices
+    #   with equal eigenvalues, such as the identity, are. Their square root
+    #   is taken without a gradient, so that backpropagation stays finite.
+    small = disc_sq.abs() <= torch.finfo(disc_sq.real.dtype).eps
+    safe_disc_sq = torch.where(small, torch.ones_like(disc_sq), disc_sq)
+    disc = torch.where(small, torch.sqrt(disc_sq.detach()), torch.sqrt(safe_disc_sq))
+    x = torch.stack([(trace - disc) / 2, (trace + disc) / 2], dim=-1)
     return x
 
 
@@ -57,7 +82,7 @@ def retardance_from_jones(jones, su2_method=False):
 
 
 def retardance_from_jones_single(jones, su2_method=False):
-    x = torch.linalg.eigvals(jones)
+    x = eigenvalues_closed_form(jones)
     retardance = (torch.angle(x[1]) - torch.angle(x[0])).abs()
     return retardance
 
@@ -75,14 +100,20 @@ def retardance_from_su2_single(jones):
 
 
 def retardance_from_jones_numpy(jones, su2_method=False):
-    e1, e2 = np.linalg.eigvals(jones)
+    jones = np.asarray(jones, dtype=np.complex128)
+    trace = jones[..., 0, 0] + jones[..., 1, 1]
+    det = jones[..., 0, 0] * jones[..., 1, 1] - jones[..., 0, 1] * jones[..., 1, 0]
+    disc = np.sqrt(trace * trace - 4 * det)
+    e1 = (trace + disc) / 2
+    e2 = (trace - disc) / 2
     phase_diff = np.angle(e1) - np.angle(e2)
     retardance = np.abs(phase_diff)
     return retardance
 
 
 def retardance_from_su2_numpy(jones):
-    a = jones[0, 0]
+    """Jones matrix can be a single 2x2 matrix or a batch [..., 2, 2]"""
+    a = jones[..., 0, 0]
     upper_limit = np.nextafter(np.float64(1.0), np.float64(-np.inf))
     lower_limit = np.nextafter(np.float64(-1.0), np.float64(np.inf))
     theta = np.arccos(np.clip(np.real(a), lower_limit, upper_limit))
@@ -91,13 +122,14 @@ def retardance_from_su2_numpy(jones):
 
 
 def azimuth_from_jones_numpy(jones, simple=True):
-    j11 = jones[0, 0]
-    j12 = jones[0, 1]
+    """Jones matrix can be a single 2x2 matrix or a batch [..., 2, 2]"""
+    j11 = jones[..., 0, 0]
+    j12 = jones[..., 0, 1]
     imag_j11 = np.imag(j11)
     imag_j12 = np.imag(j12)
     azimuth = 0.5 * np.arctan2(imag_j12, imag_j11) + np.pi / 2.0
-    if np.isclose(np.abs(imag_j11), 0.0) and np.isclose(np.abs(imag_j12), 0.0):
-        azimuth = 0.0
+    zero_mask = np.isclose(np.abs(imag_j11), 0.0) & np.isclose(np.abs(imag_j12), 0.0)
+    azimuth = np.where(zero_mask, 0.0, azimuth)
     return azimuth
 
 
@@ -116,16 +148,15 @@ def azimuth_from_jones_torch(jones):
         raise ValueError("Invalid input shape")
     imag_j11 = torch.imag(j11)
     imag_j12 = torch.imag(j12)
-    azimuth = torch.zeros_like(imag_j11, dtype=imag_j11.dtype)
     # Create a mask where both imaginary parts are not close to zero
     non_zero_mask = ~(
         torch.isclose(imag_j11, torch.zeros_like(imag_j11))
         & torch.isclose(imag_j12, torch.zeros_like(imag_j12))
     )
-    # Compute azimuth for non-zero mask elements
-    azimuth_non_zero = (
-        0.5 * torch.atan2(imag_j12[non_zero_mask], imag_j11[non_zero_mask])
-        + torch.pi / 2.0
-    )
-    azimuth[non_zero_mask] = azimuth_non_zero
+    # Replace the masked out elements by (0, 1) before atan2, so that
+    #   the unused branch does not produce NaN gradients
+    safe_j11 = torch.where(non_zero_mask, imag_j11, 1.0)
+    safe_j12 = torch.where(non_zero_mask, imag_j12, 0.0)
+    azimuth_non_zero = 0.5 * torch.atan2(safe_j12, safe_j11) + torch.pi / 2.0
+    azimuth = torch.where(non_zero_mask, azimuth_non_zero, 0.0)
     return azimuth
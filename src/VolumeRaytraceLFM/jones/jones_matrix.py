@@ -1,3 +1,4 @@
+import functools
 import torch
 import numpy as np
 import time
@@ -7,7 +8,7 @@ def vox_ray_ret_azim_numpy(bir, optic_axis, rayDir, ell, wavelength):
     # Azimuth is the angle of the slow axis of retardance.
     # TODO: verify the order of these two components
     azim = np.arctan2(np.dot(optic_axis, rayDir[1]), np.dot(optic_axis, rayDir[2]))
-    azim = 0 if bir == 0 else (azim + np.pi / 2 if bir < 0 else azim)
+    azim = np.where(bir == 0, 0, np.where(bir < 0, azim + np.pi / 2, azim))
     # proj_along_ray = np.dot(optic_axis, rayDir[0])
     ret = (
         abs(bir)
@@ -20,6 +21,29 @@ def vox_ray_ret_azim_numpy(bir, optic_axis, rayDir, ell, wavelength):
     return ret, azim
 
 
+def jones_product_numpy(ret, azim):
+    """Computes the product of the linear retarder Jones matrices along a ray.
+    The matrices are [[d, o], [o, conj(d)]] with d = cos(ret/2) + i sin(ret/2)
+    cos(2 azim) and o = i sin(ret/2) sin(2 azim), which matches
+    JonesMatrixGenerators.linear_retarder. The 2x2 products are accumulated
+    in four complex scalars.
+    Args:
+        ret (np.array): Retardance of each voxel along the ray.
+        azim (np.array): Azimuth of each voxel along the ray.
+    Returns:
+        np.array: The cumulative Jones matrix of shape [2, 2].
+    """
+    sin_ret = np.sin(ret / 2)
+    diag = np.cos(ret / 2) + 1j * sin_ret * np.cos(2 * azim)
+    offdiag = 1j * sin_ret * np.sin(2 * azim)
+    p00, p01, p10, p11 = 1 + 0j, 0j, 0j, 1 + 0j
+    for d1, od in zip(diag.tolist(), offdiag.tolist()):
+        d2 = d1.conjugate()
+        p00, p01 = p00 * d1 + p01 * od, p00 * od + p01 * d2
+        p10, p11 = p10 * d1 + p11 * od, p10 * od + p11 * d2
+    return np.array([[p00, p01], [p10, p11]])
+
+
 def print_ret_azim_numpy(ret, azim):
     print(
         f"Azimuth angle of index ellipsoid is "
@@ -31,20 +55,55 @@ def print_ret_azim_numpy(ret, azim):
     )
 
 
-def vox_ray_ret_azim_torch(bir, optic_axis, rayDir, ell, wavelength):
+def ray_dir_to_components(rayDir):
+    """Rearranges the ray direction basis [3 (basis vector), n_rays, 3] as
+    [3 (xyz component), 3 (basis vector), n_rays] in contiguous memory."""
+    return rayDir.permute(2, 0, 1).contiguous()
+
+
+def vox_ray_ret_azim_torch(
+    bir, optic_axis, rayDir, ell, wavelength, ell_scaled=None, ray_dir_comps=None
+):
+    """Computes the retardance and azimuth of each ray segment.
+    Args:
+        bir (torch.Tensor): Birefringence. Shape: [n_rays, n_steps]
+        optic_axis (torch.Tensor): Optic axis components stored
+            component-major. Shape: [3, n_rays, n_steps]
+        rayDir (torch.Tensor): Ray direction basis. Shape: [3, n_rays, 3]
+        ell (torch.Tensor): Segment lengths. Shape: [n_rays, n_steps]
+        wavelength (float): Wavelength of the light.
+        ell_scaled (torch.Tensor, optional): Precomputed ell * pi / wavelength.
+        ray_dir_comps (torch.Tensor, optional): Precomputed
+            ray_dir_to_components(rayDir).
+    Returns:
+        tuple: retardance and azimuth, each of shape [n_rays, n_steps]
+    """
     pi_tensor = torch.tensor(np.pi, device=bir.device, dtype=bir.dtype)
-    # Dot product of optical axis and 3 ray-direction vectors
-    OA_dot_rayDir = (rayDir.unsqueeze(2) @ optic_axis).squeeze(2)
+    if ray_dir_comps is None:
+        ray_dir_comps = ray_dir_to_components(rayDir)
+    # Dot product of optical axis and 3 ray-direction vectors, computed from
+    #   the contiguous optic axis and ray direction components
+    OA_dot_rayDir = (
+        ray_dir_comps[0, :, :, None] * optic_axis[0]
+        + ray_dir_comps[1, :, :, None] * optic_axis[1]
+        + ray_dir_comps[2, :, :, None] * optic_axis[2]
+    )
     # TODO: verify x2 should be mult by the azimuth angle
     azim = 2 * torch.arctan2(OA_dot_rayDir[1], OA_dot_rayDir[2])
-    ret = abs(bir) * (1 - (OA_dot_rayDir[0]) ** 2) * ell * pi_tensor / wavelength
-    neg_delta_mask = bir < 0
-
+    if ell_scaled is None:
+        ell_scaled = scale_colli_lengths(ell, wavelength)
+    ret = abs(bir) * (1 - (OA_dot_rayDir[0]) ** 2) * ell_scaled
     # TODO: check how the gradients are affected--might be a discontinuity
-    azim[neg_delta_mask] += pi_tensor
+    azim = azim + torch.where(bir < 0, pi_tensor, 0.0)
     return ret, azim
 
 
+def scale_colli_lengths(ell, wavelength):
+    """Folds the constant factor pi / wavelength of the retardance into
+    the ray-voxel collision lengths."""
+    return ell * (np.pi / wavelength)
+
+
 def normalized_projection_torch(optic_axis, rayDir):
     """Useful for the retardance calculuation if the
     optic axis is not normalized."""
@@ -58,7 +117,14 @@ def normalized_projection_torch(optic_axis, rayDir):
 
 
 def calculate_vox_ray_ret_azim_torch(
-    bir, optic_axis, rayDir, ell, wavelength, nonzeros_only=False
+    bir,
+    optic_axis,
+    rayDir,
+    ell,
+    wavelength,
+    nonzeros_only=False,
+    ell_scaled=None,
+    ray_dir_comps=None,
 ):
     if nonzeros_only:
         # Faster when the number of non-zero elements is large
@@ -68,7 +134,7 @@ def calculate_vox_ray_ret_azim_torch(
         if nonzero_indices.numel() > 0:
             # Filter data for non-zero Delta_n
             nonzero_bir = bir[nonzero_indices]
-            nonzero_optic_axis = optic_axis[nonzero_indices, :]
+            nonzero_optic_axis = optic_axis[:, nonzero_indices]
             nonzero_rayDir = rayDir[:, nonzero_indices, :]
             nonzero_ell = ell[nonzero_indices]
 
@@ -81,7 +147,15 @@ def calculate_vox_ray_ret_azim_torch(
         return ret, azim
     else:
         # Faster when the number of non-zero elements is small
-        return vox_ray_ret_azim_torch(bir, optic_axis, rayDir, ell, wavelength)
+        return vox_ray_ret_azim_torch(
+            bir,
+            optic_axis,
+            rayDir,
+            ell,
+            wavelength,
+            ell_scaled=ell_scaled,
+            ray_dir_comps=ray_dir_comps,
+        )
 
 
 def _get_diag_offdiag_jones(ret, azim):
@@ -111,6 +185,143 @@ def jones_torch_from_diags(diag, offdiag):
     return jones
 
 
+def _jones_step_real(p00r, p00i, p01r, p01i, p10r, p10i, p11r, p11i, a_r, a_i, b_i):
+    """Right-multiplies the cumulative Jones matrices, given by the real and
+    imaginary parts of their elements, by the voxel Jones matrices
+    [[a, i b_i], [i b_i, conj(a)]] with a = a_r + i a_i."""
+    return (
+        p00r * a_r - p00i * a_i - p01i * b_i,
+        p00r * a_i + p00i * a_r + p01r * b_i,
+        p01r * a_r + p01i * a_i - p00i * b_i,
+        p01i * a_r - p01r * a_i + p00r * b_i,
+        p10r * a_r - p10i * a_i - p11i * b_i,
+        p10r * a_i + p10i * a_r + p11r * b_i,
+        p11r * a_r + p11i * a_i - p10i * b_i,
+        p11i * a_r - p11r * a_i + p10r * b_i,
+    )
+
+
+def _compile_or_eager(fn, **compile_kwargs):
+    """Compiles fn with torch.compile. If torch.compile is not supported
+    in the current environment, fn is returned unchanged and runs eagerly.
+    The compilation itself happens on the first call, so if that call
+    fails, fn is used from then on instead."""
+    try:
+        compiled_fn = torch.compile(fn, **compile_kwargs)
+    except RuntimeError as e:
+        print(f"torch.compile is unavailable, running {fn.__name__} eagerly: {e}")
+        return fn
+    selected_fn = None
+
+    @functools.wraps(fn)
+    def compiled_or_eager(*args, **kwargs):
+        nonlocal selected_fn
+        if selected_fn is not None:
+            return selected_fn(*args, **kwargs)
+        try:
+            result = compiled_fn(*args, **kwargs)
+        except Exception as e:
+            print(f"torch.compile failed, running {fn.__name__} eagerly: {e}")
+            selected_fn = fn
+            return fn(*args, **kwargs)
+        selected_fn = compiled_fn
+        return result
+
+    return compiled_or_eager
+
+
+_compiled_jones_step = None
+
+
+def get_jones_step_fn(compile_step=False):
+    """Returns the function that performs one step of the Jones matrix
+    accumulation. If compile_step is True, the function is compiled with
+    torch.compile so that the elementwise operations are fused. The compiled
+    function is created once and reused."""
+    global _compiled_jones_step
+    if not compile_step:
+        return _jones_step_real
+    if _compiled_jones_step is None:
+        _compiled_jones_step = _compile_or_eager(_jones_step_real, dynamic=True)
+    return _compiled_jones_step
+
+
+_graphed_jones_product = None
+
+
+def get_graphed_jones_product_fn():
+    """Returns jones_product_from_ret_azim compiled with torch.compile in
+    the "reduce-overhead" mode. The accumulation loop is unrolled for the
+    number of steps along the rays, and on CUDA the resulting kernels are
+    recorded once as a CUDA graph and replayed on later calls with the same
+    shapes. The compiled function is created once and reused."""
+    global _graphed_jones_product
+    if _graphed_jones_product is None:
+        _graphed_jones_product = _compile_or_eager(
+            jones_product_from_ret_azim, mode="reduce-overhead"
+        )
+    return _graphed_jones_product
+
+
+def jones_product_from_ret_azim(ret, azim, compile_step=False):
+    """Computes the product of a sequence of Jones matrices given the
+    retardance and azimuth angles along each ray. The real and imaginary
+    parts of the matrix elements are kept as separate real tensors, so the
+    2x2 complex products are written out as real multiply-adds. The
+    off-diagonal elements of each voxel Jones matrix are purely imaginary.
+    Args:
+        ret (torch.Tensor): Retardance angles. Shape: [n_rays, n_steps]
+        azim (torch.Tensor): Azimuth angles. Shape: [n_rays, n_steps]
+        compile_step (bool): Whether to use the torch.compile version of
+            the accumulation step.
+    Returns:
+        torch.Tensor: The cumulative Jones matrices.
+                      Shape: [n_rays, 2, 2]
+    """
+    step_fn = get_jones_step_fn(compile_step)
+    # Half precision is promoted, while float64 inputs keep their precision
+    dtype = torch.promote_types(ret.dtype, torch.float32)
+    ret = ret.to(dtype)
+    azim = azim.to(dtype)
+    sin_ret = torch.sin(ret)
+    # diag = ar + i ai, offdiag = i bi
+    ar = torch.cos(ret)
+    ai = torch.cos(azim) * sin_ret
+    bi = torch.sin(azim) * sin_ret
+    zeros = torch.zeros_like(ar[:, 0])
+    p = (ar[:, 0], ai[:, 0], zeros, bi[:, 0], zeros, bi[:, 0], ar[:, 0], -ai[:, 0])
+    for m in range(1, ret.shape[1]):
+        p = step_fn(*p, ar[:, m], ai[:, m], bi[:, m])
+    p00r, p00i, p01r, p01i, p10r, p10i, p11r, p11i = p
+    real = torch.stack(
+        [torch.stack([p00r, p01r], dim=-1), torch.stack([p10r, p11r], dim=-1)], dim=-2
+    )
+    imag = torch.stack(
+        [torch.stack([p00i, p01i], dim=-1), torch.stack([p10i, p11i], dim=-1)], dim=-2
+    )
+    return torch.complex(real, imag)
+
+
+def jones_product_pairwise(jones):
+    """Computes the ordered product of a sequence of Jones matrices by
+    multiplying neighboring pairs, so that only log2(n_steps) batched
+    matrix multiplications are needed instead of n_steps dependent ones.
+    Args:
+        jones (torch.Tensor): Jones matrices. Shape: [n_steps, n_rays, 2, 2]
+    Returns:
+        torch.Tensor: jones[0] @ jones[1] @ ... @ jones[-1]
+                      Shape: [n_rays, 2, 2]
+    """
+    while jones.shape[0] > 1:
+        if jones.shape[0] % 2 == 1:
+            # The last matrix has no partner, so it is carried over
+            paired = jones[:-1:2] @ jones[1::2]
+            jones = torch.cat([paired, jones[-1:]], dim=0)
+        else:
+            jones = jones[0::2] @ jones[1::2]
+    return jones[0]
+
+
 def jones_torch(ret, azim):
     """Computes the Jones matrix given the retardance and azimuth angles.
     Args:
@@ -135,7 +346,8 @@ def jones_torch_nonzeros(ret, azim):
     diag1 = cos_ret + 1j * cos_azim * sin_ret
     diag2 = torch.conj(diag1)
 
-    jones = torch.eye(2, dtype=diag1.dtype, device=ret.device).repeat(len(ret), 1, 1)
+    identity = torch.eye(2, dtype=diag1.dtype, device=ret.device)
+    jones = identity.expand(*ret.shape, 2, 2).clone()
     jones[nonzero_indices, 0, 0] = diag1
     jones[nonzero_indices, 0, 1] = offdiag
     jones[nonzero_indices, 1, 0] = offdiag
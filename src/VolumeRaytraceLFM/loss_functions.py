@@ -1,6 +1,9 @@
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
+from VolumeRaytraceLFM.metrics.regularization_fundamentals import (
+    total_variation_3d_volumetric,
+)
 
 
 class VonMisesLoss(nn.Module):
@@ -94,10 +97,8 @@ def apply_loss_function_and_reg(
                 )
             elif reg_type == "TV":
                 delta_n = volume_estimate.get_delta_n()
-                regularization_term = (
-                    (delta_n[1:, ...] - delta_n[:-1, ...]).pow(2).sum()
-                    + (delta_n[:, 1:, ...] - delta_n[:, :-1, ...]).pow(2).sum()
-                    + (delta_n[:, :, 1:] - delta_n[:, :, :-1]).pow(2).sum()
+                regularization_term = total_variation_3d_volumetric(
+                    delta_n, reduction="sum"
                 )
             else:
                 regularization_term = torch.zeros([1], device=ret_meas.device)
@@ -59,3 +59,22 @@ def complex_mse_loss(output, target):
     squared_magnitude = torch.abs(diff) ** 2
     mse_loss = torch.mean(squared_magnitude)
     return mse_loss
+
+
+def vector_mse_loss(ret_pred, azim_pred, cos_gt, sin_gt):
+    """Mean squared error between the vector forms of the predicted
+    retardance and azimuth images and the target vector components.
+    Both components are accumulated in a single reduction.
+    Args:
+    ret_pred (torch.Tensor): Predicted retardance image.
+    azim_pred (torch.Tensor): Predicted azimuth image.
+    cos_gt (torch.Tensor): Target cosine component, ret * cos(2 * azim).
+    sin_gt (torch.Tensor): Target sine component, ret * sin(2 * azim).
+
+    Returns:
+    torch.Tensor: Sum of the mean squared errors of both components.
+    """
+    double_azim = 2 * azim_pred
+    diff_cos = ret_pred * torch.cos(double_azim) - cos_gt
+    diff_sin = ret_pred * torch.sin(double_azim) - sin_gt
+    return torch.mean(diff_cos.square() + diff_sin.square())
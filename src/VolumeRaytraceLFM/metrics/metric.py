@@ -1,10 +1,12 @@
 import json
 import torch
 import torch.nn.functional as F
+from VolumeRaytraceLFM.jones.jones_matrix import _compile_or_eager
 from VolumeRaytraceLFM.metrics.data_fidelity import (
     poisson_loss,
     gaussian_noise_loss,
     complex_mse_loss,
+    vector_mse_loss,
 )
 from VolumeRaytraceLFM.metrics.regularization import (
     l2_bir,
@@ -31,6 +33,20 @@ REGULARIZATION_FCNS = {
     "birefringence active positive penalty L2": pos_penalty_l2_bir_active,
 }
 
+_compiled_vector_mse_loss = None
+
+
+def get_vector_loss_fn(compile_loss=False):
+    """Return the vector data-fidelity loss, optionally compiled with
+    torch.compile so the elementwise chain is fused into one kernel.
+    The compiled function is created once and reused."""
+    global _compiled_vector_mse_loss
+    if not compile_loss:
+        return vector_mse_loss
+    if _compiled_vector_mse_loss is None:
+        _compiled_vector_mse_loss = _compile_or_eager(vector_mse_loss, dynamic=True)
+    return _compiled_vector_mse_loss
+
 
 class PolarimetricLossFunction:
     def __init__(self, params=None, json_file=None):
@@ -45,6 +61,7 @@ class PolarimetricLossFunction:
             # Initialize specific loss functions
             self.optimizer = params.get("optimizer", "Adam")
             self.datafidelity = params.get("datafidelity", "vector")
+            self.compile_loss = params.get("compile_loss", False)
             self.regularization_fcns = [
                 (REGULARIZATION_FCNS[fn_name], weight)
                 for fn_name, weight in params.get("regularization_fcns", [])
@@ -56,13 +73,25 @@ class PolarimetricLossFunction:
             self.weight_regularization = 0.1
             self.optimizer = "Adam"
             self.datafidelity = "vector"
+            self.compile_loss = False
             self.regularization_fcns = []
+        self._target_vector_form = None
 
     def set_retardance_target(self, target):
         self.target_retardance = target
+        self._target_vector_form = None
 
     def set_orientation_target(self, target):
         self.target_orientation = target
+        self._target_vector_form = None
+
+    def get_target_vector_form(self):
+        """Vector form of the target images, computed once per target."""
+        if self._target_vector_form is None:
+            self._target_vector_form = self.transform_ret_azim_to_vector_form(
+                self.target_retardance, self.target_orientation
+            )
+        return self._target_vector_form
 
     def set_intensity_list_target(self, target_list):
         self.target_intensity_list = target_list
@@ -104,13 +133,9 @@ class PolarimetricLossFunction:
 
     def vector_loss(self, ret_pred, azim_pred):
         """Compute the vector loss"""
-        ret_gt = self.target_retardance
-        azim_gt = self.target_orientation
-        cos_gt, sin_gt = self.transform_ret_azim_to_vector_form(ret_gt, azim_gt)
-        cos_pred, sin_pred = self.transform_ret_azim_to_vector_form(ret_pred, azim_pred)
-        loss_cos = F.mse_loss(cos_pred, cos_gt)
-        loss_sin = F.mse_loss(sin_pred, sin_gt)
-        loss = loss_cos + loss_sin
+        cos_gt, sin_gt = self.get_target_vector_form()
+        loss_fn = get_vector_loss_fn(self.compile_loss)
+        loss = loss_fn(ret_pred, azim_pred, cos_gt, sin_gt)
         return loss
 
     def euler_loss(self, ret_pred, azim_pred):
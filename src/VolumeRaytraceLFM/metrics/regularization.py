@@ -18,21 +18,25 @@ def l1_bir(volume: BirefringentVolume):
 
 
 def total_variation_bir(volume: BirefringentVolume):
-    birefringence = volume.get_delta_n()
+    birefringence = volume.get_delta_n_with_active()
     return total_variation_3d_volumetric(birefringence)
 
 
 def total_variation_optax(volume: BirefringentVolume):
-    optax = volume.get_optic_axis()
-    return total_variation_3d_volumetric(optax)
+    """Total variation of each optic axis component, computed channel by
+    channel so that the differences are not taken across components."""
+    return sum(
+        total_variation_3d_volumetric(component)
+        for component in volume.get_optic_axis_with_active()
+    )
 
 
 def cosine_similarity_neighbors(volume: BirefringentVolume):
     """Compute a loss that encourages each vector in optic_axis to
     align with its neighbors, weighted by delta_n.
     """
-    delta_n = volume.get_delta_n()
-    optic_axis = volume.get_optic_axis()
+    delta_n = volume.get_delta_n_with_active()
+    optic_axis = volume.get_optic_axis_with_active()
     return weighted_local_cosine_similarity_loss(optic_axis, delta_n)
 
 
@@ -5,11 +5,11 @@ import torch.nn.functional as F
 
 
 def l1(data):
-    return torch.abs(data).mean()
+    return torch.linalg.vector_norm(data, ord=1) / data.numel()
 
 
 def l2(data):
-    return torch.pow(data, 2).mean()
+    return data.square().mean()
 
 
 def linfinity(data, weight=1.0):
@@ -17,8 +17,8 @@ def linfinity(data, weight=1.0):
 
 
 def elastic_net(data, weight1=1.0, weight2=1.0):
-    l1_term = torch.abs(data).sum()
-    l2_term = torch.pow(data, 2).sum()
+    l1_term = torch.linalg.vector_norm(data, ord=1)
+    l2_term = data.square().sum()
     return weight1 * l1_term + weight2 * l2_term
 
 
@@ -38,20 +38,35 @@ def positive_penalty_l2(data):
     return positive_penalty(data) ** 2
 
 
-def total_variation_3d_volumetric(data):
+def _finite_difference_kernels(dtype, device):
+    """Forward difference kernels along the depth, height and width
+    dimensions, shaped as conv3d weights."""
+    stencil = torch.tensor([-1.0, 1.0], dtype=dtype, device=device)
+    shapes = [(1, 1, 2, 1, 1), (1, 1, 1, 2, 1), (1, 1, 1, 1, 2)]
+    return [stencil.reshape(shape) for shape in shapes]
+
+
+def total_variation_3d_volumetric(data, reduction="mean"):
     """
     Computes the Total Variation regularization for a 4D tensor representing volumetric data.
+    The differences between adjacent elements along the first three dimensions
+    are computed with conv3d finite difference stencils.
     Args:
         data (torch.Tensor): Input 3D tensor with shape [depth, height, width].
+            Any trailing dimensions are treated as a batch.
+        reduction (str): 'mean' or 'sum' of the squared differences,
+            applied per dimension before the dimensions are added.
     Returns:
         torch.Tensor: Computed Total Variation regularization term.
     """
-    # Calculate the differences between adjacent elements along each spatial dimension
-    diff_depth = torch.pow(data[1:, :, :] - data[:-1, :, :], 2).mean()
-    diff_height = torch.pow(data[:, 1:, :] - data[:, :-1, :], 2).mean()
-    diff_width = torch.pow(data[:, :, 1:] - data[:, :, :-1], 2).mean()
-
-    tv_reg = diff_depth + diff_height + diff_width
+    if reduction not in ("mean", "sum"):
+        raise ValueError(f"Invalid reduction: {reduction}")
+    # Move any trailing dimensions into the batch dimension of conv3d
+    volume = data.reshape(*data.shape[:3], -1).permute(3, 0, 1, 2).unsqueeze(1)
+    tv_reg = 0
+    for kernel in _finite_difference_kernels(data.dtype, data.device):
+        diff_sq = torch.pow(F.conv3d(volume, kernel), 2)
+        tv_reg = tv_reg + (diff_sq.mean() if reduction == "mean" else diff_sq.sum())
     return tv_reg
 
 
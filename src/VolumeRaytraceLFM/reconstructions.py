@@ -1,10 +1,8 @@
 """This module contains the ReconstructionConfig and Reconstructor classes."""
 
 import sys
-import copy
 import time
 import os
-import json
 import torch
 import numpy as np
 from tqdm import tqdm
@@ -12,6 +10,7 @@ import csv
 import pickle
 import tifffile
 import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
 
 ## For analyzing the memory usage of a function
 # from memory_profiler import profile
@@ -31,6 +30,7 @@ from VolumeRaytraceLFM.visualization.plotting_volume import (
 from VolumeRaytraceLFM.visualization.plt_util import setup_visualization
 from VolumeRaytraceLFM.visualization.plotting_iterations import (
     plot_iteration_update_gridspec,
+    update_iteration_gridspec,
 )
 from VolumeRaytraceLFM.utils.file_utils import create_unique_directory
 from VolumeRaytraceLFM.utils.dimensions_utils import (
@@ -43,7 +43,7 @@ from VolumeRaytraceLFM.utils.error_handling import (
     check_for_negative_values,
     check_for_negative_values_dict,
 )
-from VolumeRaytraceLFM.utils.json_utils import ComplexArrayEncoder
+from VolumeRaytraceLFM.utils.json_utils import save_json, load_json
 from VolumeRaytraceLFM.metrics.metric import PolarimetricLossFunction
 from VolumeRaytraceLFM.utils.optimizer_utils import calculate_adjusted_lr, print_moments
 from VolumeRaytraceLFM.volumes.optic_axis import (
@@ -66,6 +66,15 @@ if DEBUG:
     )
 
 
+def _resolve_device(device):
+    """Returns the torch.device with its index, e.g. cuda:0 for "cuda", so
+    that it can be compared with the device of a tensor."""
+    device = torch.device(device)
+    if device.type == "cuda" and device.index is None:
+        device = torch.device("cuda", torch.cuda.current_device())
+    return device
+
+
 class ReconstructionConfig:
     def __init__(
         self,
@@ -151,11 +160,16 @@ class ReconstructionConfig:
         else:
             raise TypeError("Image must be a PyTorch Tensor or a numpy array")
 
-    def save(self, parent_directory):
+    def save(self, parent_directory, image_dtype=None):
         """Save the ReconstructionConfig to the specified directory.
         Args:
             parent_directory (str): Path to the directory where the
                 config_parameters directory will be created.
+            image_dtype (np.dtype): Optional dtype for storing the
+                retardance and azimuth images, e.g. np.float16 to halve
+                their size. Half precision keeps about 3 significant
+                digits, so the rounding error is below 1e-3 radians for
+                angles up to pi. The images are loaded as float32.
         Returns:
             None
         Class instance attibutes saved:
@@ -177,10 +191,26 @@ class ReconstructionConfig:
             os.makedirs(directory)
 
         # Save the retardance and azimuth images
-        np.save(os.path.join(directory, "ret_image.npy"), self.retardance_image)
-        np.save(os.path.join(directory, "azim_image.npy"), self.azimuth_image)
+        ret_image, azim_image = self.retardance_image, self.azimuth_image
+        if image_dtype is not None:
+            ret_image = ret_image.astype(image_dtype, copy=False)
+            azim_image = azim_image.astype(image_dtype, copy=False)
+        np.save(
+            os.path.join(directory, "ret_image.npy"),
+            ret_image,
+            allow_pickle=False,
+        )
+        np.save(
+            os.path.join(directory, "azim_image.npy"),
+            azim_image,
+            allow_pickle=False,
+        )
         if self.radiometry is not None:
-            np.save(os.path.join(directory, "radiometry"), self.radiometry)
+            np.save(
+                os.path.join(directory, "radiometry"),
+                self.radiometry,
+                allow_pickle=False,
+            )
         plt.ioff()
         my_fig = plot_retardance_orientation(
             self.retardance_image, self.azimuth_image, "hsv", include_labels=True
@@ -189,10 +219,11 @@ class ReconstructionConfig:
             os.path.join(directory, "ret_azim.png"), bbox_inches="tight", dpi=300
         )
         plt.close(my_fig)
-        with open(os.path.join(directory, "optical_info.json"), "w") as f:
-            json.dump(self.optical_info, f, indent=4, cls=ComplexArrayEncoder)
-        with open(os.path.join(directory, "iteration_params.json"), "w") as f:
-            json.dump(self.interation_parameters, f, indent=4)
+        save_json(self.optical_info, os.path.join(directory, "optical_info.json"))
+        save_json(
+            self.interation_parameters,
+            os.path.join(directory, "iteration_params.json"),
+        )
         # Save the volumes if the 'save_as_file' method exists
         if hasattr(self.initial_volume, "save_as_file"):
             my_description = "Initial volume used for reconstruction."
@@ -211,14 +242,21 @@ class ReconstructionConfig:
     def load(cls, parent_directory):
         """Load the ReconstructionConfig from the specified directory."""
         directory = os.path.join(parent_directory, "config_parameters")
-        # Load the numpy arrays
-        ret_image = np.load(os.path.join(directory, "ret_image.npy"))
-        azim_image = np.load(os.path.join(directory, "azim_image.npy"))
+        # Memory-map the numpy arrays; they are read when they are used
+        ret_image = np.load(
+            os.path.join(directory, "ret_image.npy"), mmap_mode="r", allow_pickle=False
+        )
+        azim_image = np.load(
+            os.path.join(directory, "azim_image.npy"), mmap_mode="r", allow_pickle=False
+        )
+        # Images stored in half precision are converted back to float32
+        if ret_image.dtype == np.float16:
+            ret_image = ret_image.astype(np.float32)
+        if azim_image.dtype == np.float16:
+            azim_image = azim_image.astype(np.float32)
         # Load the dictionaries
-        with open(os.path.join(directory, "optical_info.json"), "r") as f:
-            optical_info = json.load(f)
-        with open(os.path.join(directory, "iteration_params.json"), "r") as f:
-            iteration_params = json.load(f)
+        optical_info = load_json(os.path.join(directory, "optical_info.json"))
+        iteration_params = load_json(os.path.join(directory, "iteration_params.json"))
         # Initialize the initial_volume and gt_volume from files or set to None if files don't exist
         initial_volume_file = os.path.join(directory, "initial_volume.h5")
         gt_volume_file = os.path.join(directory, "gt_volume.h5")
@@ -257,11 +295,14 @@ class Reconstructor:
         device="cpu",
         omit_rays_based_on_pixels=False,
         apply_volume_mask=False,
+        verbose=False,
     ):
         """
         Initialize the Reconstructor with the provided parameters.
 
         recon_info (class): containing reconstruction parameters
+        verbose (bool): whether to print the loss and show the raytracing
+            progress bars during each iteration
         """
         start_time = time.perf_counter()
         print(f"\nInitializing a Reconstructor, using computing device {device}")
@@ -274,6 +315,10 @@ class Reconstructor:
         self.volume_ground_truth = recon_info.gt_volume
         self.intensity_imgs_meas = recon_info.intensity_img_list
         self.recon_directory = recon_info.recon_directory
+        self._set_measurement_tensors(device)
+        self.azim_damp_mask = self._to_numpy(
+            self.ret_img_meas / self.ret_img_meas.max()
+        )
         if self.volume_ground_truth is not None:
             self.birefringence_simulated = (
                 self.volume_ground_truth.get_delta_n().detach()
@@ -299,10 +344,16 @@ class Reconstructor:
             self.recon_directory = output_dir
 
         image_for_rays = None
+        self.omit_rays_based_on_pixels = omit_rays_based_on_pixels
         if omit_rays_based_on_pixels:
             image_for_rays = self.ret_img_meas
             print("Omitting rays based on pixels with zero retardance.")
         saved_ray_path = self.iteration_params.get("saved_ray_path", None)
+        self.verbose = verbose
+        self.compile_jones_step = self.iteration_params.get("compile_jones_step", False)
+        self.cuda_graphs = self.iteration_params.get("cuda_graphs", False)
+        self.mla_ray_block_size = self.iteration_params.get("mla_ray_block_size", None)
+        self._reachable_mask = None
         self.rays = self.setup_raytracer(
             image=image_for_rays, filepath=saved_ray_path, device=device
         )
@@ -314,7 +365,7 @@ class Reconstructor:
         )
 
         # Volume that will be updated after each iteration
-        self.volume_pred = copy.deepcopy(self.volume_initial_guess)
+        self.volume_pred = self.volume_initial_guess.clone()
 
         self.remove_large_arrs = self.iteration_params.get(
             "free_memory_by_del_large_arrays", False
@@ -385,14 +436,70 @@ class Reconstructor:
             self.intensity_bool = False
             print("Using retardance and azimuth images for data-fidelity term.")
 
+        # Loss function is created with the measurement targets on first use
+        self.loss_fcn = None
+
         # Lists to store the loss after each iteration
         self.loss_total_list = []
         self.loss_data_term_list = []
         self.loss_reg_term_list = []
         self.adjusted_lrs_list = []
+        # Loss terms that are not yet copied from the device into the lists
+        self._pending_losses = []
+        # Volumes are saved in a background thread while iterations continue
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        self._io_futures = []
+        # Artists of the iteration figure, updated in place after the first plot
+        self._plot_artists = None
+        self._plot_figure = None
         end_time = time.perf_counter()
         print(f"Reconstructor initialized in {end_time - start_time:.2f} seconds\n")
 
+    def reset_measurements(
+        self, ret_image, azim_image, initial_volume=None, output_dir=None
+    ):
+        """Replace the measured images, so that another reconstruction can
+        be run with the same ray geometry. The raytracer is not rebuilt,
+        which amortizes its setup over a batch of measurements.
+        Args:
+            ret_image (np.array or torch.Tensor): Measured retardance image.
+            azim_image (np.array or torch.Tensor): Measured azimuth image.
+            initial_volume (BirefringentVolume): Optional new initial guess.
+                By default, the current initial guess is used again.
+            output_dir (str): Directory for the new results. By default,
+                a new unique directory is created.
+        """
+        if self.omit_rays_based_on_pixels:
+            raise ValueError(
+                "The rays were selected from the measured retardance image, "
+                "so they cannot be reused for other measurements."
+            )
+        self._wait_for_io()
+        device = self.ret_meas_tensor.device
+        self.ret_img_meas = ret_image
+        self.azim_img_meas = azim_image
+        self._set_measurement_tensors(device)
+        self.azim_damp_mask = self._to_numpy(
+            self.ret_img_meas / self.ret_img_meas.max()
+        )
+        if initial_volume is not None:
+            self.volume_initial_guess = initial_volume
+        self.volume_pred = self.volume_initial_guess.clone()
+        self.apply_mask_to_volume(self.volume_pred)
+        if output_dir is None:
+            self.recon_directory = create_unique_directory("reconstructions")
+        else:
+            self.recon_directory = output_dir
+        # The loss function holds the previous measurement targets
+        self.loss_fcn = None
+        self.loss_total_list = []
+        self.loss_data_term_list = []
+        self.loss_reg_term_list = []
+        self.adjusted_lrs_list = []
+        self._pending_losses = []
+        self._plot_artists = None
+        self._plot_figure = None
+
     def _initialize_volume(self):
         """
         Method to initialize volume if it's not provided.
@@ -411,12 +518,61 @@ class Reconstructor:
         else:
             raise TypeError("Image must be a PyTorch Tensor or a numpy array")
 
+    def _set_measurement_tensors(self, device):
+        """Store the measured images as tensors on the computing device,
+        so that they are not converted again during each iteration. The
+        images are cast to the default dtype of the predicted images, so
+        that a float64 measurement does not promote the loss to float64."""
+        dtype = torch.get_default_dtype()
+        self.ret_meas_tensor = self._to_tensor(self.ret_img_meas, device, dtype)
+        self.azim_meas_tensor = self._to_tensor(self.azim_img_meas, device, dtype)
+        if self.intensity_imgs_meas is not None:
+            self.intensity_meas_tensors = [
+                self._to_tensor(img, device, dtype) for img in self.intensity_imgs_meas
+            ]
+        else:
+            self.intensity_meas_tensors = None
+
+    @staticmethod
+    def _to_tensor(image, device, dtype=None):
+        """Convert image to a tensor on the device, optionally cast to
+        dtype. Read-only arrays, such as memory-mapped measurements, are
+        copied into memory first.
+        Host images are pinned so that the copy to a GPU is asynchronous.
+        Numpy arrays are read directly into the pinned buffer, so that a
+        memory-mapped image is not first copied into pageable memory."""
+        to_gpu = torch.device(device).type == "cuda"
+        if isinstance(image, np.ndarray) and to_gpu:
+            if dtype is None:
+                dtype = torch.as_tensor(np.zeros(0, dtype=image.dtype)).dtype
+            pinned = torch.empty(image.shape, dtype=dtype, pin_memory=True)
+            pinned.numpy()[...] = image
+            return pinned.to(device, non_blocking=True)
+        if isinstance(image, np.ndarray) and not image.flags.writeable:
+            image = np.array(image)
+        tensor = torch.as_tensor(image)
+        if to_gpu and tensor.device.type == "cpu":
+            return tensor.pin_memory().to(device, dtype=dtype, non_blocking=True)
+        return tensor.to(device, dtype=dtype)
+
+    def _predicted_images_to_numpy(self):
+        """Convert the predicted images to numpy arrays for plotting, and
+        zero the azimuth where the measured retardance is zero."""
+        self.ret_img_pred = self._to_numpy(self.ret_img_pred)
+        self.azim_img_pred = self._to_numpy(self.azim_img_pred)
+        self.azim_img_pred = np.where(self.azim_damp_mask == 0, 0, self.azim_img_pred)
+
     def to_device(self, device):
         """
         Move all tensors to the specified device.
         """
-        self.ret_img_meas = torch.from_numpy(self.ret_img_meas).to(device)
-        self.azim_img_meas = torch.from_numpy(self.azim_img_meas).to(device)
+        # The measurements are already placed on the device passed to the
+        #   constructor, so they are only rebuilt when the device changes
+        if self.ret_meas_tensor.device != _resolve_device(device):
+            self.ret_img_meas = self._to_tensor(self.ret_img_meas, device)
+            self.azim_img_meas = self._to_tensor(self.azim_img_meas, device)
+            self._set_measurement_tensors(device)
+            self.loss_fcn = None
         # self.volume_initial_guess = self.volume_initial_guess.to(device)
         if self.volume_ground_truth is not None:
             self.volume_ground_truth = self.volume_ground_truth.to(device)
@@ -434,7 +590,7 @@ class Reconstructor:
                 "training_params": self.iteration_params,
                 "volume_type": volume_type,
             },
-            f"{output_dir}/parameters.pt",
+            os.path.join(output_dir, "parameters.pt"),
         )
 
     @staticmethod
@@ -471,12 +627,23 @@ class Reconstructor:
             start_time = time.time()
             rays.compute_rays_geometry(filename=None, image=image)
             print(f"Raytracing time in seconds: {time.time() - start_time:.2f}")
+        rays.verbose = self.verbose
+        rays.compile_jones_step = self.compile_jones_step
+        rays.graph_jones_product = self.cuda_graphs
+        rays.mla_ray_block_size = self.mla_ray_block_size
         return rays
 
+    def _get_reachable_mask(self):
+        """Mask of the volume region reachable by the rays, computed once
+        for the current raytracer."""
+        if self._reachable_mask is None:
+            self._reachable_mask = self.rays.get_volume_reachable_region()
+        return self._reachable_mask
+
     def mask_outside_rays(self):
         """Mask out volume that is outside FOV of the microscope.
         Original shapes of the volume are preserved."""
-        mask = self.rays.get_volume_reachable_region()
+        mask = self._get_reachable_mask()
         with torch.no_grad():
             self.volume_pred.Delta_n[mask.view(-1) == 0] = 0
             # Masking the optic axis caused NaNs in the Jones Matrix. So, we don't mask it.
@@ -486,7 +653,7 @@ class Reconstructor:
         """Crop the predicted volume to the region that is reachable by the microscope.
         Note: This method modifies the volume_pred attribute. The voxel indices of the predetermined ray tracing are no longer valid.
         """
-        mask = self.rays.get_volume_reachable_region()
+        mask = self._get_reachable_mask()
         region_shape = get_region_of_ones_shape(mask).tolist()
         original_shape = self.optical_info["volume_shape"]
         self.optical_info["volume_shape"] = region_shape
@@ -513,6 +680,7 @@ class Reconstructor:
         """
         self.crop_pred_volume_to_reachable_region()
         self.rays = self.setup_raytracer()
+        self._reachable_mask = None
 
     def _turn_off_initial_volume_gradients(self):
         """Turn off the gradients for the initial volume guess."""
@@ -689,24 +857,16 @@ class Reconstructor:
         """
         vol_pred = self.volume_pred
         params = self.iteration_params
-        retardance_meas = self.ret_img_meas
-        azimuth_meas = self.azim_img_meas
-        intensity_imgs_meas = self.intensity_imgs_meas
-
-        if not torch.is_tensor(retardance_meas):
-            retardance_meas = torch.tensor(retardance_meas)
-        if not torch.is_tensor(azimuth_meas):
-            azimuth_meas = torch.tensor(azimuth_meas)
-        if intensity_imgs_meas is not None:
-            for i, img in enumerate(intensity_imgs_meas):
-                if not torch.is_tensor(img):
-                    intensity_imgs_meas[i] = torch.tensor(img)
-
-        # TODO: move these initializations so that they are only done once
-        LossFcn = PolarimetricLossFunction(params=params)
-        LossFcn.set_retardance_target(retardance_meas)
-        LossFcn.set_orientation_target(azimuth_meas)
-        LossFcn.set_intensity_list_target(intensity_imgs_meas)
+        retardance_meas = self.ret_meas_tensor
+        azimuth_meas = self.azim_meas_tensor
+        intensity_imgs_meas = self.intensity_meas_tensors
+
+        if self.loss_fcn is None:
+            self.loss_fcn = PolarimetricLossFunction(params=params)
+            self.loss_fcn.set_retardance_target(retardance_meas)
+            self.loss_fcn.set_orientation_target(azimuth_meas)
+            self.loss_fcn.set_intensity_list_target(intensity_imgs_meas)
+        LossFcn = self.loss_fcn
         data_term = LossFcn.compute_datafidelity_term(
             LossFcn.datafidelity, images_predicted
         )
@@ -716,7 +876,8 @@ class Reconstructor:
             params["regularization_weight"] = params["regularization_weight"][0]
         reg_loss, reg_term_values = LossFcn.compute_regularization_term(vol_pred)
         regularization_term = params["regularization_weight"] * reg_loss
-        self.reg_term_values = [reg.item() for reg in reg_term_values]
+        # Kept as tensors; converted when they are written to the csv file
+        self.reg_term_values = [reg.detach() for reg in reg_term_values]
 
         # Total loss
         loss = data_term + regularization_term
@@ -767,7 +928,7 @@ class Reconstructor:
                     self.volume_pred.optic_axis_active
                 )
         loss, data_term, regularization_term = self._compute_loss(img_list)
-        if self.rays.verbose:
+        if self.verbose:
             tqdm.write(f"Computed the loss: {loss.item():.5}")
 
         # Verify the gradients before and after the backward pass
@@ -833,9 +994,7 @@ class Reconstructor:
                     self.azim_img_meas,
                 )
                 self.volume_pred = volume_estimation
-                self.loss_total_list.append(loss.item())
-                self.loss_data_term_list.append(data_term.item())
-                self.loss_reg_term_list.append(regularization_term.item())
+                self._append_losses(loss, data_term, regularization_term)
                 self.adjusted_lrs_list.append(adjusted_lrs)
         else:
             [ret_image_current, azim_image_current] = img_list
@@ -883,14 +1042,31 @@ class Reconstructor:
         regularization_term,
         adjusted_lrs,
     ):
-        self.ret_img_pred = ret_image_current.detach().cpu().numpy()
-        self.azim_img_pred = azim_image_current.detach().cpu().numpy()
+        # Kept on the device until they are needed for plotting
+        self.ret_img_pred = ret_image_current.detach()
+        self.azim_img_pred = azim_image_current.detach()
         self.volume_pred = volume_estimation
-        self.loss_total_list.append(loss.item())
-        self.loss_data_term_list.append(data_term.item())
-        self.loss_reg_term_list.append(regularization_term.item())
+        self._append_losses(loss, data_term, regularization_term)
         self.adjusted_lrs_list.append(adjusted_lrs)
 
+    def _append_losses(self, loss, data_term, regularization_term):
+        """Store the loss terms of an iteration on the device. They are
+        copied into the loss lists by _sync_loss_lists when needed, which
+        avoids a device synchronization for each term."""
+        terms = [loss, data_term, regularization_term]
+        self._pending_losses.append(torch.cat([t.detach().reshape(1) for t in terms]))
+
+    def _sync_loss_lists(self):
+        """Copy the pending loss terms into the loss lists."""
+        if not self._pending_losses:
+            return
+        pending = torch.stack(self._pending_losses).tolist()
+        self._pending_losses = []
+        for total, data_term, reg_term in pending:
+            self.loss_total_list.append(total)
+            self.loss_data_term_list.append(data_term)
+            self.loss_reg_term_list.append(reg_term)
+
     def visualize_and_save(self, ep, fig, output_dir):
         volume_estimation = self.volume_pred
         if self.remove_large_arrs:
@@ -910,30 +1086,44 @@ class Reconstructor:
         # TODO: only update every 1 epoch if plotting is live
         if ep % 1 == 0:
             # plt.clf()
+            self._predicted_images_to_numpy()
+            self._sync_loss_lists()
             Delta_n = volume_estimation.get_delta_n().detach().unsqueeze(0)
             mip_image = convert_volume_to_2d_mip(Delta_n)
             mip_image_np = prepare_plot_mip(mip_image, plot=False)
-            plot_iteration_update_gridspec(
-                self.birefringence_mip_sim,
-                self.ret_img_meas,
-                self.azim_img_meas,
-                mip_image_np,
-                self.ret_img_pred,
-                self.azim_img_pred,
-                self.loss_total_list,
-                self.loss_data_term_list,
-                self.loss_reg_term_list,
-                figure=fig,
-            )
+            if self._plot_artists is None or self._plot_figure is not fig:
+                # The subplots are created once per figure, then updated
+                self._plot_artists = plot_iteration_update_gridspec(
+                    self.birefringence_mip_sim,
+                    self.ret_img_meas,
+                    self.azim_img_meas,
+                    mip_image_np,
+                    self.ret_img_pred,
+                    self.azim_img_pred,
+                    self.loss_total_list,
+                    self.loss_data_term_list,
+                    self.loss_reg_term_list,
+                    figure=fig,
+                    return_artists=True,
+                )
+                self._plot_figure = fig
+            else:
+                update_iteration_gridspec(
+                    self._plot_artists,
+                    mip_image_np,
+                    self.ret_img_pred,
+                    self.azim_img_pred,
+                    self.loss_total_list,
+                    self.loss_data_term_list,
+                    self.loss_reg_term_list,
+                )
             fig.canvas.draw()
             fig.canvas.flush_events()
-            time.sleep(0.1)
             self.save_loss_lists_to_csv()
             self._save_regularization_terms_to_csv(ep)
             if ep % save_freq == 0:
                 filename = f"optim_ep_{'{:04d}'.format(ep)}.pdf"
                 plt.savefig(os.path.join(output_dir, filename))
-            time.sleep(0.1)
         if ep % save_freq == 0:
             if self.remove_large_arrs:
                 vol_size_flat = volume_estimation.Delta_n.size(0)
@@ -947,7 +1137,9 @@ class Reconstructor:
                         :, volume_estimation.indices_active
                     ] = volume_estimation.optic_axis_active
             my_description = "Volume estimation after " + str(ep) + " iterations."
-            volume_estimation.save_as_file(
+            # The clone is a snapshot that the next iterations do not modify
+            self._submit_io(
+                volume_estimation.clone().save_as_file,
                 os.path.join(output_dir, f"volume_ep_{'{:04d}'.format(ep)}.h5"),
                 description=my_description,
             )
@@ -959,6 +1151,18 @@ class Reconstructor:
             gc.collect()
         return
 
+    def _submit_io(self, fcn, *args, **kwargs):
+        """Run a file saving function in the background I/O thread."""
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=1)
+        self._io_futures.append(self._io_pool.submit(fcn, *args, **kwargs))
+
+    def _wait_for_io(self):
+        """Wait for the background saves to finish, raising their errors."""
+        for future in self._io_futures:
+            future.result()
+        self._io_futures = []
+
     def __visualize_and_update_streamlit(
         self, progress_bar, ep, n_epochs, recon_img_plot, my_loss
     ):
@@ -968,6 +1172,8 @@ class Reconstructor:
         progress_bar.progress(percent_complete + 1)
         if ep % 2 == 0:
             plt.close()
+            self._predicted_images_to_numpy()
+            self._sync_loss_lists()
             recon_img_fig = plot_retardance_orientation(
                 self.ret_img_pred, self.azim_img_pred, "hsv"
             )
@@ -991,6 +1197,7 @@ class Reconstructor:
         - self.loss_reg_term_list
         - self.adjusted_lrs_list
         """
+        self._sync_loss_lists()
         filename = "loss.csv"
         filepath = os.path.join(self.recon_directory, filename)
 
@@ -1028,9 +1235,10 @@ class Reconstructor:
         """Save the regularization terms to a csv file."""
         filename = "regularization_terms.csv"
         filepath = os.path.join(self.recon_directory, filename)
+        reg_term_values = [float(reg) for reg in self.reg_term_values]
         with open(filepath, mode="a", newline="") as file:
             writer = csv.writer(file)
-            writer.writerow([ep, *self.reg_term_values])
+            writer.writerow([ep, *reg_term_values])
 
     def clip_gradient_norms(self, model, verbose=False):
         # Gradient clipping
@@ -1153,55 +1361,62 @@ class Reconstructor:
         warmup_epochs = 10
         warmup_start_proportion = 0.1
         # Iterations
-        for ep in tqdm(range(1, n_epochs + 1), "Minimizing"):
-            self.ep = ep
-            # Learning rate warmup
-            if ep < warmup_epochs:
-                lr_0 = initial_lr_0 * (
-                    warmup_start_proportion
-                    + (1 - warmup_start_proportion) * (ep / warmup_epochs)
-                )
-                lr_1 = initial_lr_1 * (
-                    warmup_start_proportion
-                    + (1 - warmup_start_proportion) * (ep / warmup_epochs)
-                )
-                optimizer.param_groups[0]["lr"] = lr_0
-                optimizer.param_groups[1]["lr"] = lr_1
-            else:
-                current_lr_0 = scheduler.optimizer.param_groups[0]["lr"]
-                current_lr_1 = scheduler.optimizer.param_groups[1]["lr"]
-                if lr_0 != current_lr_0 or lr_1 != current_lr_1:
-                    print(
-                        f"Learning rates at iteration {ep - 1}: {lr_0:.2e}, {lr_1:.2e}"
+        # Pending saves are finished and the I/O thread is released even if
+        #   the iterations are interrupted
+        try:
+            for ep in tqdm(range(1, n_epochs + 1), "Minimizing"):
+                self.ep = ep
+                # Learning rate warmup
+                if ep < warmup_epochs:
+                    lr_0 = initial_lr_0 * (
+                        warmup_start_proportion
+                        + (1 - warmup_start_proportion) * (ep / warmup_epochs)
                     )
-                    print(f"Learning rates changed at epoch {ep}")
-                    print(
-                        f"Learning rates at iteration {ep}: {current_lr_0:.2e}, {current_lr_1:.2e}"
+                    lr_1 = initial_lr_1 * (
+                        warmup_start_proportion
+                        + (1 - warmup_start_proportion) * (ep / warmup_epochs)
                     )
+                    optimizer.param_groups[0]["lr"] = lr_0
+                    optimizer.param_groups[1]["lr"] = lr_1
                 else:
-                    pass
-                lr_0 = current_lr_0
-                lr_1 = current_lr_1
-            self.one_iteration(optimizer, self.volume_pred, scheduler=scheduler)
-            if ep == 1 and PRINT_TIMING_INFO:
-                self.rays.print_timing_info()
-            if ep % 20 == 0 and self.intensity_bool:
-                with torch.no_grad():
-                    [ret_image_current, azim_image_current] = (
-                        self.rays.ray_trace_through_volume(self.volume_pred)
+                    current_lr_0 = scheduler.optimizer.param_groups[0]["lr"]
+                    current_lr_1 = scheduler.optimizer.param_groups[1]["lr"]
+                    if lr_0 != current_lr_0 or lr_1 != current_lr_1:
+                        print(
+                            f"Learning rates at iteration {ep - 1}: {lr_0:.2e}, {lr_1:.2e}"
+                        )
+                        print(f"Learning rates changed at epoch {ep}")
+                        print(
+                            f"Learning rates at iteration {ep}: {current_lr_0:.2e}, {current_lr_1:.2e}"
+                        )
+                    else:
+                        pass
+                    lr_0 = current_lr_0
+                    lr_1 = current_lr_1
+                self.one_iteration(optimizer, self.volume_pred, scheduler=scheduler)
+                if ep == 1 and PRINT_TIMING_INFO:
+                    self.rays.print_timing_info()
+                if ep % 20 == 0 and self.intensity_bool:
+                    with torch.no_grad():
+                        [ret_image_current, azim_image_current] = (
+                            self.rays.ray_trace_through_volume(self.volume_pred)
+                        )
+                    self.ret_img_pred = ret_image_current.detach()
+                    self.azim_img_pred = azim_image_current.detach()
+                sys.stdout.flush()
+
+                if use_streamlit:
+                    self.__visualize_and_update_streamlit(
+                        progress_bar, ep, n_epochs, my_recon_img_plot, my_loss
                     )
-                self.ret_img_pred = ret_image_current.detach().cpu().numpy()
-                self.azim_img_pred = azim_image_current.detach().cpu().numpy()
-            sys.stdout.flush()
-
-            azim_damp_mask = self._to_numpy(self.ret_img_meas / self.ret_img_meas.max())
-            self.azim_img_pred[azim_damp_mask == 0] = 0
-            if use_streamlit:
-                self.__visualize_and_update_streamlit(
-                    progress_bar, ep, n_epochs, my_recon_img_plot, my_loss
-                )
-            self.visualize_and_save(ep, figure, self.recon_directory)
-
+                self.visualize_and_save(ep, figure, self.recon_directory)
+        finally:
+            if self._io_pool is not None:
+                self._io_pool.shutdown(wait=True)
+                self._io_pool = None
+            self._wait_for_io()
+
+        self._predicted_images_to_numpy()
         self.save_loss_lists_to_csv()
         if self.remove_large_arrs:
             vol_shape = self.optical_info["volume_shape"]
@@ -1,22 +1,37 @@
-import json
+import copy
+import functools
+import os
 from VolumeRaytraceLFM.birefringence_implementations import BirefringentVolume
+from VolumeRaytraceLFM.utils.json_utils import load_json
+
+
+@functools.lru_cache(maxsize=16)
+def _load_config(config_file, mtime):
+    """Parse a JSON configuration file. The result is cached by the path
+    and the modification time, so a file is only parsed again after it
+    has changed."""
+    return load_json(config_file)
+
+
+def _read_config(config_file):
+    """Returns a copy of the parsed configuration file, so that the caller
+    can modify it without changing the cached result."""
+    config = _load_config(config_file, os.path.getmtime(config_file))
+    return copy.deepcopy(config)
 
 
 def setup_optical_parameters(config_file=None):
     """Setup optical parameters based on a configuration file."""
     optical_info = BirefringentVolume.get_optical_info_template()
     if config_file is not None:
-        with open(config_file, "r") as f:
-            config = json.load(f)
-        optical_info.update(config)
+        optical_info.update(_read_config(config_file))
     return optical_info
 
 
 def setup_iteration_parameters(config_file=None):
     """Setup iteration parameters based on a configuration file."""
     if config_file is not None:
-        with open(config_file, "r") as f:
-            iteration_params = json.load(f)
+        iteration_params = _read_config(config_file)
     else:
         iteration_params = {
             "n_epochs": 201,
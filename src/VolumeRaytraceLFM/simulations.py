@@ -2,6 +2,8 @@
 
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import matplotlib.pyplot as plt
 from VolumeRaytraceLFM.abstract_classes import BackEnds
 from VolumeRaytraceLFM.birefringence_implementations import (
@@ -150,15 +152,52 @@ class ForwardModel:
         plt.pause(0.2)
         plt.show(block=True)
 
-    def save_ret_azim_images(self):
-        """Save the simulated retardance and azimuth images."""
-        self.create_savedir()
-        ret_image = self.convert_to_numpy(self.ret_img)
-        azim_image = self.convert_to_numpy(self.azim_img)
-        my_fig = plot_retardance_orientation(
-            ret_image, azim_image, "hsv", include_labels=True
+    def _ret_azim_to_numpy(self):
+        """Copy the retardance and azimuth images into a single host
+        buffer. For images on a GPU, the first copy is asynchronous into
+        pinned memory, and the second copy on the same stream waits for
+        both transfers to finish."""
+        ret_image, azim_image = self.ret_img, self.azim_img
+        if not (
+            self.is_pytorch_tensor(ret_image) and self.is_pytorch_tensor(azim_image)
+        ):
+            return self.convert_to_numpy(ret_image), self.convert_to_numpy(azim_image)
+        ret_image, azim_image = ret_image.detach(), azim_image.detach()
+        staged = ret_image.new_empty(
+            (2, *ret_image.shape), device="cpu", pin_memory=ret_image.is_cuda
         )
-        my_fig.savefig(self.savedir + "/ret_azim.png", bbox_inches="tight", dpi=300)
+        staged[0].copy_(ret_image, non_blocking=True)
+        staged[1].copy_(azim_image)
+        images = staged.numpy()
+        return images[0], images[1]
+
+    def save_ret_azim_images(self, save_arrays=False):
+        """Save the simulated retardance and azimuth images.
+        Args:
+            save_arrays (bool): Whether to also save the images as
+                ret_image.npy and azim_image.npy. The two files are
+                written in parallel while the figure is saved.
+        """
+        self.create_savedir()
+        ret_image, azim_image = self._ret_azim_to_numpy()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = []
+            if save_arrays:
+                futures = [
+                    pool.submit(np.save, os.path.join(self.savedir, filename), image)
+                    for filename, image in [
+                        ("ret_image.npy", ret_image),
+                        ("azim_image.npy", azim_image),
+                    ]
+                ]
+            my_fig = plot_retardance_orientation(
+                ret_image, azim_image, "hsv", include_labels=True
+            )
+            my_fig.savefig(
+                os.path.join(self.savedir, "ret_azim.png"), bbox_inches="tight", dpi=300
+            )
+            for future in futures:
+                future.result()
 
     def save_intensity_images(self):
         """Save the simulated intensity images."""
@@ -1,5 +1,7 @@
 """Ultility functions for dictionaries."""
 
+import itertools
+import numpy as np
 import torch
 
 
@@ -57,6 +59,50 @@ def idx_dict_to_tensor(idx_dict):
     return idx_tensor
 
 
+def pad_lists_to_tensor(lists, max_length=None, pad_value=-1, dtype=torch.int):
+    """
+    Packs a list of lists of varying lengths into a padded 2D tensor.
+
+    Args:
+        lists (list): List of lists of integers.
+        max_length (int, optional): Length of the padded rows. Defaults to
+            the length of the longest list.
+        pad_value (int): Value used for the padded entries.
+        dtype (torch.dtype): Data type of the output tensor.
+
+    Returns:
+        torch.Tensor: Padded tensor of shape [len(lists), max_length].
+    """
+    lengths = np.fromiter((len(inner_list) for inner_list in lists), dtype=np.int64)
+    if max_length is None:
+        max_length = int(lengths.max()) if lengths.size > 0 else 0
+    padded = np.full((len(lists), max_length), pad_value, dtype=np.int64)
+    valid = np.arange(max_length) < lengths[:, None]
+    padded[valid] = np.fromiter(
+        itertools.chain.from_iterable(lists), dtype=np.int64, count=int(lengths.sum())
+    )
+    return torch.from_numpy(padded).to(dtype)
+
+
+def count_voxels_of_segs(voxels_of_segs, pad_value=-1):
+    """
+    Counts the number of voxels traversed by each ray.
+
+    Args:
+        voxels_of_segs (list or torch.Tensor): List of lists of voxel indices,
+            or the padded tensor created by pad_lists_to_tensor.
+        pad_value (int): Value used for the padded entries of the tensor.
+
+    Returns:
+        torch.Tensor: Number of voxels for each ray.
+    """
+    if torch.is_tensor(voxels_of_segs):
+        if voxels_of_segs.numel() == 0:
+            return torch.zeros(voxels_of_segs.shape[0], dtype=torch.long)
+        return (voxels_of_segs != pad_value).sum(dim=1)
+    return torch.tensor([len(vx) for vx in voxels_of_segs], dtype=torch.long)
+
+
 def convert_to_tensors(dict_of_lists):
     # Create a new dictionary to store the tensor versions of the lists
     tensor_dict = {}
@@ -67,12 +113,5 @@ def convert_to_tensors(dict_of_lists):
     # Process each key and list in the dictionary
     for mla_index, lists in dict_of_lists.items():
         # Pad each list to the maximum length and create a tensor
-        padded_lists = [
-            inner_list + [-1] * (max_length - len(inner_list)) for inner_list in lists
-        ]
-        tensor = torch.tensor(
-            padded_lists, dtype=torch.int
-        )  # Specify dtype if necessary
-        # Store the tensor in the new dictionary
-        tensor_dict[mla_index] = tensor
+        tensor_dict[mla_index] = pad_lists_to_tensor(lists, max_length)
     return tensor_dict
@@ -11,12 +11,17 @@ def get_region_of_ones_shape(mask):
     Returns:
         shape (torch.Tensor): shape of the smallest bounding box that contains all the ones in the input mask.
     """
-    indices = torch.nonzero(mask)
-    if indices.numel() == 0:
+    mask = mask.to(torch.bool)
+    if not mask.any():
         raise ValueError("Mask contains no ones.")
-    min_indices = indices.min(dim=0)[0]
-    max_indices = indices.max(dim=0)[0]
-    shape = max_indices - min_indices + 1
+    # The extent along each dimension is found from the occupied slices,
+    #   which avoids listing the coordinates of every nonzero element.
+    extents = []
+    for dim in range(mask.ndim):
+        occupied = mask.movedim(dim, 0).reshape(mask.shape[dim], -1).any(dim=1)
+        occupied_idx = torch.nonzero(occupied).squeeze(1)
+        extents.append(occupied_idx[-1] - occupied_idx[0] + 1)
+    shape = torch.stack(extents)
     return shape
 
 
@@ -1,6 +1,12 @@
 import json
 import numpy as np
 
+# Optional faster serializer; the standard json module is used otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 """Example of encoding complex numbers and numpy arrays to JSON.
 # Example numpy array of complex numbers
 complex_array = np.array([[0.5+0j, 0.5j], [-0.5j, 0.5+0j]])
@@ -22,6 +28,8 @@ class ComplexArrayEncoder(json.JSONEncoder):
         # Let numpy arrays be handled by converting them to lists
         elif isinstance(obj, np.ndarray):
             return obj.tolist()
+        elif isinstance(obj, np.generic):
+            return obj.item()
         return json.JSONEncoder.default(self, obj)
 
 
@@ -35,3 +43,59 @@ def json_to_complex_array(json_data):
     data = json.loads(json_data, object_hook=decode_complex_list)
     # Convert lists (possibly containing complex numbers) back to a numpy array
     return np.array(data)
+
+
+def _orjson_default(obj):
+    """Convert the types that orjson does not serialize natively."""
+    if isinstance(obj, complex):
+        return {"real": obj.real, "imag": obj.imag}
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _has_non_finite(data):
+    """Whether data contains a NaN or infinite float, including in numpy
+    scalars and arrays, which orjson would write as null."""
+    if isinstance(data, (float, np.floating, np.complexfloating)):
+        return not np.isfinite(data)
+    if isinstance(data, np.ndarray):
+        if np.issubdtype(data.dtype, np.inexact):
+            return not np.isfinite(data).all()
+        return False
+    if isinstance(data, dict):
+        return any(_has_non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite(value) for value in data)
+    return False
+
+
+def save_json(data, filepath):
+    """Save a dictionary to a JSON file, with orjson if it is installed.
+    Complex numbers and numpy arrays are encoded as by ComplexArrayEncoder.
+    orjson indents with 2 spaces instead of 4. Data with NaN or infinite
+    floats is written with the json module, so that these values are kept.
+    """
+    if orjson is not None and not _has_non_finite(data):
+        options = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+        options |= orjson.OPT_NON_STR_KEYS
+        with open(filepath, "wb") as f:
+            f.write(orjson.dumps(data, default=_orjson_default, option=options))
+    else:
+        with open(filepath, "w") as f:
+            json.dump(data, f, indent=4, cls=ComplexArrayEncoder)
+
+
+def load_json(filepath):
+    """Load a JSON file, with orjson if it is installed. Files that orjson
+    cannot parse, such as those with NaN values, are read with the json
+    module."""
+    if orjson is not None:
+        with open(filepath, "rb") as f:
+            content = f.read()
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return json.loads(content)
+    with open(filepath, "r") as f:
+        return json.load(f)
@@ -4,13 +4,15 @@ import torch
 import gc
 
 # from memory_profiler import profile
-from VolumeRaytraceLFM.utils.dimensions_utils import (
-    light_field_to_1D,
-    oneD_to_light_field,
-)
 from VolumeRaytraceLFM.utils.occurences_utils import indices_with_multiple_occurences
 
 
+def _mask_from_width_profile(shape, profile):
+    """Broadcast a profile along the third dimension to a 3D mask, which
+    is written once when it is flattened into a 1D tensor."""
+    return profile.expand(shape).flatten()
+
+
 def create_half_zero_mask(shape):
     """
     Creates a 3D mask with the first half of the elements in the
@@ -27,11 +29,10 @@ def create_half_zero_mask(shape):
     Returns:
         torch.Tensor: The resulting mask, flattened into a 1D tensor.
     """
-    mask = torch.ones(shape)
+    profile = torch.ones(shape[2])
     half_elements = shape[2] // 2
-    for i in range(shape[0]):
-        mask[i, :, :half_elements] = 0
-    return mask.flatten()
+    profile[:half_elements] = 0
+    return _mask_from_width_profile(shape, profile)
 
 
 def create_half_zero_sandwich_mask(shape):
@@ -50,12 +51,10 @@ def create_half_zero_sandwich_mask(shape):
     Returns:
         torch.Tensor: The resulting mask, flattened into a 1D tensor.
     """
-    mask = torch.ones(shape)
+    profile = torch.zeros(shape[2])
     half_elements = shape[2] // 2
-    for i in range(shape[0]):
-        mask[i, :, :half_elements] = 0
-        mask[i, :, half_elements + 2 :] = 0
-    return mask.flatten()
+    profile[half_elements : half_elements + 2] = 1
+    return _mask_from_width_profile(shape, profile)
 
 
 def get_bool_mask_for_ray_indices(ray_indices, light_field):
@@ -78,18 +77,24 @@ def get_bool_mask_for_ray_indices(ray_indices, light_field):
 def form_mask_radiometry_and_valid_rays(
     ray_indices, radiometry, num_micro_lenses, pixels_per_ml
 ):
+    """Mask of the pixels that are both reached by a ray and have a
+    nonzero radiometry. The masks are combined directly in the light
+    field layout, since the lenslet-wise 1D layout is only a permutation.
+    Args:
+        ray_indices (torch.Tensor): Tensor of shape (2, N) containing the ray indices.
+        radiometry (torch.Tensor): 2D light field tensor.
+        num_micro_lenses (int): Number of micro-lenses along one dimension.
+        pixels_per_ml (int): Number of pixels per micro-lens.
+    Returns:
+        torch.Tensor: 2D boolean mask of shape (pixels_per_mla, pixels_per_mla).
+    """
     pixels_per_mla = num_micro_lenses * pixels_per_ml
-    valid_indices_mask = torch.zeros((pixels_per_mla, pixels_per_mla), dtype=torch.bool)
-    valid_indices_mask[ray_indices[0, :], ray_indices[1, :]] = True
-    valid_indices_mask1D = light_field_to_1D(
-        valid_indices_mask, num_micro_lenses, pixels_per_ml
+    valid_and_radiometry = torch.zeros(
+        (pixels_per_mla, pixels_per_mla), dtype=torch.bool, device=radiometry.device
     )
-    radiometry1D = light_field_to_1D(
-        radiometry.to(torch.bool), num_micro_lenses, pixels_per_ml
-    )
-    valid_and_radiometry1D = valid_indices_mask1D * radiometry1D
-    valid_and_radiometry = oneD_to_light_field(
-        valid_and_radiometry1D, num_micro_lenses, pixels_per_ml
+    valid_and_radiometry[ray_indices[0, :], ray_indices[1, :]] = True
+    valid_and_radiometry.logical_and_(
+        radiometry[:pixels_per_mla, :pixels_per_mla].to(torch.bool)
     )
     return valid_and_radiometry
 
@@ -162,23 +167,12 @@ def filter_voxels_using_retardance(voxels_raytraced, ray_indices, ret_image):
     torch.cuda.empty_cache()  # Only if working with CUDA tensors
     gc.collect()
 
-    # Exclude voxels that appear in zero retardance pixels at least twice
-    memory_intensive = False
-    if memory_intensive:
-        vox_exclusion_mask = (
-            ~total_voxels.unsqueeze(1).eq(voxels_zero_ret_two_times).any(1)
-        )
-        filtered_voxels = total_voxels[vox_exclusion_mask]
-    else:
-        # Convert tensors to sets
-        total_voxels_set = set(total_voxels.tolist())
-        voxels_zero_ret_two_times_set = set(voxels_zero_ret_two_times.tolist())
-
-        # Perform set difference to find elements in total_voxels that are not in voxels_zero_ret_two_times
-        filtered_voxels_set = total_voxels_set - voxels_zero_ret_two_times_set
-
-        # Convert the result back to a tensor
-        filtered_voxels = torch.tensor(sorted(list(filtered_voxels_set)))
+    # Exclude voxels that appear in zero retardance pixels at least twice.
+    # total_voxels is sorted by unique(), so the filtered voxels are too.
+    vox_exclusion_mask = torch.isin(
+        total_voxels, voxels_zero_ret_two_times, invert=True
+    )
+    filtered_voxels = total_voxels[vox_exclusion_mask]
 
     print(
         f"Masking out voxels except for {len(filtered_voxels)} voxels. "
@@ -1,16 +1,28 @@
 """Ultility functions for finding occurences of elements in a tensor."""
 
+import torch
+
 
 def indices_with_multiple_occurences(tensor, num_occurences):
     """
     Find the indices of elements in a 1D tensor that occur multiple times.
+    The tensor is sorted once, and the lengths of the runs of equal
+    values give the number of occurences.
     Args:
         tensor (torch.Tensor): The input tensor.
     Returns:
         torch.Tensor: The indices of elements that occur multiple times.
     """
-    unique, counts = tensor.unique(return_counts=True)
+    sorted_tensor = torch.sort(tensor.flatten()).values
+    num_elements = sorted_tensor.numel()
+    run_starts_mask = torch.ones(
+        num_elements, dtype=torch.bool, device=sorted_tensor.device
+    )
+    run_starts_mask[1:] = sorted_tensor[1:] != sorted_tensor[:-1]
+    run_starts = run_starts_mask.nonzero().squeeze(1)
+    run_ends = torch.cat([run_starts[1:], run_starts.new_tensor([num_elements])])
+    counts = run_ends - run_starts
     mask = counts >= num_occurences
-    filtered_unique = unique[mask]
+    filtered_unique = sorted_tensor[run_starts[mask]]
     filtered_counts = counts[mask]
     return filtered_unique, filtered_counts
@@ -0,0 +1,213 @@
+"""Optional Numba kernels for initializing and plotting volumes, with numpy fallbacks."""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, cache=True)
+    def _normalize_optic_axis_numba(optic_axis_flat):
+        for i in prange(optic_axis_flat.shape[1]):
+            norm = np.sqrt(
+                optic_axis_flat[0, i] ** 2
+                + optic_axis_flat[1, i] ** 2
+                + optic_axis_flat[2, i] ** 2
+            )
+            if norm > 0:
+                optic_axis_flat[0, i] /= norm
+                optic_axis_flat[1, i] /= norm
+                optic_axis_flat[2, i] /= norm
+
+    @njit(parallel=True, cache=True, error_model="numpy")
+    def _fill_ellipsoid_shell_numba(vol, center, radius, inner_radius, delta_n):
+        for k in prange(vol.shape[1]):
+            dk = center[0] - k
+            for j in range(vol.shape[2]):
+                dj = center[1] - j
+                for i in range(vol.shape[3]):
+                    di = center[2] - i
+                    outer = (
+                        dk**2 / radius[0] ** 2
+                        + dj**2 / radius[1] ** 2
+                        + di**2 / radius[2] ** 2
+                    )
+                    if not outer <= 1:
+                        continue
+                    inner = (
+                        dk**2 / inner_radius[0] ** 2
+                        + dj**2 / inner_radius[1] ** 2
+                        + di**2 / inner_radius[2] ** 2
+                    )
+                    nk = 2 * dk / radius[0]
+                    nj = 2 * dj / radius[1]
+                    ni = 2 * di / radius[2]
+                    norm = np.sqrt(nk**2 + nj**2 + ni**2)
+                    if norm == 0:
+                        norm = 1.0
+                    # The optic axis is also set in the hollow part of the shell
+                    vol[1, k, j, i] = nk / norm
+                    vol[2, k, j, i] = nj / norm
+                    vol[3, k, j, i] = ni / norm
+                    if not inner <= 1:
+                        vol[0, k, j, i] = delta_n
+
+    @njit(parallel=True, cache=True, error_model="numpy")
+    def _fill_ellipsoid_shells_numba(vol, centers, radii, inner_radii, delta_ns):
+        for k in prange(vol.shape[1]):
+            for j in range(vol.shape[2]):
+                for i in range(vol.shape[3]):
+                    for e in range(centers.shape[0]):
+                        dk = centers[e, 0] - k
+                        dj = centers[e, 1] - j
+                        di = centers[e, 2] - i
+                        outer = (
+                            dk**2 / radii[e, 0] ** 2
+                            + dj**2 / radii[e, 1] ** 2
+                            + di**2 / radii[e, 2] ** 2
+                        )
+                        if not outer <= 1:
+                            continue
+                        inner = (
+                            dk**2 / inner_radii[e, 0] ** 2
+                            + dj**2 / inner_radii[e, 1] ** 2
+                            + di**2 / inner_radii[e, 2] ** 2
+                        )
+                        nk = 2 * dk / radii[e, 0]
+                        nj = 2 * dj / radii[e, 1]
+                        ni = 2 * di / radii[e, 2]
+                        norm = np.sqrt(nk**2 + nj**2 + ni**2)
+                        if norm == 0:
+                            norm = 1.0
+                        # Sum the normals, then renormalize the optic axis
+                        ok = vol[1, k, j, i] + nk / norm
+                        oj = vol[2, k, j, i] + nj / norm
+                        oi = vol[3, k, j, i] + ni / norm
+                        norm = np.sqrt(ok**2 + oj**2 + oi**2)
+                        if norm > 0:
+                            ok /= norm
+                            oj /= norm
+                            oi /= norm
+                        vol[1, k, j, i] = ok
+                        vol[2, k, j, i] = oj
+                        vol[3, k, j, i] = oi
+                        if not inner <= 1:
+                            vol[0, k, j, i] += delta_ns[e]
+
+    @njit(parallel=True, cache=True)
+    def _pack_line_segments_numba(base_flat, tip_flat, out_coords, out_color):
+        for i in prange(base_flat.shape[1]):
+            length = 0.0
+            for d in range(3):
+                out_coords[d, 3 * i] = base_flat[d, i]
+                out_coords[d, 3 * i + 1] = tip_flat[d, i]
+                out_coords[d, 3 * i + 2] = np.nan
+                length += (base_flat[d, i] - tip_flat[d, i]) ** 2
+            # Masked voxels have NaN coordinates and get no color
+            if np.isnan(length):
+                length = 0.0
+            out_color[3 * i] = length
+            out_color[3 * i + 1] = length
+            out_color[3 * i + 2] = 0.0
+
+
+def normalize_optic_axis_inplace(optic_axis):
+    """Normalize the optic axis of every voxel in place. Voxels with a zero
+    optic axis are left unchanged.
+    Args:
+        optic_axis (np.array): float array of shape [3, nz, ny, nx]
+    Returns:
+        np.array: the normalized optic_axis
+    """
+    if NUMBA_AVAILABLE and optic_axis.flags.c_contiguous:
+        # Numba normalizes voxel by voxel without a temporary norms array
+        _normalize_optic_axis_numba(optic_axis.reshape(3, -1))
+    else:
+        oa_norm = np.linalg.norm(optic_axis, axis=0)
+        nonzero = oa_norm > 0
+        optic_axis[:, nonzero] /= oa_norm[nonzero]
+    return optic_axis
+
+
+def fill_ellipsoid_shell(vol, center, radius, inner_radius, delta_n):
+    """Fills a zero initialized volume with an ellipsoidal shell in a single
+    pass, with the optic axis normal to the ellipsoid surface. Requires Numba.
+    Args:
+        vol (np.array): float array of shape [4, nz, ny, nx] filled with zeros
+        center [3]: [cz,cy,cx] center of the ellipsoid in voxels
+        radius [3]: outer radius in z,y,x in voxels
+        inner_radius [3]: radius in z,y,x of the hollow part in voxels
+        delta_n (float): Delta_n value of the shell
+    Returns:
+        np.array: the filled vol
+    """
+    _fill_ellipsoid_shell_numba(
+        vol,
+        np.asarray(center, dtype=np.float64),
+        np.asarray(radius, dtype=np.float64),
+        np.asarray(inner_radius, dtype=np.float64),
+        float(delta_n),
+    )
+    return vol
+
+
+def fill_ellipsoid_shells(vol, centers, radii, inner_radii, delta_ns):
+    """Sums many ellipsoidal shells into a zero initialized volume in a
+    single pass. The optic axis of each voxel is the normalized sum of the
+    normals of the ellipsoids containing it, renormalized after each
+    ellipsoid. Requires Numba.
+    Args:
+        vol (np.array): float array of shape [4, nz, ny, nx] filled with zeros
+        centers [n, 3]: [cz,cy,cx] centers of the ellipsoids in voxels
+        radii [n, 3]: outer radii in z,y,x in voxels
+        inner_radii [n, 3]: radii in z,y,x of the hollow parts in voxels
+        delta_ns [n]: Delta_n values of the shells
+    Returns:
+        np.array: the filled vol
+    """
+    _fill_ellipsoid_shells_numba(
+        vol,
+        np.asarray(centers, dtype=np.float64).reshape(-1, 3),
+        np.asarray(radii, dtype=np.float64).reshape(-1, 3),
+        np.asarray(inner_radii, dtype=np.float64).reshape(-1, 3),
+        np.asarray(delta_ns, dtype=np.float64).reshape(-1),
+    )
+    return vol
+
+
+def pack_line_segments(coords_base, coords_tip):
+    """Interleaves the base and tip of every line with a NaN, so that all
+    the lines can be plotted as a single trace.
+    Args:
+        coords_base (np.array): float array of shape [3, ...]
+        coords_tip (np.array): float array with the same shape as coords_base
+    Returns:
+        np.array: coordinates of shape [3, 3 * n_lines]
+        np.array: squared length of each line, repeated for its base and
+            tip, and 0 for the NaN separator. Lines with NaN coordinates
+            have a length of 0.
+    """
+    base_flat = np.ascontiguousarray(coords_base).reshape(3, -1)
+    tip_flat = np.ascontiguousarray(coords_tip).reshape(3, -1)
+    n_lines = base_flat.shape[1]
+    if NUMBA_AVAILABLE:
+        # Numba writes each segment in a single sequential pass
+        out_coords = np.empty((3, 3 * n_lines), dtype=base_flat.dtype)
+        out_color = np.empty(3 * n_lines, dtype=base_flat.dtype)
+        _pack_line_segments_numba(base_flat, tip_flat, out_coords, out_color)
+        return out_coords, out_color
+    nan_column = np.full_like(base_flat, np.nan)
+    out_coords = np.stack([base_flat, tip_flat, nan_column], axis=2).reshape(3, -1)
+    line_vectors = base_flat - tip_flat
+    line_length = np.einsum("ij,ij->j", line_vectors, line_vectors)
+    np.nan_to_num(line_length, copy=False, nan=0.0)
+    out_color = np.stack(
+        [line_length, line_length, np.zeros_like(line_length)], axis=1
+    ).ravel()
+    return out_coords, out_color
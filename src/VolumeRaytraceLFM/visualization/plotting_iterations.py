@@ -136,7 +136,8 @@ def plot_volume_subplot(index, volume, title):
 
 
 def plot_image_subplot(ax, image, title, cmap="plasma"):
-    """Helper function to plot an image in a subplot with a colorbar and title."""
+    """Helper function to plot an image in a subplot with a colorbar and title.
+    Returns the image artist."""
     if isinstance(image, torch.Tensor):
         image = image.cpu().numpy()
     im = ax.imshow(image, cmap=cmap)
@@ -144,16 +145,20 @@ def plot_image_subplot(ax, image, title, cmap="plasma"):
     ax.set_title(title, fontsize=8)
     ax.axis("off")  # Hide the axis for a cleaner look
     ax.xaxis.set_visible(False)  # Hide the x-axis if not needed
+    return im
 
 
 def plot_combined_loss_subplot(
     ax, losses, data_term_losses, regularization_term_losses, max_y_limit=None
 ):
-    """Helper function to plot all losses on a given axis."""
+    """Helper function to plot all losses on a given axis.
+    Returns the line artists of the total, data and regularization losses."""
     epochs = list(range(len(losses)))
-    ax.plot(epochs, losses, label="total loss", color="g")
-    ax.plot(epochs, data_term_losses, label="data-fidelity term loss", color="b")
-    ax.plot(
+    (line_total,) = ax.plot(epochs, losses, label="total loss", color="g")
+    (line_data,) = ax.plot(
+        epochs, data_term_losses, label="data-fidelity term loss", color="b"
+    )
+    (line_reg,) = ax.plot(
         epochs,
         regularization_term_losses,
         label="regularization term loss",
@@ -169,6 +174,7 @@ def plot_combined_loss_subplot(
     # Set y-axis limit to zoom in on the lower range of loss values
     if max_y_limit is not None:
         ax.set_ylim([0, max_y_limit])
+    return line_total, line_data, line_reg
 
 
 def calculate_dynamic_max_y_limit(losses, window_size=10, scale_factor=1.1):
@@ -204,9 +210,12 @@ def plot_iteration_update_gridspec(
     regularization_term_losses,
     figure=None,
     streamlit_purpose=False,
+    return_artists=False,
 ):
     """Plots measured and predicted volumes, retardance, orientation,
     and combined losses using GridSpec for layout.
+    If return_artists is True, the artists of the predictions and losses
+    are returned, so that update_iteration_gridspec can refresh them.
     """
     # If a figure is provided, use it; otherwise, use the current figure
     if figure is not None:
@@ -219,6 +228,7 @@ def plot_iteration_update_gridspec(
     gs = gridspec.GridSpec(3, 3, figure=fig, hspace=0.2, wspace=0.2)
     titles = ["Birefringence (MIP)", "Retardance", "Orientation"]
     cmaps = ["plasma", "plasma", "twilight"]
+    pred_images = []
     # Plot measured data and predictions
     for i, (meas, pred, title, cmap) in enumerate(
         zip(
@@ -232,7 +242,7 @@ def plot_iteration_update_gridspec(
         plot_image_subplot(ax_meas, meas, f"{title}", cmap=cmap)
 
         ax_pred = fig.add_subplot(gs[1, i])
-        plot_image_subplot(ax_pred, pred, f"{title}", cmap=cmap)
+        pred_images.append(plot_image_subplot(ax_pred, pred, f"{title}", cmap=cmap))
     # Add row titles
     fig.text(
         0.5, 0.96, "Measurements", ha="center", va="center", fontsize=10, weight="bold"
@@ -251,7 +261,7 @@ def plot_iteration_update_gridspec(
 
     # Plot combined losses across the entire bottom row
     ax_combined = fig.add_subplot(gs[2, :])
-    plot_combined_loss_subplot(
+    loss_lines = plot_combined_loss_subplot(
         ax_combined,
         losses,
         data_term_losses,
@@ -260,8 +270,52 @@ def plot_iteration_update_gridspec(
     )
     # Adjust layout to prevent overlap, leave space for row titles
     plt.subplots_adjust(left=0.05, right=0.91, bottom=0.07, top=0.92)
+    if return_artists:
+        return {
+            "pred_images": pred_images,
+            "loss_axis": ax_combined,
+            "loss_lines": loss_lines,
+        }
     # Return the figure object if in Streamlit, else show the plot
     if streamlit_purpose:
         return fig
     else:
         return None
+
+
+def update_iteration_gridspec(
+    artists,
+    vol_current,
+    ret_current,
+    azim_current,
+    losses,
+    data_term_losses,
+    regularization_term_losses,
+):
+    """Updates the predictions and losses of a figure created by
+    plot_iteration_update_gridspec, without recreating the subplots.
+    Args:
+        artists (dict): Artists returned by plot_iteration_update_gridspec.
+    """
+    for im, pred in zip(
+        artists["pred_images"], [vol_current, ret_current, azim_current]
+    ):
+        if isinstance(pred, torch.Tensor):
+            pred = pred.cpu().numpy()
+        im.set_data(pred)
+        # Rescales the color limits, which also updates the colorbar
+        im.autoscale()
+    epochs = list(range(len(losses)))
+    for line, values in zip(
+        artists["loss_lines"], [losses, data_term_losses, regularization_term_losses]
+    ):
+        line.set_data(epochs, values)
+    ax = artists["loss_axis"]
+    ax.relim()
+    ax.set_autoscalex_on(True)
+    ax.autoscale_view(scaley=False)
+    ax.set_xlim(left=0)
+    max_y_limit = calculate_dynamic_max_y_limit(
+        losses, window_size=50, scale_factor=1.1
+    )
+    ax.set_ylim([0, max_y_limit])
@@ -1,6 +1,8 @@
+import multiprocessing
 import torch
 import torch.nn.functional as F
 import matplotlib.pyplot as plt
+from VolumeRaytraceLFM.abstract_classes import BackEnds
 from VolumeRaytraceLFM.birefringence_implementations import BirefringentVolume
 
 
@@ -69,7 +71,8 @@ def volume_2_projections(
 
 
 def visualize_volume(volume: BirefringentVolume, optical_info: dict):
-    with torch.no_grad():
+    # Only used for display, so autograd tracking is turned off entirely
+    with torch.inference_mode():
         plotly_figure = volume.plot_lines_plotly()
         plotly_figure = volume.plot_volume_plotly(
             optical_info,
@@ -81,6 +84,31 @@ def visualize_volume(volume: BirefringentVolume, optical_info: dict):
     return
 
 
+def _visualize_volume_from_file(h5_file_path, optical_info, backend):
+    volume = BirefringentVolume.init_from_file(
+        h5_file_path, backend=backend, optical_info=optical_info
+    )
+    visualize_volume(volume, optical_info)
+
+
+def visualize_volume_async(h5_file_path, optical_info: dict, backend=BackEnds.PYTORCH):
+    """Renders a volume saved as an h5 file in a separate process, so the
+    caller does not wait for the plotly rendering.
+    Args:
+        h5_file_path (str): path to the saved volume
+        optical_info (dict): optical info used to load the volume
+        backend (BackEnds): backend used to load the volume
+    Returns:
+        multiprocessing.Process: the started rendering process
+    """
+    process = multiprocessing.Process(
+        target=_visualize_volume_from_file,
+        args=(h5_file_path, optical_info, backend),
+    )
+    process.start()
+    return process
+
+
 def convert_volume_to_2d_mip(
     volume_input,
     projection_func=torch.max,
@@ -107,7 +135,7 @@ def convert_volume_to_2d_mip(
     Returns:
     - out_img (Tensor): The resulting 2D MIP image.
     """
-    volume = volume_input.detach().abs().clone()
+    volume = volume_input.detach().abs()
 
     # Normalize if required
     if normalize:
@@ -127,11 +155,12 @@ def convert_volume_to_2d_mip(
     scaled_vol_size = [int(volume.shape[i + 2] * scaling_factors[i]) for i in range(3)]
     batch_size, num_channels = volume.shape[:2]
 
-    # Compute projections
-    volume_cpu = volume.float().cpu()
-    x_projection = projection_wrapper(volume_cpu, projection_func, dim=2)
-    y_projection = projection_wrapper(volume_cpu, projection_func, dim=3)
-    z_projection = projection_wrapper(volume_cpu, projection_func, dim=4)
+    # Compute projections on the device of the volume, so that only the
+    #   2D projections are copied to the CPU
+    volume = volume.float()
+    x_projection = projection_wrapper(volume, projection_func, dim=2).cpu()
+    y_projection = projection_wrapper(volume, projection_func, dim=3).cpu()
+    z_projection = projection_wrapper(volume, projection_func, dim=4).cpu()
 
     # Initialize output image with zeros
     out_img = torch.zeros(
@@ -157,7 +186,7 @@ def convert_volume_to_2d_mip(
 
     # Add white border lines between views
     if add_view_separation_lines:
-        line_color = volume.max()
+        line_color = volume.max().item()
         out_img[:, :, scaled_vol_size[0] : scaled_vol_size[0] + border_thickness, :] = (
             line_color
         )
@@ -6,6 +6,8 @@
     - Generate 2D images.
 """
 
+import os
+import tempfile
 import torch
 import streamlit as st
 import h5py
@@ -14,11 +16,14 @@ from VolumeRaytraceLFM.simulations import ForwardModel
 from VolumeRaytraceLFM.birefringence_implementations import BirefringentVolume
 from VolumeRaytraceLFM.volumes import volume_args
 from VolumeRaytraceLFM.setup_parameters import setup_optical_parameters
-from VolumeRaytraceLFM.visualization.plotting_volume import visualize_volume
 
 # Select backend method
 BACKEND = BackEnds.PYTORCH
 # backend = BackEnds.NUMPY
+# Show the 3D plotly view of the ground truth volume when run as a script
+VISUALIZE_VOLUME = False
+# Render the 3D view in a separate process instead of blocking the script
+VISUALIZE_ASYNC = True
 
 if BACKEND == BackEnds.PYTORCH:
     import torch
@@ -212,6 +217,18 @@ if __name__ == "__main__":
         optical_info=optical_info,
         volume_creation_args=volume_args.voxel_args,
     )
-    visualize_volume(volume_GT, optical_info)
     simulator.forward_model(volume_GT)
+    if VISUALIZE_VOLUME:
+        # Rendered after the forward model so that it does not delay the raytracing
+        from VolumeRaytraceLFM.visualization.plotting_volume import (
+            visualize_volume,
+            visualize_volume_async,
+        )
+
+        if VISUALIZE_ASYNC:
+            volume_path = os.path.join(tempfile.gettempdir(), "volume_GT.h5")
+            volume_GT.save_as_file(volume_path)
+            visualize_volume_async(volume_path, optical_info, backend=BACKEND)
+        else:
+            visualize_volume(volume_GT, optical_info)
     simulator.view_images()
@@ -70,6 +70,9 @@ optical_info.update(values_from_df)
 ############## Optimization parameters ###################
 tabs[1].subheader("Iterative reconstruction parameters")
 n_epochs = tabs[1].slider("Number of iterations", min_value=1, max_value=500, value=11)
+omit_rays_based_on_pixels = tabs[1].checkbox(
+    "Skip rays of pixels with zero retardance", value=True
+)
 optim_cols = tabs[1].columns(2)
 # See loss_functions.py for more details
 optim_cols[0].markdown("**Loss function**")
@@ -350,6 +353,9 @@ def create_optimizer(volume):
 
 BACKEND = BackEnds.PYTORCH
 DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+if DEVICE.type == "cuda":
+    # Allows TF32 matmuls for the Jones matrix products on Ampere and newer GPUs
+    torch.set_float32_matmul_precision("high")
 
 if st.button("**Reconstruct birefringent volume with classes!**"):
     assert backend == BackEnds.PYTORCH, "backend must be torch"
@@ -362,8 +368,9 @@ if st.button("**Reconstruct birefringent volume with classes!**"):
     except NameError:
         st.error("Ground truth volume is unknown.")
 
-    recon_optical_info = optical_info.copy()
-    recon_optical_info["volume_shape"] = list(est_vol_shape)
+    # A separate dict is kept, because the Reconstructor modifies its
+    #   optical info, e.g. the volume shape when cropping the volume
+    recon_optical_info = {**optical_info, "volume_shape": list(est_vol_shape)}
     iteration_params = training_params
     initial_volume = BirefringentVolume(
         backend=BackEnds.PYTORCH,
@@ -378,7 +385,9 @@ if st.button("**Reconstruct birefringent volume with classes!**"):
         iteration_params,
         gt_vol=st.session_state.GT,
     )
-    reconstructor = Reconstructor(recon_config)
+    reconstructor = Reconstructor(
+        recon_config, omit_rays_based_on_pixels=omit_rays_based_on_pixels
+    )
     reconstructor.reconstruct(use_streamlit=True)
 
     st.success("Done reconstructing! How does it look?", icon="✅")
@@ -397,7 +406,7 @@ if st.button("**Reconstruct birefringent volume!**"):
     except NameError:
         st.error("Ground truth volume is unknown.")
 
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    device = DEVICE
     ret_image_measured = torch.as_tensor(output_ret_image, device=device)
     azim_image_measured = torch.as_tensor(output_azim_image, device=device)
     optical_info["volume_shape"] = list(est_vol_shape)
@@ -65,6 +65,23 @@ def test_get_optic_axis(optical_info_vol11, backend_fixture):
     ), err_message
 
 
+@pytest.mark.parametrize("backend_fixture", ["numpy", "pytorch"], indirect=True)
+def test_get_optic_axis_components(optical_info_vol11, backend_fixture):
+    bv = BirefringentVolume(
+        backend=backend_fixture,
+        optical_info=optical_info_vol11,
+        volume_creation_args={"init_mode": "random"},
+    )
+    optic_axis = bv.get_optic_axis()
+    components = bv.get_optic_axis_components()
+    assert len(components) == 3
+    for i, component in enumerate(components):
+        assert tuple(component.shape) == tuple(optical_info_vol11["volume_shape"])
+        assert (component == optic_axis[i]).all()
+        if backend_fixture == BackEnds.PYTORCH:
+            assert component.is_contiguous()
+
+
 @pytest.mark.parametrize("backend_fixture", ["numpy", "pytorch"], indirect=True)
 def test_plot_lines_plotly(optical_info_vol11, backend_fixture):
     """Test the plotting with lines function."""
@@ -94,6 +111,31 @@ def test_plot_volume_plotly(optical_info_vol11, backend_fixture):
     assert isinstance(fig, Figure), f"Expected a plotly Figure, but got {type(fig)}"
 
 
+@pytest.mark.parametrize("backend_fixture", ["numpy", "pytorch"], indirect=True)
+def test_shell_volume(optical_info_vol11, backend_fixture):
+    """Test that the shell is the ellipsoid with its front half removed."""
+    creation_args = {"init_args": {"radius": [4, 4, 4]}}
+    ellipsoid = BirefringentVolume(
+        backend=backend_fixture,
+        optical_info=optical_info_vol11,
+        volume_creation_args={"init_mode": "ellipsoid", **creation_args},
+    )
+    shell = BirefringentVolume(
+        backend=backend_fixture,
+        optical_info=optical_info_vol11,
+        volume_creation_args={"init_mode": "shell", **creation_args},
+    )
+    cutoff = optical_info_vol11["volume_shape"][0] // 2 + 2
+    delta_n_ellipsoid = ellipsoid.get_delta_n()
+    delta_n_shell = shell.get_delta_n()
+    if backend_fixture == BackEnds.PYTORCH:
+        delta_n_ellipsoid = delta_n_ellipsoid.detach().numpy()
+        delta_n_shell = delta_n_shell.detach().numpy()
+    assert np.any(delta_n_ellipsoid[:cutoff] != 0)
+    assert np.all(delta_n_shell[:cutoff] == 0)
+    assert np.array_equal(delta_n_shell[cutoff:], delta_n_ellipsoid[cutoff:])
+
+
 @pytest.mark.parametrize("backend_fixture", ["numpy", "pytorch"], indirect=True)
 def test_get_vox_params(optical_info_vol11, backend_fixture):
     """Test that the voxel parameters are correct."""
@@ -190,6 +232,323 @@ def test_init_from_file(optical_info_vol11, tmp_path):
     assert bv.get_optic_axis().shape == (3, *optical_info_vol11["volume_shape"])
 
 
+@pytest.mark.parametrize("backend_fixture", ["numpy", "pytorch"], indirect=True)
+def test_clone(optical_info_vol11, backend_fixture):
+    bv = BirefringentVolume(
+        backend=backend_fixture,
+        optical_info=optical_info_vol11,
+        volume_creation_args={"init_mode": "random"},
+    )
+    bv_clone = bv.clone()
+    assert bv_clone.backend == bv.backend
+    assert bv_clone.optical_info == bv.optical_info
+    if backend_fixture == BackEnds.PYTORCH:
+        assert torch.equal(bv_clone.Delta_n, bv.Delta_n)
+        assert torch.equal(bv_clone.optic_axis, bv.optic_axis)
+        assert isinstance(bv_clone.Delta_n, torch.nn.Parameter)
+        named_params = dict(bv_clone.named_parameters())
+        assert named_params["Delta_n"] is bv_clone.Delta_n
+        with torch.no_grad():
+            bv_clone.Delta_n += 1
+            bv_clone.optic_axis[0] += 1
+        assert not torch.equal(bv_clone.Delta_n, bv.Delta_n)
+        assert not torch.equal(bv_clone.optic_axis, bv.optic_axis)
+        assert dict(bv.named_parameters())["Delta_n"] is bv.Delta_n
+    else:
+        np.testing.assert_array_equal(bv_clone.Delta_n, bv.Delta_n)
+        bv_clone.Delta_n += 1
+        bv_clone.optic_axis += 1
+        assert not np.array_equal(bv_clone.Delta_n, bv.Delta_n)
+        assert not np.array_equal(bv_clone.optic_axis, bv.optic_axis)
+
+
+def test_clone_active_parameters(optical_info_vol11):
+    bv = BirefringentVolume(
+        backend=BackEnds.PYTORCH,
+        optical_info=optical_info_vol11,
+        volume_creation_args={"init_mode": "random"},
+    )
+    bv.birefringence_active = torch.nn.Parameter(torch.rand(5))
+    bv.register_buffer("active_idx", torch.arange(5))
+    bv_clone = bv.clone()
+    assert bv_clone.birefringence_active is not bv.birefringence_active
+    assert torch.equal(bv_clone.birefringence_active, bv.birefringence_active)
+    with torch.no_grad():
+        bv_clone.birefringence_active += 1
+    bv_clone.active_idx += 1
+    assert not torch.equal(bv_clone.birefringence_active, bv.birefringence_active)
+    assert torch.equal(bv.active_idx, torch.arange(5))
+    clone_params = set(map(id, bv_clone.parameters()))
+    assert not clone_params & set(map(id, bv.parameters()))
+
+
+def test_cached_views(optical_info_vol11):
+    bv = BirefringentVolume(
+        backend=BackEnds.PYTORCH,
+        optical_info=optical_info_vol11,
+        volume_creation_args={"init_mode": "random"},
+    )
+    with torch.no_grad():
+        delta_n = bv.get_delta_n()
+        assert bv.get_delta_n() is delta_n
+        assert bv.get_optic_axis() is bv.get_optic_axis()
+        bv.Delta_n = torch.nn.Parameter(bv.Delta_n.detach() + 1)
+        assert bv.get_delta_n() is not delta_n
+        assert torch.equal(bv.get_delta_n(), delta_n + 1)
+    with torch.enable_grad():
+        assert bv.get_delta_n() is not bv.get_delta_n()
+        assert bv.get_delta_n().requires_grad
+
+
+@pytest.mark.parametrize("backend_fixture", ["numpy", "pytorch"], indirect=True)
+def test_normalize_optic_axis(optical_info_vol11, backend_fixture):
+    bv = BirefringentVolume(backend=backend_fixture, optical_info=optical_info_vol11)
+    if backend_fixture == BackEnds.PYTORCH:
+        with torch.no_grad():
+            bv.optic_axis *= 2
+            bv.optic_axis[:, 0] = 0
+        bv.normalize_optic_axis()
+        norms = torch.linalg.norm(bv.optic_axis.detach(), axis=0).numpy()
+    else:
+        bv.optic_axis *= 2
+        bv.optic_axis[:, 0, 0, 0] = 0
+        bv.normalize_optic_axis()
+        norms = np.linalg.norm(bv.optic_axis, axis=0).flatten()
+    assert norms[0] == 0
+    assert np.allclose(norms[1:], 1)
+
+
+@pytest.mark.parametrize("backend_fixture", ["numpy", "pytorch"], indirect=True)
+def test_iadd(optical_info_vol11, backend_fixture):
+    bv = BirefringentVolume(
+        backend=backend_fixture,
+        optical_info=optical_info_vol11,
+        Delta_n=0.1,
+        optic_axis=[1.0, 0.0, 0.0],
+    )
+    other = BirefringentVolume(
+        backend=backend_fixture,
+        optical_info=optical_info_vol11,
+        Delta_n=0.2,
+        optic_axis=[0.0, 1.0, 0.0],
+    )
+    bv += other
+    optic_axis = bv.get_optic_axis()
+    delta_n = bv.get_delta_n()
+    if backend_fixture == BackEnds.PYTORCH:
+        optic_axis = optic_axis.detach().numpy()
+        delta_n = delta_n.detach().numpy()
+    assert np.allclose(delta_n, 0.3)
+    expected = np.array([1.0, 1.0, 0.0]) / np.sqrt(2)
+    assert np.allclose(optic_axis, expected.reshape(3, 1, 1, 1))
+
+
+def test_iadd_shape_mismatch(optical_info_vol11):
+    bv = BirefringentVolume(backend=BackEnds.NUMPY, optical_info=optical_info_vol11)
+    other_info = dict(optical_info_vol11, volume_shape=[3, 5, 5])
+    other = BirefringentVolume(backend=BackEnds.NUMPY, optical_info=other_info)
+    with pytest.raises(AssertionError, match="Shape mismatch"):
+        bv += other
+
+
+@pytest.mark.parametrize("backend_fixture", ["numpy", "pytorch"], indirect=True)
+def test_init_volume_zeros(optical_info_vol11, backend_fixture):
+    bv = BirefringentVolume(
+        backend=backend_fixture,
+        optical_info=optical_info_vol11,
+        Delta_n=0.1,
+        volume_creation_args={"init_mode": "zeros"},
+    )
+    delta_n = bv.get_delta_n()
+    optic_axis = bv.get_optic_axis()
+    if backend_fixture == BackEnds.PYTORCH:
+        assert isinstance(bv.Delta_n, torch.nn.Parameter)
+        delta_n = delta_n.detach().numpy()
+        optic_axis = optic_axis.detach().numpy()
+    assert delta_n.shape == tuple(optical_info_vol11["volume_shape"])
+    assert not delta_n.any()
+    assert not optic_axis.any()
+
+
+def test_3d_optic_axis_numpy_normalized(optical_info_vol11):
+    vol_shape = optical_info_vol11["volume_shape"]
+    optic_axis = np.random.rand(3, *vol_shape) + 0.1
+    optic_axis[:, 0, 0, 0] = 0
+    bv = BirefringentVolume(
+        backend=BackEnds.NUMPY,
+        optical_info=optical_info_vol11,
+        Delta_n=np.ones(vol_shape),
+        optic_axis=optic_axis,
+    )
+    norms = np.linalg.norm(bv.optic_axis, axis=0)
+    assert np.allclose(norms.flatten()[1:], 1)
+    assert np.array_equal(bv.optic_axis[:, 0, 0, 0], [0, 0, 0])
+
+
+def test_numpy_dtype(optical_info_vol11):
+    bv = BirefringentVolume(
+        backend=BackEnds.NUMPY,
+        optical_info=optical_info_vol11,
+        volume_creation_args={"init_mode": "random"},
+        numpy_dtype=np.float32,
+    )
+    assert bv.Delta_n.dtype == np.float32
+    assert bv.optic_axis.dtype == np.float32
+    norms = np.linalg.norm(bv.optic_axis, axis=0)
+    assert np.allclose(norms, 1, atol=1e-6)
+
+
+def test_generate_ellipsoid_volume_float32():
+    args = dict(center=[0.5, 0.5, 0.5], radius=[5.5, 9.5, 5.5], delta_n=0.01)
+    vol64 = BirefringentVolume.generate_ellipsoid_volume([15, 51, 51], **args)
+    vol32 = BirefringentVolume.generate_ellipsoid_volume(
+        [15, 51, 51], dtype=np.float32, **args
+    )
+    assert vol32.dtype == np.float32
+    assert np.array_equal(vol32, vol64.astype(np.float32))
+
+
+def test_generate_ellipsoids_volume(optical_info_vol11):
+    ellipsoids_args = [
+        {"center": [0.5, 0.4, 0.5], "radius": [3, 4, 3], "delta_n": 0.01},
+        {"center": [0.5, 0.6, 0.6], "radius": [2, 3, 4], "delta_n": -0.02},
+    ]
+    for args in ellipsoids_args:
+        args["border_thickness"] = 1
+    volume = BirefringentVolume(
+        backend=BackEnds.NUMPY,
+        optical_info=optical_info_vol11,
+        volume_creation_args={"init_mode": "zeros"},
+    )
+    for args in ellipsoids_args:
+        volume += BirefringentVolume(
+            backend=BackEnds.NUMPY,
+            optical_info=optical_info_vol11,
+            volume_creation_args={"init_mode": "ellipsoid", "init_args": args},
+        )
+    vol = BirefringentVolume.generate_ellipsoids_volume(
+        optical_info_vol11["volume_shape"], ellipsoids_args
+    )
+    assert np.allclose(vol[0], volume.get_delta_n())
+    assert np.allclose(vol[1:], volume.get_optic_axis())
+
+
+def test_create_dummy_volume_rng(optical_info_vol11):
+    volumes = [
+        BirefringentVolume.create_dummy_volume(
+            backend=BackEnds.NUMPY,
+            optical_info=optical_info_vol11,
+            vol_type="2ellipsoids",
+            rng=np.random.default_rng(0),
+        )
+        for _ in range(2)
+    ]
+    assert np.array_equal(volumes[0].get_delta_n(), volumes[1].get_delta_n())
+    assert np.array_equal(volumes[0].get_optic_axis(), volumes[1].get_optic_axis())
+
+
+def test_create_dummy_volume_global_seed(optical_info_vol11):
+    volumes = []
+    for _ in range(2):
+        np.random.seed(3)
+        volumes.append(
+            BirefringentVolume.create_dummy_volume(
+                backend=BackEnds.NUMPY,
+                optical_info=optical_info_vol11,
+                vol_type="sphere",
+            )
+        )
+    assert np.array_equal(volumes[0].get_delta_n(), volumes[1].get_delta_n())
+
+
+def test_generate_planes_volume_rng():
+    planes = [
+        BirefringentVolume.generate_planes_volume(
+            [5, 6, 6], rng=np.random.default_rng(seed)
+        )
+        for seed in [0, 0, 1]
+    ]
+    assert np.array_equal(planes[0], planes[1])
+    assert not np.array_equal(planes[0], planes[2])
+    assert np.allclose(np.linalg.norm(planes[0][1:], axis=0), 1)
+
+
+def test_generate_random_volume_torch():
+    init_args = {"Delta_n_range": [0, 0.02], "axes_range": [-1, 1]}
+    vol = BirefringentVolume.generate_random_volume_torch([3, 4, 5], init_args)
+    assert vol.shape == (4, 3, 4, 5)
+    assert vol[0].min() >= 0 and vol[0].max() <= 0.02
+    assert torch.allclose(torch.linalg.vector_norm(vol[1:], dim=0), torch.ones(1))
+    # The generator is seeded, so the volume is reproducible
+    vol_again = BirefringentVolume.generate_random_volume_torch([3, 4, 5], init_args)
+    assert torch.equal(vol, vol_again)
+    vol_seeded = BirefringentVolume.generate_random_volume_torch(
+        [3, 4, 5], {**init_args, "seed": 7}
+    )
+    assert not torch.equal(vol, vol_seeded)
+    generator = torch.Generator().manual_seed(7)
+    vol_generator = BirefringentVolume.generate_random_volume_torch(
+        [3, 4, 5], init_args, generator=generator
+    )
+    assert torch.equal(vol_seeded, vol_generator)
+
+
+@pytest.mark.parametrize("backend", [BackEnds.NUMPY, BackEnds.PYTORCH])
+def test_random_volume_seed(optical_info_vol11, backend):
+    def random_volume(seed):
+        init_args = {"Delta_n_range": [0, 1], "axes_range": [-1, 1], "seed": seed}
+        return BirefringentVolume(
+            backend=backend,
+            optical_info=optical_info_vol11,
+            volume_creation_args={"init_mode": "random", "init_args": init_args},
+        )
+
+    delta_n = [
+        np.array(random_volume(seed).get_delta_n().tolist()) for seed in [1, 1, 2]
+    ]
+    assert np.array_equal(delta_n[0], delta_n[1])
+    assert not np.array_equal(delta_n[0], delta_n[2])
+
+
+def test_get_delta_n_with_active(optical_info_vol11):
+    bv = BirefringentVolume(
+        backend=BackEnds.PYTORCH,
+        optical_info=optical_info_vol11,
+        volume_creation_args={"init_mode": "random"},
+    )
+    indices_active = torch.tensor([0, 3, 10])
+    bv.indices_active = indices_active
+    bv.birefringence_active = torch.nn.Parameter(bv.Delta_n[indices_active] + 1)
+    # Other tests may leave gradient computation disabled
+    with torch.enable_grad():
+        delta_n = bv.get_delta_n_with_active()
+        delta_n.sum().backward()
+    assert delta_n.shape == bv.get_delta_n().shape
+    assert torch.equal(delta_n.flatten()[indices_active], bv.birefringence_active)
+    assert torch.equal(bv.birefringence_active.grad, torch.ones(3))
+
+
+def test_get_optic_axis_with_active(optical_info_vol11):
+    bv = BirefringentVolume(
+        backend=BackEnds.PYTORCH,
+        optical_info=optical_info_vol11,
+        volume_creation_args={"init_mode": "random"},
+    )
+    indices_active = torch.tensor([0, 3, 10])
+    bv.indices_active = indices_active
+    # Without active optic axis parameters, the dense optic axis is used
+    assert torch.equal(bv.get_optic_axis_with_active(), bv.get_optic_axis())
+    bv.optic_axis_active = torch.nn.Parameter(bv.optic_axis[:, indices_active] + 1)
+    with torch.enable_grad():
+        optic_axis = bv.get_optic_axis_with_active()
+        optic_axis.sum().backward()
+    assert optic_axis.shape == bv.get_optic_axis().shape
+    assert torch.equal(
+        optic_axis.flatten(start_dim=1)[:, indices_active], bv.optic_axis_active
+    )
+    assert torch.equal(bv.optic_axis_active.grad, torch.ones(3, 3))
+
+
 def main():
     """Run some of the tests."""
     test_get_vox_params(optical_info_vol11(), BackEnds.PYTORCH)
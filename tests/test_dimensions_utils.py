@@ -15,6 +15,13 @@ def test_get_region_of_ones_shape():
     expected_shape = torch.tensor([2, 2])
     assert torch.all(get_region_of_ones_shape(mask) == expected_shape)
 
+    # Test with a region of ones inside a 3D mask
+    mask = torch.zeros((4, 5, 6))
+    mask[1:3, 0:4, 2:3] = 1
+    mask[1, 2, 5] = 1
+    expected_shape = torch.tensor([2, 4, 4])
+    assert torch.all(get_region_of_ones_shape(mask) == expected_shape)
+
     # Test with no ones in the mask
     mask = torch.zeros((2, 2))
     with pytest.raises(ValueError):
@@ -7,6 +7,8 @@ from VolumeRaytraceLFM import JonesMatrixGenerators, BackEnds
 from VolumeRaytraceLFM.jones.eigenanalysis import (
     retardance_from_jones,
     retardance_from_su2,
+    retardance_from_jones_numpy,
+    eigenvalues_closed_form,
     calc_theta,
 )
 
@@ -78,6 +80,30 @@ def test_retardance_equivalence():
     assert torch.allclose(retardance_su2, retardance_jones), err_msg
 
 
+def test_eigenvalues_closed_form():
+    # Test that the closed-form eigenvalues match the generic eigensolver
+    jones = torch.randn(10, 2, 2, dtype=torch.complex128)
+    eig_closed = eigenvalues_closed_form(jones)
+    eig_linalg = torch.linalg.eigvals(jones)
+    # Each closed-form eigenvalue must be one of the solver's eigenvalues
+    dists = (eig_closed.unsqueeze(-1) - eig_linalg.unsqueeze(-2)).abs()
+    err_msg = "Closed-form eigenvalues do not match torch.linalg.eigvals"
+    assert torch.allclose(
+        dists.min(dim=-1).values, torch.zeros(10, 2).double(), atol=1e-10
+    ), err_msg
+
+
+def test_retardance_numpy_equivalence():
+    jones = generate_jones_matrix(batch_size=10)
+    retardance_su2 = retardance_from_su2(jones)
+    for i in range(jones.shape[0]):
+        retardance_np = retardance_from_jones_numpy(jones[i].numpy())
+        err_msg = "The numpy retardance does not match the SU(2) retardance!"
+        assert torch.isclose(
+            retardance_su2[i], torch.tensor(retardance_np), atol=1e-5
+        ), err_msg
+
+
 def test_calc_theta_identity():
     jones = torch.eye(2).unsqueeze(0)
     theta = calc_theta(jones)
@@ -91,3 +117,14 @@ def test_retardance_of_identity():
     retardance = retardance_from_su2(identity_matrix)
     err_msg = "Retardance of an identity Jones matrix is not zero."
     assert torch.allclose(retardance, torch.zeros_like(retardance), atol=3e-8), err_msg
+
+
+def test_eigenvalues_gradient_at_identity():
+    # Equal eigenvalues must not give an infinite derivative of the square root
+    with torch.enable_grad():
+        jones = torch.eye(2, dtype=torch.complex128).unsqueeze(0).requires_grad_(True)
+        eigenvalues_closed_form(jones).real.sum().backward()
+        assert torch.isfinite(torch.view_as_real(jones.grad)).all()
+        jones.grad = None
+        retardance_from_jones(jones).sum().backward()
+        assert torch.isfinite(torch.view_as_real(jones.grad)).all()
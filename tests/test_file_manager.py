@@ -150,3 +150,27 @@ def test_save_as_h5():
                 assert key in f["optical_info"]
                 assert np.array_equal(f["optical_info"][key][()], value)
     os.remove(mock_h5_file_path)
+
+
+def test_save_as_h5_quantized(tmp_path):
+    """Verify that quantized volumes are stored as int8 and dequantized on load"""
+    h5_file_path = str(tmp_path / "test_quantized.h5")
+    rng = np.random.default_rng(0)
+    delta_n = rng.uniform(-0.02, 0.02, (2, 3, 3))
+    optic_axis = rng.normal(size=(3, 2, 3, 3))
+    optic_axis /= np.linalg.norm(optic_axis, axis=0)
+    optical_info = {"volume_shape": [2, 3, 3], "voxel_size_um": [1.0, 1.0, 1.0]}
+
+    manager = VolumeFileManager()
+    manager.save_as_h5(
+        h5_file_path, delta_n, optic_axis, optical_info, "quantized", False, True
+    )
+    with h5py.File(h5_file_path, "r") as f:
+        assert f["data/delta_n"].dtype == np.int8
+        assert f["data/optic_axis"].dtype == np.int8
+        assert "scale" in f["data/delta_n"].attrs
+
+    delta_n_loaded, optic_axis_loaded = manager.extract_data_from_h5(h5_file_path)
+    dn_scale = np.abs(delta_n).max() / 127
+    assert np.allclose(delta_n_loaded, delta_n, atol=dn_scale)
+    assert np.allclose(optic_axis_loaded, optic_axis, atol=1 / 127)
@@ -1,10 +1,20 @@
 """Test that Jones matrix conventions are consistent."""
 
 import numpy as np
+import pytest
+import torch
 from VolumeRaytraceLFM.jones.jones_calculus import (
     JonesMatrixGenerators,
     JonesVectorGenerators,
 )
+from VolumeRaytraceLFM.jones.jones_matrix import (
+    _compile_or_eager,
+    get_graphed_jones_product_fn,
+    jones_torch,
+    jones_product_from_ret_azim,
+    jones_product_numpy,
+    jones_product_pairwise,
+)
 
 
 def test_polarizer_generators():
@@ -49,11 +59,143 @@ def test_polscope():
     # TODO: test the polscope settings
 
 
+def test_jones_product_from_ret_azim():
+    """Tests that the elementwise Jones product matches the matrix product"""
+    ret = torch.rand(6, 4) * 2 * torch.pi
+    azim = torch.rand(6, 4) * 2 * torch.pi
+    jones = jones_torch(ret, azim)
+    expected = jones[:, 0]
+    for m in range(1, jones.shape[1]):
+        expected = expected @ jones[:, m]
+    product_real = jones_product_from_ret_azim(ret, azim)
+    assert torch.allclose(
+        product_real.to(expected.dtype), expected, atol=1e-6
+    ), "Real-valued Jones product does not match the matrix product"
+
+
+def test_jones_product_from_ret_azim_float64():
+    """Tests that float64 angles give a complex128 product with double
+    precision"""
+    ret = torch.rand(6, 4, dtype=torch.float64) * 2 * torch.pi
+    azim = torch.rand(6, 4, dtype=torch.float64) * 2 * torch.pi
+    diag = torch.cos(ret) + 1j * torch.cos(azim) * torch.sin(ret)
+    offdiag = 1j * torch.sin(azim) * torch.sin(ret)
+    jones = torch.stack(
+        [torch.stack([diag, offdiag], -1), torch.stack([offdiag, diag.conj()], -1)],
+        -2,
+    )
+    expected = jones[:, 0]
+    for m in range(1, jones.shape[1]):
+        expected = expected @ jones[:, m]
+    product = jones_product_from_ret_azim(ret, azim)
+    assert product.dtype == torch.complex128
+    assert torch.allclose(product, expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("n_steps", [1, 4, 7])
+def test_jones_product_pairwise(n_steps):
+    """Tests that the pairwise Jones product keeps the order of the steps"""
+    jones = jones_torch(torch.rand(5, n_steps), torch.rand(5, n_steps))
+    expected = jones[:, 0]
+    for m in range(1, n_steps):
+        expected = expected @ jones[:, m]
+    product = jones_product_pairwise(jones.transpose(0, 1))
+    assert torch.allclose(
+        product, expected, atol=1e-6
+    ), "Pairwise Jones product does not match the sequential product"
+
+
+@pytest.mark.slow
+def test_compiled_jones_step():
+    """Tests that the compiled Jones accumulation matches the eager one"""
+    ret = torch.rand(6, 4) * 2 * torch.pi
+    azim = torch.rand(6, 4) * 2 * torch.pi
+    product = jones_product_from_ret_azim(ret, azim)
+    product_compiled = jones_product_from_ret_azim(ret, azim, compile_step=True)
+    assert torch.allclose(
+        product, product_compiled, atol=1e-6
+    ), "Compiled Jones product does not match the eager product"
+
+
+@pytest.mark.slow
+def test_graphed_jones_product():
+    """Tests that the reduce-overhead Jones product matches the eager one"""
+    ret = torch.rand(6, 4) * 2 * torch.pi
+    azim = torch.rand(6, 4) * 2 * torch.pi
+    product = jones_product_from_ret_azim(ret, azim)
+    product_graphed = get_graphed_jones_product_fn()(ret, azim)
+    assert torch.allclose(
+        product, product_graphed, atol=1e-6
+    ), "Graphed Jones product does not match the eager product"
+
+
+def test_compile_or_eager_fallback(monkeypatch):
+    """Tests that the eager function is used when torch.compile fails"""
+
+    def unsupported(*args, **kwargs):
+        raise RuntimeError("torch.compile is not supported")
+
+    monkeypatch.setattr(torch, "compile", unsupported)
+    assert _compile_or_eager(jones_product_from_ret_azim) is jones_product_from_ret_azim
+
+
+def test_compile_or_eager_first_call_fallback(monkeypatch):
+    """Tests that the eager function is used when compiling on the first
+    call fails"""
+    calls = []
+
+    def failing_compile(fn, **kwargs):
+        def compiled(*args, **kwargs):
+            calls.append(1)
+            raise RuntimeError("backend compiler failed")
+
+        return compiled
+
+    monkeypatch.setattr(torch, "compile", failing_compile)
+    jones_product_fn = _compile_or_eager(jones_product_from_ret_azim)
+    ret = torch.rand(6, 4) * 2 * torch.pi
+    azim = torch.rand(6, 4) * 2 * torch.pi
+    expected = jones_product_from_ret_azim(ret, azim)
+    for _ in range(2):
+        assert torch.equal(jones_product_fn(ret, azim), expected)
+    assert len(calls) == 1
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="requires CUDA")
+def test_graphed_jones_product_cuda():
+    """Tests that replaying the CUDA graph of the Jones product matches the
+    eager product"""
+    graphed_fn = get_graphed_jones_product_fn()
+    for _ in range(2):
+        ret = torch.rand(6, 4, device="cuda") * 2 * torch.pi
+        azim = torch.rand(6, 4, device="cuda") * 2 * torch.pi
+        product = jones_product_from_ret_azim(ret, azim)
+        product_graphed = graphed_fn(ret, azim).clone()
+        assert torch.allclose(
+            product, product_graphed, atol=1e-6
+        ), "Graphed Jones product does not match the eager product"
+
+
+def test_jones_product_numpy():
+    """Tests that the numpy Jones product matches the linear retarder product"""
+    ret = np.random.rand(5) * 2 * np.pi
+    azim = np.random.rand(5) * 2 * np.pi
+    expected = np.identity(2)
+    for r, a in zip(ret, azim):
+        expected = expected @ JonesMatrixGenerators.linear_retarder(r, a)
+    product = jones_product_numpy(ret, azim)
+    assert np.allclose(
+        product, expected
+    ), "Numpy Jones product does not match the linear retarder product"
+
+
 def main():
     """Place for debugging test functions"""
     test_polarizer_generators()
     test_linear_polarizer()
     test_polscope()
+    test_jones_product_from_ret_azim()
+    test_jones_product_numpy()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,36 @@
+"""Tests for the JSON utilities"""
+
+import math
+import numpy as np
+import pytest
+from VolumeRaytraceLFM.utils import json_utils
+from VolumeRaytraceLFM.utils.json_utils import load_json, save_json
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_save_load_json_round_trip(tmp_path, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(json_utils, "orjson", None)
+    elif json_utils.orjson is None:
+        pytest.skip("orjson is not installed")
+    config = {
+        "n_epochs": 10,
+        "lr": 1e-3,
+        "regularization_fcns": [["birefringence L2", 0.5]],
+        "vol_shape": np.array([3, 5, 5]),
+    }
+    filepath = tmp_path / "config.json"
+    save_json(config, filepath)
+    loaded = load_json(filepath)
+    assert loaded == {**config, "vol_shape": [3, 5, 5]}
+    # NaN and infinite values are kept
+    config_nan = {"lr": math.nan, "bounds": [-math.inf, 1.0]}
+    save_json(config_nan, filepath)
+    loaded = load_json(filepath)
+    assert math.isnan(loaded["lr"])
+    assert loaded["bounds"] == [-math.inf, 1.0]
+    config_nan = {"weights": np.array([1.0, np.nan]), "lr": np.float32("inf")}
+    save_json(config_nan, filepath)
+    loaded = load_json(filepath)
+    assert loaded["weights"][0] == 1.0 and math.isnan(loaded["weights"][1])
+    assert loaded["lr"] == math.inf
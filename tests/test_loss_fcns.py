@@ -1,5 +1,16 @@
 import torch
+import torch.nn.functional as F
 from VolumeRaytraceLFM.loss_functions import weighted_local_cosine_similarity_loss
+from VolumeRaytraceLFM.metrics.regularization_fundamentals import (
+    l1,
+    l2,
+    total_variation_3d_volumetric,
+)
+from VolumeRaytraceLFM.metrics.metric import PolarimetricLossFunction
+from VolumeRaytraceLFM.metrics.regularization import total_variation_optax
+from VolumeRaytraceLFM.abstract_classes import BackEnds
+from VolumeRaytraceLFM.birefringence_implementations import BirefringentVolume
+from tests.fixtures_optical_info import optical_info_vol11
 
 
 def test_weighted_local_cosine_similarity_loss():
@@ -14,3 +25,68 @@ def test_weighted_local_cosine_similarity_loss():
 
         assert loss.ndim == 0, "Loss is not a scalar value."
         assert 0 <= loss.item() <= 2, f"Loss {loss:.6f} is not within the range [0, 2]."
+
+
+def test_total_variation_3d_volumetric():
+    """Test that the total variation matches the sum of the mean squared
+    differences along each of the first three dimensions.
+    """
+    for shape in [(4, 5, 6), (3, 4, 5, 6)]:
+        data = torch.randn(*shape)
+        expected = (
+            torch.pow(data[1:, :, :] - data[:-1, :, :], 2).mean()
+            + torch.pow(data[:, 1:, :] - data[:, :-1, :], 2).mean()
+            + torch.pow(data[:, :, 1:] - data[:, :, :-1], 2).mean()
+        )
+        tv_reg = total_variation_3d_volumetric(data)
+        assert torch.isclose(tv_reg, expected), f"TV {tv_reg} != {expected}"
+    data = torch.randn(4, 5, 6)
+    expected_sum = (
+        torch.pow(data[1:, :, :] - data[:-1, :, :], 2).sum()
+        + torch.pow(data[:, 1:, :] - data[:, :-1, :], 2).sum()
+        + torch.pow(data[:, :, 1:] - data[:, :, :-1], 2).sum()
+    )
+    tv_sum = total_variation_3d_volumetric(data, reduction="sum")
+    assert torch.isclose(tv_sum, expected_sum), f"TV {tv_sum} != {expected_sum}"
+
+
+def test_total_variation_optax(optical_info_vol11):
+    """Test that the optic axis total variation is taken per component,
+    so that a uniform optic axis has no variation."""
+    volume = BirefringentVolume(
+        backend=BackEnds.PYTORCH,
+        optical_info=optical_info_vol11,
+        optic_axis=[1.0, 0.0, 0.0],
+    )
+    assert total_variation_optax(volume) == 0
+    # Active optic axis parameters take the place of their voxels
+    volume.indices_active = torch.tensor([0, 5])
+    volume.optic_axis_active = torch.nn.Parameter(torch.zeros(3, 2))
+    with torch.enable_grad():
+        tv_active = total_variation_optax(volume)
+        tv_active.backward()
+    assert tv_active > 0
+    assert volume.optic_axis_active.grad is not None
+
+
+def test_l1_l2():
+    """Test that l1 and l2 are the mean absolute and mean squared values."""
+    data = torch.randn(4, 5, 6)
+    assert torch.isclose(l1(data), torch.abs(data).mean())
+    assert torch.isclose(l2(data), torch.pow(data, 2).mean())
+
+
+def test_vector_loss():
+    """Test that the fused vector loss matches the sum of the mean squared
+    errors of the cosine and sine components.
+    """
+    loss_fcn = PolarimetricLossFunction()
+    ret_gt, azim_gt = torch.rand(8, 8), torch.rand(8, 8) * torch.pi
+    ret_pred, azim_pred = torch.rand(8, 8), torch.rand(8, 8) * torch.pi
+    loss_fcn.set_retardance_target(ret_gt)
+    loss_fcn.set_orientation_target(azim_gt)
+    cos_gt, sin_gt = loss_fcn.transform_ret_azim_to_vector_form(ret_gt, azim_gt)
+    cos_pred, sin_pred = loss_fcn.transform_ret_azim_to_vector_form(ret_pred, azim_pred)
+    expected = F.mse_loss(cos_pred, cos_gt) + F.mse_loss(sin_pred, sin_gt)
+    loss = loss_fcn.vector_loss(ret_pred, azim_pred)
+    assert torch.isclose(loss, expected), f"Vector loss {loss} != {expected}"
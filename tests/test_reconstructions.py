@@ -2,12 +2,14 @@
 
 import numpy as np
 import pytest
+import torch
 from tests.fixtures_optical_info import set_optical_info
 from VolumeRaytraceLFM.abstract_classes import BackEnds
 from VolumeRaytraceLFM.birefringence_implementations import BirefringentVolume
 from VolumeRaytraceLFM.reconstructions import (
     ReconstructionConfig,
     Reconstructor,
+    _resolve_device,
 )
 
 
@@ -47,6 +49,78 @@ def test_reconstructor_initialization(reconstructor):
     assert reconstructor.backend == BackEnds.PYTORCH
 
 
+def test_reset_measurements(reconstructor, tmp_path):
+    rays = reconstructor.rays
+    ret_image = np.random.rand(17, 17)
+    azim_image = np.random.rand(17, 17)
+    reconstructor.loss_total_list.append(1.0)
+    reconstructor.reset_measurements(ret_image, azim_image, output_dir=str(tmp_path))
+    assert reconstructor.rays is rays
+    dtype = torch.get_default_dtype()
+    assert torch.equal(
+        reconstructor.ret_meas_tensor, torch.tensor(ret_image, dtype=dtype)
+    )
+    assert torch.equal(
+        reconstructor.azim_meas_tensor, torch.tensor(azim_image, dtype=dtype)
+    )
+    assert reconstructor.loss_total_list == []
+    assert reconstructor.recon_directory == str(tmp_path)
+
+
+def test_reconstruct_finishes_saves_on_error(reconstructor, tmp_path, monkeypatch):
+    saved = []
+
+    def failing_iteration(*args, **kwargs):
+        reconstructor._submit_io(saved.append, "volume")
+        raise RuntimeError("interrupted")
+
+    reconstructor.recon_directory = str(tmp_path)
+    reconstructor.iteration_params.update(
+        {"lr_optic_axis": 1e-3, "lr_birefringence": 1e-3, "regularization_fcns": []}
+    )
+    monkeypatch.setattr(reconstructor, "one_iteration", failing_iteration)
+    with pytest.raises(RuntimeError, match="interrupted"):
+        reconstructor.reconstruct()
+    assert saved == ["volume"]
+    assert reconstructor._io_pool is None
+    # A new I/O thread is started for later saves
+    reconstructor._submit_io(saved.append, "volume")
+    reconstructor._wait_for_io()
+    assert saved == ["volume", "volume"]
+
+
+def test_to_device_same_device(reconstructor):
+    ret_meas_tensor = reconstructor.ret_meas_tensor
+    reconstructor.to_device("cpu")
+    assert reconstructor.ret_meas_tensor is ret_meas_tensor
+
+
+def test_resolve_device(monkeypatch):
+    monkeypatch.setattr(torch.cuda, "current_device", lambda: 0)
+    assert _resolve_device("cuda") == torch.device("cuda:0")
+    assert _resolve_device("cuda:1") == torch.device("cuda:1")
+    assert _resolve_device("cpu") == torch.device("cpu")
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA is not available")
+def test_to_device_same_device_cuda(reconstructor):
+    reconstructor.to_device("cuda")
+    ret_meas_tensor = reconstructor.ret_meas_tensor
+    assert ret_meas_tensor.device == torch.device("cuda:0")
+    reconstructor.to_device("cuda")
+    assert reconstructor.ret_meas_tensor is ret_meas_tensor
+
+
+def test_setup_raytracer_from_saved_rays(reconstructor, tmp_path):
+    filepath = str(tmp_path / "rays.pkl")
+    reconstructor.rays.save(filepath)
+    rays = reconstructor.setup_raytracer(filepath=filepath)
+    assert torch.equal(
+        rays.ray_vol_colli_lengths, reconstructor.rays.ray_vol_colli_lengths
+    )
+    assert torch.equal(rays.ray_valid_indices, reconstructor.rays.ray_valid_indices)
+
+
 # def test_reconstruction_config():
 #     # Test ReconstructionConfig initialization
 #     optical_info = {'wavelength': 532e-9, 'refractive_index': 1.33}
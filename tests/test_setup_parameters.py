@@ -0,0 +1,24 @@
+"""Tests for the setup_parameters module."""
+
+import json
+import os
+from VolumeRaytraceLFM.setup_parameters import setup_iteration_parameters
+
+
+def test_setup_iteration_parameters_cache(tmp_path):
+    config_file = str(tmp_path / "iter_config.json")
+    with open(config_file, "w") as f:
+        json.dump({"n_epochs": 5, "regularization_fcns": [["L2", 0.1]]}, f)
+    params = setup_iteration_parameters(config_file)
+    assert params["n_epochs"] == 5
+    # Modifying the returned parameters does not change the cached config
+    params["regularization_fcns"].append(["TV", 0.1])
+    assert setup_iteration_parameters(config_file)["regularization_fcns"] == [
+        ["L2", 0.1]
+    ]
+    # A modified file is read again
+    with open(config_file, "w") as f:
+        json.dump({"n_epochs": 7}, f)
+    mtime = os.path.getmtime(config_file)
+    os.utime(config_file, (mtime + 1, mtime + 1))
+    assert setup_iteration_parameters(config_file)["n_epochs"] == 7
@@ -88,3 +88,62 @@ def test_forward_model_all_lenslets():
     images_all_lenslets = simulator.ret_img, simulator.azim_img
     assert torch.allclose(images[0], images_all_lenslets[0]), "Retardance images differ"
     assert torch.allclose(images[1], images_all_lenslets[1]), "Azimuth images differ"
+
+
+def test_forward_model_half_precision_ret_azim():
+    backend = BackEnds.PYTORCH
+    optical_info = set_optical_info([3, 9, 9], 16, 5)
+    volume = BirefringentVolume(
+        backend=backend,
+        optical_info=optical_info,
+        volume_creation_args={
+            "init_mode": "random",
+            "init_args": {"Delta_n_range": [-0.05, 0.05], "axes_range": [-1, 1]},
+        },
+    )
+    optical_system = {"optical_info": optical_info}
+    simulator = ForwardModel(optical_system, backend)
+    simulator.rays.prepare_for_all_rays_at_once()
+    simulator.forward_model(volume, all_lenslets=True)
+    ret_img = simulator.ret_img
+    simulator.rays.ray_geometry_dtype = torch.float16
+    simulator.forward_model(volume, all_lenslets=True)
+    ret_img_half = simulator.ret_img
+    max_diff = (ret_img - ret_img_half).abs().max()
+    assert max_diff <= 1e-3, f"Half precision retardance differs by {max_diff} rad"
+
+
+def test_forward_model_ray_blocks():
+    backend = BackEnds.PYTORCH
+    optical_info = set_optical_info([3, 9, 9], 16, 5)
+    volume = BirefringentVolume(
+        backend=backend,
+        optical_info=optical_info,
+        volume_creation_args={"init_mode": "random"},
+    )
+    simulator = ForwardModel({"optical_info": optical_info}, backend)
+    simulator.rays.prepare_for_all_rays_at_once()
+    simulator.forward_model(volume, all_lenslets=True)
+    images = simulator.ret_img, simulator.azim_img
+    simulator.rays.mla_ray_block_size = 100
+    simulator.forward_model(volume, all_lenslets=True)
+    assert torch.allclose(images[0], simulator.ret_img), "Retardance images differ"
+    assert torch.allclose(images[1], simulator.azim_img), "Azimuth images differ"
+
+
+def test_save_ret_azim_images(tmp_path):
+    backend = BackEnds.PYTORCH
+    optical_info = set_optical_info([3, 5, 5], 16, 1)
+    volume = BirefringentVolume(
+        backend=backend,
+        optical_info=optical_info,
+        volume_creation_args={"init_mode": "random"},
+    )
+    simulator = ForwardModel({"optical_info": optical_info}, backend)
+    simulator.forward_model(volume)
+    simulator.base_dir = str(tmp_path)
+    simulator.save_ret_azim_images(save_arrays=True)
+    ret_image = np.load(tmp_path / "data" / "forward_images" / "ret_image.npy")
+    azim_image = np.load(tmp_path / "data" / "forward_images" / "azim_image.npy")
+    np.testing.assert_array_equal(ret_image, simulator.ret_img.detach().numpy())
+    np.testing.assert_array_equal(azim_image, simulator.azim_img.detach().numpy())
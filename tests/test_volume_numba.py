@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+from VolumeRaytraceLFM import birefringence_implementations
+from VolumeRaytraceLFM.utils import volume_numba
+from VolumeRaytraceLFM.utils.volume_numba import (
+    NUMBA_AVAILABLE,
+    normalize_optic_axis_inplace,
+    pack_line_segments,
+)
+
+requires_numba = pytest.mark.skipif(
+    not NUMBA_AVAILABLE, reason="numba is not installed"
+)
+
+
+def test_normalize_optic_axis_inplace():
+    optic_axis = np.random.rand(3, 2, 3, 4) + 0.1
+    expected = optic_axis / np.linalg.norm(optic_axis, axis=0)
+    optic_axis[:, 0, 0, 0] = 0
+    expected[:, 0, 0, 0] = 0
+    result = normalize_optic_axis_inplace(optic_axis)
+    assert result is optic_axis
+    assert np.allclose(result, expected)
+
+
+def test_normalize_optic_axis_inplace_non_contiguous():
+    optic_axis = np.random.rand(3, 4, 3, 2).transpose(0, 3, 2, 1) + 0.1
+    expected = optic_axis / np.linalg.norm(optic_axis, axis=0)
+    normalize_optic_axis_inplace(optic_axis)
+    assert np.allclose(optic_axis, expected)
+
+
+def test_pack_line_segments():
+    coords_base = np.random.rand(3, 2, 3, 4)
+    coords_tip = np.random.rand(3, 2, 3, 4)
+    coords_base[:, 0, 0, 0] = np.nan
+    coords_tip[:, 0, 0, 0] = np.nan
+    coords, color = pack_line_segments(coords_base, coords_tip)
+    assert coords.shape == (3, 3 * 24)
+    assert np.array_equal(coords[:, 3::3], coords_base.reshape(3, -1)[:, 1:])
+    assert np.array_equal(coords[:, 4::3], coords_tip.reshape(3, -1)[:, 1:])
+    assert np.isnan(coords[:, 2::3]).all()
+    length = ((coords_base - coords_tip) ** 2).sum(axis=0).ravel()
+    assert np.allclose(color[3::3], length[1:])
+    assert np.allclose(color[4::3], length[1:])
+    assert not color[2::3].any()
+    assert not color[:2].any()
+
+
+@requires_numba
+def test_normalize_optic_axis_numba_matches_numpy(monkeypatch):
+    optic_axis = np.random.uniform(-1, 1, (3, 5, 6, 7))
+    optic_axis[:, 0, 0, 0] = 0
+    expected = optic_axis.copy()
+    normalize_optic_axis_inplace(optic_axis)
+    monkeypatch.setattr(volume_numba, "NUMBA_AVAILABLE", False)
+    normalize_optic_axis_inplace(expected)
+    assert np.allclose(optic_axis, expected)
+    assert np.array_equal(optic_axis[:, 0, 0, 0], [0, 0, 0])
+
+
+@requires_numba
+def test_pack_line_segments_numba_matches_numpy(monkeypatch):
+    coords_base = np.random.rand(3, 4, 5, 6)
+    coords_tip = np.random.rand(3, 4, 5, 6)
+    coords_base[:, 1, 2, 3] = np.nan
+    coords_tip[:, 1, 2, 3] = np.nan
+    coords, color = pack_line_segments(coords_base, coords_tip)
+    monkeypatch.setattr(volume_numba, "NUMBA_AVAILABLE", False)
+    expected_coords, expected_color = pack_line_segments(coords_base, coords_tip)
+    assert np.array_equal(coords, expected_coords, equal_nan=True)
+    assert np.allclose(color, expected_color)
+
+
+@requires_numba
+@pytest.mark.parametrize(
+    "radius, alpha",
+    [
+        ([3, 4, 6], 2),
+        ([5.5, 9.5, 5.5], 1),
+        # The inner radius is zero along z
+        ([3, 4, 6], 3),
+        # The inner radii are negative
+        ([1.2, 0.7, 2.5], 1),
+    ],
+)
+def test_fill_ellipsoid_shell_matches_numpy(monkeypatch, radius, alpha):
+    generate = (
+        birefringence_implementations.BirefringentVolume.generate_ellipsoid_volume
+    )
+    args = dict(center=[0.3, 0.6, 0.45], radius=radius, alpha=alpha, delta_n=-0.02)
+    vol = generate([8, 20, 30], **args)
+    monkeypatch.setattr(birefringence_implementations, "NUMBA_AVAILABLE", False)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = generate([8, 20, 30], **args)
+    assert np.count_nonzero(expected[0]) > 0
+    assert np.array_equal(vol, expected)
+
+
+@requires_numba
+@pytest.mark.parametrize("scale, border_thickness", [(1, 1), (6, 3)])
+def test_fill_ellipsoid_shells_matches_numpy(monkeypatch, scale, border_thickness):
+    rng = np.random.default_rng(5)
+    ellipsoids_args = [
+        {
+            "radius": rng.uniform(0.5, 3.5, [3]) * scale,
+            "center": [rng.uniform(0.35, 0.65)] + list(rng.uniform(0.3, 0.70, [2])),
+            "delta_n": rng.uniform(-0.01, -0.001),
+            "border_thickness": border_thickness,
+        }
+        for _ in range(4)
+    ]
+    generate = (
+        birefringence_implementations.BirefringentVolume.generate_ellipsoids_volume
+    )
+    vol = generate([21, 41, 41], ellipsoids_args)
+    monkeypatch.setattr(birefringence_implementations, "NUMBA_AVAILABLE", False)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = generate([21, 41, 41], ellipsoids_args)
+    assert np.count_nonzero(expected[0]) > 0
+    assert np.allclose(vol, expected)